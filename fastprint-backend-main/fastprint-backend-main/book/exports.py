@@ -0,0 +1,130 @@
+"""
+Streaming CSV / XLSX export of paid orders.
+
+Orders are read newest first in keyset chunks of EXPORT_CHUNK_SIZE rows,
+``values()`` projections fetched with ``(created_at, id) < last row``, the
+same walk as the paginated lists (book/pagination.py). Each chunk is a query
+of its own, so an export holds at most one chunk in memory whatever its size;
+``QuerySet.iterator(chunk_size=...)`` would not bound it on MySQL, whose
+driver loads the whole result set when the query runs.
+
+CSV is written row by row into a StreamingHttpResponse. An XLSX file is a zip
+that can only be assembled once every row is written, so it is built by
+XlsxWriter in ``constant_memory`` mode (rows are flushed to disk as they are
+written) in a temporary file, which is then streamed.
+"""
+import csv
+import tempfile
+from datetime import datetime, time, timedelta
+
+from django.db.models import F, Q
+from django.http import FileResponse, StreamingHttpResponse
+from django.utils import timezone
+
+from .models import BookProject
+from .serializers import ADMIN_ORDER_FIELDS
+
+EXPORT_CHUNK_SIZE = 2000
+
+EXPORT_COLUMNS = ('id', 'created_at', 'status', 'is_shipment_prepared', 'user_email') + tuple(
+    name for name in ADMIN_ORDER_FIELDS if name not in ('id', 'created_at')
+)
+
+FILE_FIELDS = ('pdf_file', 'cover_file')
+
+CONTENT_TYPES = {
+    'csv': 'text/csv',
+    'xlsx': 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+}
+
+
+def _day_start(day):
+    return timezone.make_aware(datetime.combine(day, time.min))
+
+
+def export_queryset(filters):
+    """Paid orders matching the validated filters of OrderExportFilterSerializer."""
+    orders = BookProject.objects.filter(order_status='paid')
+    # Whole-day bounds on created_at itself, so the range can use its index
+    if filters.get('created_from'):
+        orders = orders.filter(created_at__gte=_day_start(filters['created_from']))
+    if filters.get('created_to'):
+        orders = orders.filter(created_at__lt=_day_start(filters['created_to'] + timedelta(days=1)))
+    if filters.get('status'):
+        orders = orders.filter(status=filters['status'])
+    if filters.get('is_shipment_prepared') is not None:
+        orders = orders.filter(is_shipment_prepared=filters['is_shipment_prepared'])
+    return orders
+
+
+def order_rows(orders, chunk_size=EXPORT_CHUNK_SIZE):
+    """Rows of EXPORT_COLUMNS values of ``orders``, newest first, read in keyset chunks."""
+    fields = [name for name in EXPORT_COLUMNS if name != 'user_email']
+    orders = orders.values(*fields, user_email=F('user__email')).order_by('-created_at', '-id')
+    storages = {name: BookProject._meta.get_field(name).storage for name in FILE_FIELDS}
+
+    chunk = list(orders[:chunk_size])
+    while chunk:
+        for row in chunk:
+            for name, storage in storages.items():
+                row[name] = storage.url(row[name]) if row[name] else None
+            yield [row[name] for name in EXPORT_COLUMNS]
+        if len(chunk) < chunk_size:
+            break
+        last = chunk[-1]
+        chunk = list(orders.filter(
+            Q(created_at__lt=last['created_at']) | Q(created_at=last['created_at'], id__lt=last['id'])
+        )[:chunk_size])
+
+
+class Echo:
+    """File-like object whose write() returns the line, for csv.writer."""
+
+    def write(self, value):
+        return value
+
+
+def _csv_value(value):
+    if isinstance(value, datetime):
+        return timezone.localtime(value).isoformat()
+    return '' if value is None else value
+
+
+def stream_orders_csv(rows):
+    writer = csv.writer(Echo())
+    yield writer.writerow(EXPORT_COLUMNS)
+    for row in rows:
+        yield writer.writerow([_csv_value(value) for value in row])
+
+
+def write_orders_xlsx(rows, stream):
+    import xlsxwriter
+
+    workbook = xlsxwriter.Workbook(stream, {
+        'constant_memory': True,
+        'remove_timezone': True,
+        'default_date_format': 'yyyy-mm-dd hh:mm:ss',
+    })
+    worksheet = workbook.add_worksheet('Orders')
+    worksheet.write_row(0, 0, EXPORT_COLUMNS)
+    for i, row in enumerate(rows, start=1):
+        worksheet.write_row(i, 0, [
+            timezone.localtime(value) if isinstance(value, datetime) else value
+            for value in row
+        ])
+    workbook.close()
+
+
+def export_response(orders, file_type):
+    """Streaming attachment response of ``orders`` as ``file_type`` (a key of CONTENT_TYPES)."""
+    filename = f"orders-{timezone.localdate():%Y%m%d}.{file_type}"
+    rows = order_rows(orders)
+    if file_type == 'csv':
+        response = StreamingHttpResponse(stream_orders_csv(rows), content_type=CONTENT_TYPES['csv'])
+        response['Content-Disposition'] = f'attachment; filename="{filename}"'
+        return response
+
+    stream = tempfile.TemporaryFile()
+    write_orders_xlsx(rows, stream)
+    stream.seek(0)
+    return FileResponse(stream, as_attachment=True, filename=filename, content_type=CONTENT_TYPES['xlsx'])
@@ -0,0 +1,23 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from book.models import UploadSession
+from book.uploads import delete_session
+
+
+class Command(BaseCommand):
+    help = "Deletes chunked uploads that were never attached to a project, with their partial files"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--hours', type=int, default=48, help='Delete uploads untouched for this many hours')
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - timedelta(hours=options['hours'])
+        sessions = UploadSession.objects.filter(updated_at__lt=cutoff).exclude(status='attached')
+        count = 0
+        for session in sessions.iterator():
+            delete_session(session)
+            count += 1
+        self.stdout.write(self.style.SUCCESS(f"✅ Deleted {count} stale uploads."))
@@ -0,0 +1,25 @@
+# Generated by Django 4.1 on 2026-10-18 11:19
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pricing', '0003_pricelist'),
+        ('book', '0010_bookproject_is_shipment_prepared'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='bookproject',
+            name='price_list',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='+', to='pricing.pricelist'),
+        ),
+        migrations.AddField(
+            model_name='bookproject',
+            name='quote_config',
+            field=models.JSONField(blank=True, null=True),
+        ),
+    ]
@@ -0,0 +1,23 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('book', '0011_bookproject_price_list'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='bookproject',
+            index=models.Index(fields=['user', 'created_at', 'id'], name='book_user_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='bookproject',
+            index=models.Index(fields=['user', 'order_status', 'created_at', 'id'], name='book_user_status_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='bookproject',
+            index=models.Index(fields=['order_status', 'is_shipment_prepared', 'created_at', 'id'], name='book_status_ship_created_idx'),
+        ),
+    ]
@@ -1,3 +1,5 @@
+import uuid
+
 from django.db import models
 from django.conf import settings
 
@@ -69,6 +71,9 @@ class BookProject(models.Model):
     product_quantity = models.PositiveIntegerField(blank=True, null=True)
     product_price = models.DecimalField(max_digits=12, decimal_places=2, blank=True, null=True)
     subtotal = models.DecimalField(max_digits=12, decimal_places=2, blank=True, null=True)
+    # Calculator configuration and the price list it was priced against
+    quote_config = models.JSONField(blank=True, null=True)
+    price_list = models.ForeignKey('pricing.PriceList', on_delete=models.PROTECT, blank=True, null=True, related_name='+')
     # In BookProject model
     is_shipment_prepared = models.BooleanField(default=False)
 
@@ -90,5 +95,40 @@ class BookProject(models.Model):
         default='in_progress'
     )
 
+    class Meta:
+        # Keyset pagination of the order lists (book/pagination.py)
+        indexes = [
+            models.Index(fields=['user', 'created_at', 'id'], name='book_user_created_idx'),
+            models.Index(fields=['user', 'order_status', 'created_at', 'id'], name='book_user_status_created_idx'),
+            models.Index(fields=['order_status', 'is_shipment_prepared', 'created_at', 'id'], name='book_status_ship_created_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.title} by {self.user.email}"
+
+class UploadSession(models.Model):
+    """A resumable chunked upload of a project file (see book/uploads.py)."""
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='upload_sessions')
+    field = models.CharField(
+        max_length=20,
+        choices=[('pdf_file', 'PDF file'), ('cover_file', 'Cover file')],
+        default='pdf_file'
+    )
+    filename = models.CharField(max_length=255)
+    size = models.PositiveBigIntegerField()
+    # Optional SHA-256 of the whole file, checked when the upload is finalized
+    sha256 = models.CharField(max_length=64, blank=True)
+    # Bytes received so far: the offset of the next chunk
+    offset = models.PositiveBigIntegerField(default=0)
+    status = models.CharField(
+        max_length=20,
+        choices=[('uploading', 'Uploading'), ('complete', 'Complete'), ('attached', 'Attached')],
+        default='uploading'
+    )
+    book_project = models.ForeignKey(BookProject, on_delete=models.SET_NULL, blank=True, null=True, related_name='+')
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
     def __str__(self):
-        return f"{self.title} by {self.user.email}"
\ No newline at end of file
+        return f"{self.filename} ({self.offset}/{self.size}) by {self.user.email}"
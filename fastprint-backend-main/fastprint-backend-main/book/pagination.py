@@ -0,0 +1,129 @@
+"""
+Keyset (cursor) pagination of book project lists.
+
+Lists are ordered newest first on ``(created_at, id)``, which is unique, and a
+page is fetched with ``WHERE (created_at, id) < cursor ORDER BY created_at
+DESC, id DESC LIMIT n`` on the indexes of BookProject. Unlike offset
+pagination, the cost of a page does not grow with how deep it is, and rows
+created while a client pages through a list never shift or repeat entries.
+
+Cursors are opaque: ``next`` and ``previous`` are the URLs of the adjacent
+pages, or null at either end of the list.
+Every request gets one page, of ``page_size`` rows (PAGE_SIZE by default);
+clients that show a whole list follow ``next`` until it is null.
+"""
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from datetime import datetime
+
+from django.db.models import Q
+from rest_framework import status
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+class BookProjectCursorPagination(BasePagination):
+    cursor_query_param = 'cursor'
+    page_size_query_param = 'page_size'
+    max_page_size = 500
+    invalid_cursor_message = 'Invalid cursor'
+
+    def get_page_size(self, request):
+        try:
+            page_size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return api_settings.PAGE_SIZE
+        return min(max(page_size, 1), self.max_page_size)
+
+    def encode_cursor(self, row, reverse):
+        created_at, pk = _key(row)
+        token = urlsafe_b64encode(f"{int(reverse)}|{created_at.isoformat()}|{pk}".encode()).decode()
+        return replace_query_param(self.base_url, self.cursor_query_param, token)
+
+    def decode_cursor(self, request):
+        """``(reverse, created_at, id)`` of the request's cursor; None on the first page."""
+        token = request.query_params.get(self.cursor_query_param)
+        if not token:
+            return None
+        try:
+            reverse, created_at, pk = urlsafe_b64decode(token.encode()).decode().split('|')
+            return reverse == '1', datetime.fromisoformat(created_at), int(pk)
+        except (TypeError, ValueError, UnicodeDecodeError):
+            raise NotFound(self.invalid_cursor_message)
+
+    def paginate_queryset(self, queryset, request, view=None):
+        """One page of ``queryset`` (model instances or ``values()`` dicts), newest first."""
+        self.base_url = remove_query_param(request.build_absolute_uri(), self.cursor_query_param)
+        page_size = self.get_page_size(request)
+        cursor = self.decode_cursor(request)
+        reverse = cursor is not None and cursor[0]
+
+        if cursor is None:
+            queryset = queryset.order_by('-created_at', '-id')
+        elif reverse:
+            _, created_at, pk = cursor
+            queryset = queryset.filter(
+                Q(created_at__gt=created_at) | Q(created_at=created_at, id__gt=pk)
+            ).order_by('created_at', 'id')
+        else:
+            _, created_at, pk = cursor
+            queryset = queryset.filter(
+                Q(created_at__lt=created_at) | Q(created_at=created_at, id__lt=pk)
+            ).order_by('-created_at', '-id')
+
+        rows = list(queryset[:page_size + 1])
+        has_more = len(rows) > page_size
+        rows = rows[:page_size]
+        if reverse:
+            rows.reverse()
+
+        # Walking forward there is a next page if the query found one more row
+        # and a previous page if we came from a cursor; walking back, the reverse
+        has_next = has_more if not reverse else True
+        has_previous = cursor is not None if not reverse else has_more
+        self.next_url = self.encode_cursor(rows[-1], False) if rows and has_next else None
+        self.previous_url = self.encode_cursor(rows[0], True) if rows and has_previous else None
+        return rows
+
+    def get_paginated_response(self, data):
+        return Response({
+            'status': 'success',
+            'results': len(data),
+            'next': self.next_url,
+            'previous': self.previous_url,
+            'data': data,
+        })
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'properties': {
+                'status': {'type': 'string'},
+                'results': {'type': 'integer'},
+                'next': {'type': 'string', 'nullable': True},
+                'previous': {'type': 'string', 'nullable': True},
+                'data': schema,
+            },
+        }
+
+
+def _key(row):
+    if isinstance(row, dict):
+        return row['created_at'], row['id']
+    return row.created_at, row.id
+
+
+def paginate(request, queryset, serialize):
+    """
+    Paginated response of ``queryset`` for a function view; ``serialize``
+    turns the rows of the page into response data. Answers an invalid cursor
+    with a 404 rather than raising, as the views catch every exception.
+    """
+    paginator = BookProjectCursorPagination()
+    try:
+        page = paginator.paginate_queryset(queryset, request)
+    except NotFound as e:
+        return Response({'status': 'error', 'message': str(e.detail)}, status=status.HTTP_404_NOT_FOUND)
+    return paginator.get_paginated_response(serialize(page))
@@ -1,14 +1,135 @@
 # serializers.py
+import os
+import re
+
+from django.conf import settings
 from rest_framework import serializers
-from .models import BookProject
+from .models import BookProject, UploadSession
+from pricing.serializers import PinnedQuoteMixin
+
+class SparseFieldsMixin:
+    """Takes an optional ``fields`` argument: the names of the fields to output."""
+
+    def __init__(self, *args, **kwargs):
+        fields = kwargs.pop('fields', None)
+        super().__init__(*args, **kwargs)
+        if fields is not None:
+            for name in set(self.fields) - set(fields):
+                self.fields.pop(name)
+
 
-class BookProjectSerializer(serializers.ModelSerializer):
+class BookProjectSerializer(SparseFieldsMixin, PinnedQuoteMixin, serializers.ModelSerializer):
     user_email = serializers.SerializerMethodField()
 
     class Meta:
         model = BookProject
         fields = '__all__'
-        read_only_fields = ['user', 'created_at']
+        read_only_fields = ['user', 'price_list', 'created_at']
 
     def get_user_email(self, obj):
-        return obj.user.email if obj.user else None
\ No newline at end of file
+        return obj.user.email if obj.user else None
+
+
+class BookProjectSummarySerializer(SparseFieldsMixin, serializers.ModelSerializer):
+    """Compact list representation (``?view=summary``) for dashboards."""
+
+    class Meta:
+        model = BookProject
+        fields = [
+            'id', 'title', 'category', 'page_count', 'cover_file', 'order_status', 'status',
+            'is_shipment_prepared', 'product_quantity', 'subtotal', 'created_at',
+        ]
+        read_only_fields = fields
+
+class FileUrlField(serializers.ReadOnlyField):
+    """URL of a stored file name, as read by ``values()``."""
+
+    def __init__(self, model_field, **kwargs):
+        self.storage = BookProject._meta.get_field(model_field).storage
+        super().__init__(**kwargs)
+
+    def to_representation(self, value):
+        return self.storage.url(value) if value else None
+
+
+class AdminOrderRowSerializer(serializers.Serializer):
+    """
+    Flat row of the admin order list. Serializes the dicts of
+    ``BookProject.objects.values(*ADMIN_ORDER_FIELDS, user_email=...)``, so a
+    page of orders is one query with the user's email joined in.
+    """
+    id = serializers.ReadOnlyField()
+    title = serializers.ReadOnlyField()
+    user_email = serializers.ReadOnlyField()
+    category = serializers.ReadOnlyField()
+    language = serializers.ReadOnlyField()
+    page_count = serializers.ReadOnlyField()
+    created_at = serializers.ReadOnlyField()
+    binding_type = serializers.ReadOnlyField()
+    cover_finish = serializers.ReadOnlyField()
+    interior_color = serializers.ReadOnlyField()
+    paper_type = serializers.ReadOnlyField()
+    trim_size = serializers.ReadOnlyField()
+    pdf_file = FileUrlField('pdf_file')
+    cover_file = FileUrlField('cover_file')
+    cover_description = serializers.ReadOnlyField()
+    first_name = serializers.ReadOnlyField()
+    last_name = serializers.ReadOnlyField()
+    company = serializers.ReadOnlyField()
+    address = serializers.ReadOnlyField()
+    apt_floor = serializers.ReadOnlyField()
+    country = serializers.ReadOnlyField()
+    state = serializers.ReadOnlyField()
+    city = serializers.ReadOnlyField()
+    postal_code = serializers.ReadOnlyField()
+    phone_number = serializers.ReadOnlyField()
+    account_type = serializers.ReadOnlyField()
+    has_resale_cert = serializers.ReadOnlyField()
+    shipping_rate = serializers.ReadOnlyField()
+    tax = serializers.ReadOnlyField()
+    courier_name = serializers.ReadOnlyField()
+    estimated_delivery = serializers.ReadOnlyField()
+    selected_service = serializers.ReadOnlyField()
+    product_quantity = serializers.ReadOnlyField()
+    product_price = serializers.ReadOnlyField()
+    subtotal = serializers.ReadOnlyField()
+
+
+# BookProject columns read by AdminOrderRowSerializer
+ADMIN_ORDER_FIELDS = tuple(name for name in AdminOrderRowSerializer._declared_fields if name != 'user_email')
+
+
+class OrderExportFilterSerializer(serializers.Serializer):
+    """Query parameters of the order export (book/exports.py)."""
+    created_from = serializers.DateField(required=False)
+    created_to = serializers.DateField(required=False)
+    status = serializers.ChoiceField(choices=BookProject._meta.get_field('status').choices, required=False)
+    is_shipment_prepared = serializers.BooleanField(default=None, allow_null=True)
+
+    def validate(self, attrs):
+        if attrs.get('created_from') and attrs.get('created_to') and attrs['created_from'] > attrs['created_to']:
+            raise serializers.ValidationError("created_from must not be after created_to.")
+        return attrs
+
+
+class UploadSessionSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = UploadSession
+        fields = ['id', 'field', 'filename', 'size', 'sha256', 'offset', 'status', 'book_project', 'created_at']
+        read_only_fields = ['offset', 'status', 'book_project', 'created_at']
+
+    def validate_filename(self, value):
+        name = os.path.basename(value.replace('\\', '/'))
+        if not name:
+            raise serializers.ValidationError("Invalid filename.")
+        return name
+
+    def validate_size(self, value):
+        if not 0 < value <= settings.UPLOAD_MAX_SIZE:
+            raise serializers.ValidationError(f"Files must be 1 to {settings.UPLOAD_MAX_SIZE} bytes.")
+        return value
+
+    def validate_sha256(self, value):
+        if value and not re.fullmatch(r'[0-9a-fA-F]{64}', value):
+            raise serializers.ValidationError("Must be a SHA-256 hex digest.")
+        return value.lower()
@@ -1,3 +1,151 @@
-from django.test import TestCase
+import hashlib
+import os
+import shutil
+import tempfile
 
-# Create your tests here.
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+
+from .models import BookProject, UploadSession
+from .uploads import session_path
+
+
+class AdminOrderListTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        User = get_user_model()
+        cls.admin = User.objects.create_superuser('admin@example.com', 'Admin', 'x')
+        for i in range(12):
+            user = User.objects.create_user(f'user{i}@example.com', f'User {i}', 'x')
+            BookProject.objects.create(
+                user=user, title=f'Book {i}', category='Fiction', page_count=100,
+                pdf_file='books/pdfs/book.pdf', order_status='paid',
+            )
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def test_query_count_does_not_grow_with_orders(self):
+        # One query for the page, with the customer's email joined in
+        for page_size in (2, 12):
+            with self.subTest(page_size=page_size), self.assertNumQueries(1):
+                response = self.client.get('/api/book/all-orders/', {'page_size': page_size})
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.data['results'], page_size)
+
+    def test_rows(self):
+        response = self.client.get('/api/book/all-orders/')
+        row = response.data['data'][0]
+        self.assertEqual(row['title'], 'Book 11')
+        self.assertEqual(row['user_email'], 'user11@example.com')
+        self.assertEqual(row['pdf_file'], '/media/books/pdfs/book.pdf')
+        self.assertIsNone(row['cover_file'])
+
+    @override_settings(REST_FRAMEWORK={'PAGE_SIZE': 5})
+    def test_lists_are_paginated_by_default(self):
+        response = self.client.get('/api/book/all-orders/')
+        self.assertEqual(response.data['results'], 5)
+        self.assertIsNotNone(response.data['next'])
+
+    def test_following_next_walks_the_whole_list(self):
+        titles, url = [], '/api/book/all-orders/?page_size=5'
+        while url:
+            response = self.client.get(url)
+            titles += [row['title'] for row in response.data['data']]
+            url = response.data['next']
+        self.assertEqual(titles, [f'Book {i}' for i in range(11, -1, -1)])
+
+
+def _sha256(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+class UploadSessionTests(TestCase):
+    content = bytes(range(256)) * 40
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user('writer@example.com', 'Writer', 'x')
+
+    def setUp(self):
+        upload_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, upload_dir)
+        settings = override_settings(UPLOAD_SESSION_DIR=upload_dir, UPLOAD_CHUNK_MAX_SIZE=4096)
+        settings.enable()
+        self.addCleanup(settings.disable)
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def start(self, sha256=''):
+        response = self.client.post('/api/book/uploads/', {
+            'filename': 'book.pdf', 'size': len(self.content), 'sha256': sha256,
+        }, format='json')
+        self.assertEqual(response.status_code, 201)
+        return UploadSession.objects.get(pk=response.data['data']['id'])
+
+    def put(self, session, offset, chunk, checksum=None):
+        return self.client.generic(
+            'PUT', f'/api/book/uploads/{session.pk}/', chunk, content_type='application/octet-stream',
+            HTTP_UPLOAD_OFFSET=str(offset), HTTP_UPLOAD_CHECKSUM=checksum or _sha256(chunk),
+        )
+
+    def finalize(self, session):
+        return self.client.post(f'/api/book/uploads/{session.pk}/finalize/')
+
+    def upload(self, session, chunk_size=4096):
+        for offset in range(0, len(self.content), chunk_size):
+            chunk = self.content[offset:offset + chunk_size]
+            self.assertEqual(self.put(session, offset, chunk).status_code, 200)
+
+    def test_bad_checksum_truncates_back_to_the_offset(self):
+        session = self.start()
+        self.put(session, 0, self.content[:4096])
+        response = self.put(session, 4096, self.content[4096:8192], checksum=_sha256(b'other'))
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data['offset'], 4096)
+        self.assertEqual(os.path.getsize(session_path(session)), 4096)
+
+        # The resent chunk is accepted at the same offset
+        self.assertEqual(self.put(session, 4096, self.content[4096:8192]).data['data']['offset'], 8192)
+
+    def test_wrong_offset_is_refused_with_the_current_one(self):
+        session = self.start()
+        self.put(session, 0, self.content[:4096])
+        for offset in (0, 8192):
+            response = self.put(session, offset, self.content[offset:offset + 4096])
+            self.assertEqual(response.status_code, 409)
+            self.assertEqual(response.data['offset'], 4096)
+        self.assertEqual(os.path.getsize(session_path(session)), 4096)
+
+    def test_oversize_chunk(self):
+        session = self.start()
+        response = self.put(session, 0, self.content[:4097])
+        self.assertEqual(response.status_code, 413)
+        self.assertEqual(response.data['offset'], 0)
+        self.assertEqual(os.path.getsize(session_path(session)), 0)
+
+    def test_finalize_incomplete_upload(self):
+        session = self.start()
+        self.put(session, 0, self.content[:4096])
+        response = self.finalize(session)
+        self.assertEqual(response.status_code, 409)
+        session.refresh_from_db()
+        self.assertEqual(session.status, 'uploading')
+
+    def test_finalize_checks_the_whole_file(self):
+        session = self.start(sha256=_sha256(self.content[::-1]))
+        self.upload(session)
+        self.assertEqual(self.finalize(session).status_code, 400)
+        session.refresh_from_db()
+        self.assertEqual(session.status, 'uploading')
+
+        session = self.start(sha256=_sha256(self.content))
+        self.upload(session, chunk_size=3000)
+        response = self.finalize(session)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['data']['status'], 'complete')
+        with open(session_path(session), 'rb') as f:
+            self.assertEqual(f.read(), self.content)
@@ -0,0 +1,166 @@
+"""
+Resumable chunked uploads of manuscript and cover files.
+
+A large PDF sent in one multipart POST is buffered by the worker and lost
+with a dropped connection. Instead a client can::
+
+    POST uploads/                  {"filename", "size", "field"?, "sha256"?}
+    PUT  uploads/<id>/             raw chunk bytes, with the headers
+                                   Upload-Offset: <byte offset of the chunk>
+                                   Upload-Checksum: <SHA-256 hex of the chunk>
+    GET  uploads/<id>/             the offset to resume from after a failure
+    POST uploads/<id>/finalize/    {"book_project_id"?}
+
+Chunks are streamed from the request body to a partial file on disk in
+UPLOAD_BLOCK_SIZE blocks and hashed as they go; a chunk whose checksum does
+not match is cut off again, and a chunk at the wrong offset is refused with
+the current one. Finalizing checks the size (and the whole-file SHA-256 if
+one was given), then attaches the file to the project, or leaves the upload
+complete for UploadBookProjectView's ``pdf_upload_id`` / ``cover_upload_id``.
+The assembled file is moved into storage (AssembledFile), never re-read
+through Django's multipart parser.
+"""
+import hashlib
+import os
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.core.files import File
+from django.db import transaction
+
+from .models import UploadSession
+
+UPLOAD_BLOCK_SIZE = 64 * 1024
+
+
+class UploadError(Exception):
+    """An upload request that cannot be applied; ``status_code`` is the HTTP status to answer with."""
+
+    def __init__(self, message, status_code=400):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+def session_path(session):
+    return os.path.join(settings.UPLOAD_SESSION_DIR, f"{session.pk}.part")
+
+
+def create_session(user, **fields):
+    session = UploadSession.objects.create(user=user, **fields)
+    os.makedirs(settings.UPLOAD_SESSION_DIR, exist_ok=True)
+    open(session_path(session), 'wb').close()
+    return session
+
+
+def write_chunk(session, stream, offset, length, checksum):
+    """
+    Append ``length`` bytes of ``stream`` at ``offset`` to the partial file of
+    ``session`` and advance its offset; the session row stays locked while
+    the chunk is written, so concurrent retries of a chunk cannot interleave.
+    """
+    if length > settings.UPLOAD_CHUNK_MAX_SIZE:
+        raise UploadError(f"Chunks are at most {settings.UPLOAD_CHUNK_MAX_SIZE} bytes.", 413)
+
+    with transaction.atomic():
+        session = UploadSession.objects.select_for_update().get(pk=session.pk)
+        if session.status != 'uploading':
+            raise UploadError("Upload is already finalized.", 409)
+        if offset != session.offset:
+            raise UploadError(f"Expected Upload-Offset {session.offset}.", 409)
+        if offset + length > session.size:
+            raise UploadError("Chunk extends past the declared file size.")
+
+        digest = hashlib.sha256()
+        with open(session_path(session), 'r+b') as f:
+            f.seek(offset)
+            try:
+                remaining = length
+                while remaining:
+                    block = stream.read(min(UPLOAD_BLOCK_SIZE, remaining))
+                    if not block:
+                        raise UploadError("Chunk is shorter than its Content-Length.")
+                    digest.update(block)
+                    f.write(block)
+                    remaining -= len(block)
+                if digest.hexdigest() != checksum.lower():
+                    raise UploadError("Chunk checksum does not match.")
+            except BaseException:
+                # Drop the partial or corrupt chunk; the client resends it
+                f.truncate(offset)
+                raise
+
+        session.offset = offset + length
+        session.save(update_fields=['offset', 'updated_at'])
+    return session
+
+
+def _file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(UPLOAD_BLOCK_SIZE), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def complete_session(session):
+    """Mark a fully received upload complete after checking its size and checksum."""
+    if session.status != 'uploading':
+        return session
+    if session.offset != session.size:
+        raise UploadError(f"Upload is incomplete: {session.offset} of {session.size} bytes received.", 409)
+    if session.sha256 and _file_sha256(session_path(session)) != session.sha256.lower():
+        raise UploadError("File checksum does not match.")
+    session.status = 'complete'
+    session.save(update_fields=['status', 'updated_at'])
+    return session
+
+
+class AssembledFile(File):
+    """
+    The assembled file of an upload. FileSystemStorage moves files that have
+    a ``temporary_file_path`` into place instead of copying their content.
+    """
+
+    def __init__(self, session):
+        super().__init__(open(session_path(session), 'rb'), name=session.filename)
+        self.path = session_path(session)
+
+    def temporary_file_path(self):
+        return self.path
+
+
+def completed_upload(user, upload_id, field):
+    """The complete (not yet attached) upload ``upload_id`` of ``user`` for ``field``."""
+    try:
+        session = UploadSession.objects.get(pk=upload_id, user=user, field=field)
+    except (UploadSession.DoesNotExist, ValidationError):
+        raise UploadError("Upload not found.", 404)
+    if session.status != 'complete':
+        raise UploadError("Upload is not finalized." if session.status == 'uploading' else "Upload is already attached.", 409)
+    return session
+
+
+def mark_attached(session, project):
+    session.status = 'attached'
+    session.book_project = project
+    session.save(update_fields=['status', 'book_project', 'updated_at'])
+
+
+def attach_upload(session, project):
+    """Store the assembled file of a complete upload as ``project``'s file field."""
+    file = AssembledFile(session)
+    try:
+        getattr(project, session.field).save(os.path.basename(session.filename), file, save=False)
+    finally:
+        file.close()
+    project.save(update_fields=[session.field])
+    mark_attached(session, project)
+    return project
+
+
+def delete_session(session):
+    try:
+        os.remove(session_path(session))
+    except FileNotFoundError:
+        pass
+    session.delete()
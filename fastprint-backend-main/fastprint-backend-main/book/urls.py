@@ -1,8 +1,11 @@
 from django.urls import path
-from .views import admin_all_orders, admin_order_detail, admin_shipment_orders, prepare_shipment, update_order_status
+from .views import admin_all_orders, admin_export_orders, admin_order_detail, admin_shipment_orders, prepare_shipment, update_order_status
 
 from .views import (
     UploadBookProjectView,
+    UploadSessionCreateView,
+    UploadSessionFinalizeView,
+    UploadSessionView,
     SaveOrderAPIView,
     user_books,
     book_detail,
@@ -14,6 +17,9 @@ from .views import (
 
 urlpatterns = [
     path('upload-book/', UploadBookProjectView.as_view(), name='upload-book'),
+    path('uploads/', UploadSessionCreateView.as_view(), name='upload-session-create'),
+    path('uploads/<uuid:pk>/', UploadSessionView.as_view(), name='upload-session'),
+    path('uploads/<uuid:pk>/finalize/', UploadSessionFinalizeView.as_view(), name='upload-session-finalize'),
     path('save-order/', SaveOrderAPIView.as_view(), name='save-order'),
     path('book-projects/', user_books, name='my-books'),
     path('books/<int:pk>/', book_detail, name='book-detail'),          # GET single project
@@ -27,4 +33,5 @@ urlpatterns = [
 path('admin/orders/<int:pk>/', admin_order_detail, name='admin-order-detail'),
 path('admin/orders/<int:pk>/prepare-shipment/', prepare_shipment, name='prepare-shipment'),
 path('admin/shipment-orders/', admin_shipment_orders, name='admin-shipment-orders'),
+path('admin/orders/export/<str:file_type>/', admin_export_orders, name='admin-export-orders'),
 ]
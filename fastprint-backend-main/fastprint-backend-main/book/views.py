@@ -7,13 +7,91 @@ from rest_framework import status
 from rest_framework.parsers import MultiPartParser, FormParser
 from django.core.mail import send_mail
 from django.conf import settings
-from .models import BookProject
-from .serializers import BookProjectSerializer
+from django.db.models import F
+from django.shortcuts import get_object_or_404
+from .models import BookProject, UploadSession
+from .serializers import (
+    ADMIN_ORDER_FIELDS,
+    AdminOrderRowSerializer,
+    BookProjectSerializer,
+    BookProjectSummarySerializer,
+    OrderExportFilterSerializer,
+    UploadSessionSerializer,
+)
+from .exports import CONTENT_TYPES, export_queryset, export_response
+from .pagination import paginate
+from .uploads import (
+    AssembledFile,
+    UploadError,
+    attach_upload,
+    complete_session,
+    completed_upload,
+    create_session,
+    delete_session,
+    mark_attached,
+    write_chunk,
+)
+from pricing.money import format_cents, to_cents
 import logging
 
 logger = logging.getLogger(__name__)
 
 
+def norm_money(val):
+    """Normalize a submitted amount to a '12.34' string; None if empty or invalid."""
+    if val is None or val == "":
+        return None
+    try:
+        return format_cents(to_cents(val))
+    except ValueError:
+        return None
+
+
+def paginate_projects(request, projects, absolute_urls=False):
+    """
+    Paginated response of book projects. ``?view=summary`` lists the summary
+    fields and ``?fields=a,b`` any subset of the view's fields; the queryset
+    then loads only the columns those fields read. With ``absolute_urls``
+    file URLs are made absolute, so the frontend can fetch them directly.
+    """
+    serializer_class = BookProjectSerializer
+    if request.query_params.get('view') == 'summary':
+        serializer_class = BookProjectSummarySerializer
+    names = list(serializer_class().fields)
+    fields = None
+    if request.query_params.get('fields'):
+        fields = [name.strip() for name in request.query_params['fields'].split(',') if name.strip()]
+        unknown = sorted(set(fields) - set(names))
+        if unknown:
+            return Response({
+                'status': 'error',
+                'message': f"Unknown fields: {', '.join(unknown)}."
+            }, status=status.HTTP_400_BAD_REQUEST)
+        names = fields
+
+    # id and created_at are the pagination key
+    columns = {'id', 'created_at'} | {name for name in names if name != 'user_email'}
+    if 'user_email' in names:
+        projects = projects.select_related('user')
+        columns |= {'user', 'user__email'}
+    projects = projects.only(*columns)
+
+    def serialize(page):
+        data = serializer_class(page, many=True, fields=fields).data
+        if absolute_urls:
+            # Resolve the host once per response rather than per URL
+            root = request.build_absolute_uri('/').rstrip('/')
+            for item in data:
+                for field in ('pdf_file', 'cover_file'):
+                    val = item.get(field)
+                    # If it's already absolute, leave it
+                    if val and not str(val).lower().startswith('http'):
+                        item[field] = root + val
+        return data
+
+    return paginate(request, projects, serialize)
+
+
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def admin_order_detail(request, pk):
@@ -43,13 +121,29 @@ def admin_shipment_orders(request):
     orders = BookProject.objects.filter(
         order_status='paid',
         is_shipment_prepared=True
-    ).order_by("-created_at")
-    serializer = BookProjectSerializer(orders, many=True)
-    return Response({
-        "status": "success",
-        "results": len(serializer.data),
-        "data": serializer.data
-    })
+    )
+    return paginate_projects(request, orders)
+
+
+# ===== Export paid orders as CSV / XLSX =====
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def admin_export_orders(request, file_type):
+    if not request.user.is_staff:
+        return Response({"detail": "Not authorized."}, status=status.HTTP_403_FORBIDDEN)
+    if file_type not in CONTENT_TYPES:
+        return Response({
+            'status': 'error',
+            'message': 'file_type must be csv or xlsx.'
+        }, status=status.HTTP_400_BAD_REQUEST)
+
+    filters = OrderExportFilterSerializer(data=request.query_params)
+    if not filters.is_valid():
+        return Response({
+            'status': 'error',
+            'errors': filters.errors
+        }, status=status.HTTP_400_BAD_REQUEST)
+    return export_response(export_queryset(filters.validated_data), file_type)
 
 
 # ===== NEW: Mark order as ready for shipment =====
@@ -83,7 +177,20 @@ class UploadBookProjectView(APIView):
 
     def post(self, request):
         data = request.data.copy()
-        cover_file = request.FILES.get('cover_file')
+
+        # Files sent earlier through a chunked upload (see book/uploads.py)
+        uploads = {}
+        for field, key in (('pdf_file', 'pdf_upload_id'), ('cover_file', 'cover_upload_id')):
+            if data.get(key) and not request.FILES.get(field):
+                try:
+                    uploads[field] = completed_upload(request.user, data[key], field)
+                except UploadError as e:
+                    return Response({
+                        'status': 'error',
+                        'message': str(e)
+                    }, status=e.status_code)
+
+        cover_file = request.FILES.get('cover_file') or uploads.get('cover_file')
         cover_description = data.get('cover_description')
         is_cover_expert = data.get('is_cover_expert', False)
 
@@ -93,11 +200,16 @@ class UploadBookProjectView(APIView):
                 'message': 'Please provide either a cover file or a cover description.'
             }, status=status.HTTP_400_BAD_REQUEST)
 
+        files = {field: AssembledFile(upload) for field, upload in uploads.items()}
+        for field, file in files.items():
+            data[field] = file
         serializer = BookProjectSerializer(data=data)
 
         if serializer.is_valid():
             try:
                 book_project = serializer.save(user=request.user)
+                for upload in uploads.values():
+                    mark_attached(upload, book_project)
                 if is_cover_expert:
                     self.send_cover_expert_email(request, book_project)
                 return Response({
@@ -111,7 +223,12 @@ class UploadBookProjectView(APIView):
                     'status': 'error',
                     'message': 'An error occurred while saving the project.'
                 }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+            finally:
+                for file in files.values():
+                    file.close()
         else:
+            for file in files.values():
+                file.close()
             logger.warning("Validation error: %s", serializer.errors)
             return Response({
                 'status': 'error',
@@ -158,6 +275,106 @@ class UploadBookProjectView(APIView):
             logger.error(f"Failed to send cover expert email: {str(e)}")
 
 
+# ===== Resumable chunked uploads (see book/uploads.py) =====
+class UploadSessionCreateView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request):
+        serializer = UploadSessionSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response({
+                'status': 'error',
+                'errors': serializer.errors
+            }, status=status.HTTP_400_BAD_REQUEST)
+
+        session = create_session(request.user, **serializer.validated_data)
+        return Response({
+            'status': 'success',
+            'data': UploadSessionSerializer(session).data,
+            'chunk_size': settings.UPLOAD_CHUNK_MAX_SIZE
+        }, status=status.HTTP_201_CREATED)
+
+
+class UploadSessionView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, pk):
+        session = get_object_or_404(UploadSession, pk=pk, user=request.user)
+        return Response({
+            'status': 'success',
+            'data': UploadSessionSerializer(session).data
+        })
+
+    def put(self, request, pk):
+        """One chunk as the raw request body; never parsed as a form."""
+        session = get_object_or_404(UploadSession, pk=pk, user=request.user)
+        try:
+            offset = int(request.headers['Upload-Offset'])
+            length = int(request.headers['Content-Length'])
+            checksum = request.headers['Upload-Checksum']
+        except (KeyError, ValueError):
+            return Response({
+                'status': 'error',
+                'message': 'Upload-Offset, Upload-Checksum and Content-Length headers are required.'
+            }, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            session = write_chunk(session, request.stream, offset, length, checksum)
+        except UploadError as e:
+            session.refresh_from_db(fields=['offset'])
+            return Response({
+                'status': 'error',
+                'message': str(e),
+                'offset': session.offset
+            }, status=e.status_code)
+        return Response({
+            'status': 'success',
+            'data': UploadSessionSerializer(session).data
+        })
+
+    def delete(self, request, pk):
+        session = get_object_or_404(UploadSession, pk=pk, user=request.user)
+        delete_session(session)
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+
+class UploadSessionFinalizeView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request, pk):
+        session = get_object_or_404(UploadSession, pk=pk, user=request.user)
+        project = None
+        project_id = request.data.get('book_project_id')
+        if project_id:
+            try:
+                project = BookProject.objects.get(pk=project_id, user=request.user)
+            except (BookProject.DoesNotExist, ValueError):
+                return Response({
+                    'status': 'error',
+                    'message': 'Book project not found.'
+                }, status=status.HTTP_404_NOT_FOUND)
+
+        try:
+            session = complete_session(session)
+            if project is not None:
+                if session.status == 'attached':
+                    raise UploadError("Upload is already attached.", status.HTTP_409_CONFLICT)
+                attach_upload(session, project)
+        except UploadError as e:
+            return Response({
+                'status': 'error',
+                'message': str(e)
+            }, status=e.status_code)
+
+        response = {
+            'status': 'success',
+            'data': UploadSessionSerializer(session).data
+        }
+        if project is not None:
+            response['book_project'] = BookProjectSerializer(project).data
+        return Response(response)
+
+
 class SaveOrderAPIView(APIView):
     permission_classes = [IsAuthenticated]
     parser_classes = [MultiPartParser, FormParser]
@@ -176,15 +393,6 @@ class SaveOrderAPIView(APIView):
                     'message': 'Book project not found.'
                 }, status=status.HTTP_404_NOT_FOUND)
 
-            # Normalize money fields
-            def norm_money(val):
-                try:
-                    if val is None or val == "":
-                        return None
-                    return f"{float(val):.2f}"
-                except Exception:
-                    return None
-
             # Update fields from request
             updatable_fields = [
                 'first_name','last_name','company','address','apt_floor','country','state','city','postal_code','phone_number','account_type',
@@ -224,14 +432,6 @@ class SaveOrderAPIView(APIView):
                 'message': 'Please provide either a cover file or a cover description.'
             }, status=status.HTTP_400_BAD_REQUEST)
 
-        def norm_money(val):
-            try:
-                if val is None or val == "":
-                    return None
-                return f"{float(val):.2f}"
-            except Exception:
-                return None
-
         for key in ['shipping_rate', 'tax', 'product_price', 'subtotal']:
             if key in data:
                 data[key] = norm_money(data.get(key))
@@ -265,13 +465,8 @@ class SaveOrderAPIView(APIView):
 @permission_classes([IsAuthenticated])
 def user_books(request):
     try:
-        books = BookProject.objects.filter(user=request.user).order_by('-created_at')
-        serializer = BookProjectSerializer(books, many=True)
-        return Response({
-            'status': 'success',
-            'results': len(serializer.data),
-            'data': serializer.data
-        }, status=status.HTTP_200_OK)
+        books = BookProject.objects.filter(user=request.user)
+        return paginate_projects(request, books)
     except Exception as e:
         logger.error("Failed to fetch user's book projects", exc_info=True)
         return Response({
@@ -284,27 +479,8 @@ def user_books(request):
 @permission_classes([IsAuthenticated])
 def user_unpaid_projects(request):
     try:
-        books = BookProject.objects.filter(user=request.user, order_status='draft').order_by('-created_at')
-        serializer = BookProjectSerializer(books, many=True)
-        # Ensure file URLs are absolute so frontend can fetch them directly
-        data = serializer.data
-        for item in data:
-            for field in ('pdf_file', 'cover_file'):
-                val = item.get(field)
-                if val:
-                    # If it's already absolute, leave it. Otherwise build absolute URI.
-                    if not str(val).lower().startswith('http'):
-                        try:
-                            item[field] = request.build_absolute_uri(val)
-                        except Exception:
-                            # fallback: leave value as-is
-                            pass
-
-        return Response({
-            'status': 'success',
-            'results': len(data),
-            'data': data
-        }, status=status.HTTP_200_OK)
+        books = BookProject.objects.filter(user=request.user, order_status='draft')
+        return paginate_projects(request, books, absolute_urls=True)
     except Exception as e:
         logger.error("Failed to fetch user's unpaid projects", exc_info=True)
         return Response({
@@ -317,13 +493,8 @@ def user_unpaid_projects(request):
 @permission_classes([IsAuthenticated])
 def user_paid_orders(request):
     try:
-        books = BookProject.objects.filter(user=request.user, order_status='paid').order_by('-created_at')
-        serializer = BookProjectSerializer(books, many=True)
-        return Response({
-            'status': 'success',
-            'results': len(serializer.data),
-            'data': serializer.data
-        }, status=status.HTTP_200_OK)
+        books = BookProject.objects.filter(user=request.user, order_status='paid')
+        return paginate_projects(request, books)
     except Exception as e:
         logger.error("Failed to fetch user's paid orders", exc_info=True)
         return Response({
@@ -428,53 +599,9 @@ def admin_all_orders(request):
     orders = BookProject.objects.filter(
         order_status='paid',
         is_shipment_prepared=False  # ← Hides orders already in shipment
-    ).order_by("-created_at")
-    
-    data = []
-    for order in orders:
-        data.append({
-            "id": order.id,
-            "title": order.title,
-            "user_email": order.user.email,
-            "category": order.category,
-            "language": order.language,
-            "page_count": order.page_count,
-            "created_at": order.created_at,
-            "binding_type": order.binding_type,
-            "cover_finish": order.cover_finish,
-            "interior_color": order.interior_color,
-            "paper_type": order.paper_type,
-            "trim_size": order.trim_size,
-            "pdf_file": order.pdf_file.url if order.pdf_file else None,
-            "cover_file": order.cover_file.url if order.cover_file else None,
-            "cover_description": order.cover_description,
-            "first_name": order.first_name,
-            "last_name": order.last_name,
-            "company": order.company,
-            "address": order.address,
-            "apt_floor": order.apt_floor,
-            "country": order.country,
-            "state": order.state,
-            "city": order.city,
-            "postal_code": order.postal_code,
-            "phone_number": order.phone_number,
-            "account_type": order.account_type,
-            "has_resale_cert": order.has_resale_cert,
-            "shipping_rate": order.shipping_rate,
-            "tax": order.tax,
-            "courier_name": order.courier_name,
-            "estimated_delivery": order.estimated_delivery,
-            "selected_service": order.selected_service,
-            "product_quantity": order.product_quantity,
-            "product_price": order.product_price,
-            "subtotal": order.subtotal,
-        })
+    ).values(*ADMIN_ORDER_FIELDS, user_email=F('user__email'))
 
-    return Response({
-        "status": "success",
-        "results": len(data),
-        "data": data
-    })
+    return paginate(request, orders, lambda page: AdminOrderRowSerializer(page, many=True).data)
 
 
 @api_view(['PATCH'])
@@ -1,5 +1,6 @@
 from django.core.management.base import BaseCommand
 from calender.models import BindingType, InteriorColor, PaperType, CoverFinish
+from pricing.catalog import bump_catalog_version
 
 class Command(BaseCommand):
     help = 'Seed data for Calendar Calculator'
@@ -16,4 +17,6 @@ class Command(BaseCommand):
         CoverFinish.objects.create(name='Gloss', price=0.00)
         CoverFinish.objects.create(name='Matte', price=0.00)
 
+        bump_catalog_version('calender', reset=True)
+
         self.stdout.write(self.style.SUCCESS("📘 Calendar seed data added successfully!"))
@@ -2,35 +2,46 @@ from rest_framework.decorators import api_view
 from rest_framework.response import Response
 from .models import *
 from .serializers import *
-from decimal import Decimal
+from pricing.catalog import bump_catalog_version, catalog_condition
+from pricing.engine import get_price_plan
+from pricing.money import to_decimal
+from pricing.quote_cache import get_quote_cache
+from pricing.quote_urls import cacheable_quote, quote_payload
 
-@api_view(['GET'])
-def get_dropdowns(request):
-    return Response({
+CATALOG = 'calender'
+
+def dropdown_data():
+    return {
         "bindings": BindingTypeSerializer(BindingType.objects.all(), many=True).data,
         "interior_colors": InteriorColorSerializer(InteriorColor.objects.all(), many=True).data,
         "paper_types": PaperTypeSerializer(PaperType.objects.all(), many=True).data,
         "cover_finishes": CoverFinishSerializer(CoverFinish.objects.all(), many=True).data,
-    })
+    }
+
+
+@catalog_condition(CATALOG)
+@api_view(['GET'])
+def get_dropdowns(request):
+    return Response(dropdown_data())
+
+quote_cache = get_quote_cache(CATALOG)
+
+def _price(quote):
+    return {
+        "cost_per_book": to_decimal(quote.cost_per_book),
+        "total_cost": to_decimal(quote.total_cost),
+        "discounted_amount": to_decimal(quote.discount),
+        "amount_after_discount": to_decimal(quote.final_price)
+    }
 
-@api_view(['POST'])
+@cacheable_quote(CATALOG)
+@api_view(['GET', 'POST'])
 def calculate_price(request):
-    data = request.data
+    data = quote_payload(request)
     try:
-        qty = int(data['quantity'])
-        binding = BindingType.objects.get(id=data['binding_id'])
-        base_price = binding.price
-
-        total_price = base_price * qty
-        discount = total_price * Decimal(0.05) if qty > 100 else Decimal(0)
-        final_amount = total_price - discount
-
-        return Response({
-            "cost_per_book": round(base_price, 2),
-            "total_cost": round(total_price, 2),
-            "discounted_amount": round(discount, 2),
-            "amount_after_discount": round(final_amount, 2)
-        })
+        plan = get_price_plan(CATALOG)
+        key = plan.config_key(data)
+        return Response(quote_cache.get_or_compute(plan.version, key, lambda: _price(plan.quote(data))))
     except Exception as e:
         return Response({"error": str(e)}, status=400)
 
@@ -62,6 +73,7 @@ def update_binding_type(request, pk):
         serializer = BindingTypeSerializer(binding, data=request.data, partial=True)
         if serializer.is_valid():
             serializer.save()
+            bump_catalog_version(CATALOG)
             return Response(serializer.data)
         return Response(serializer.errors, status=400)
     except BindingType.DoesNotExist:
@@ -75,6 +87,7 @@ def update_interior_color(request, pk):
         serializer = InteriorColorSerializer(color, data=request.data, partial=True)
         if serializer.is_valid():
             serializer.save()
+            bump_catalog_version(CATALOG)
             return Response(serializer.data)
         return Response(serializer.errors, status=400)
     except InteriorColor.DoesNotExist:
@@ -88,6 +101,7 @@ def update_paper_type(request, pk):
         serializer = PaperTypeSerializer(paper, data=request.data, partial=True)
         if serializer.is_valid():
             serializer.save()
+            bump_catalog_version(CATALOG)
             return Response(serializer.data)
         return Response(serializer.errors, status=400)
     except PaperType.DoesNotExist:
@@ -101,6 +115,7 @@ def update_cover_finish(request, pk):
         serializer = CoverFinishSerializer(finish, data=request.data, partial=True)
         if serializer.is_valid():
             serializer.save()
+            bump_catalog_version(CATALOG)
             return Response(serializer.data)
         return Response(serializer.errors, status=400)
     except CoverFinish.DoesNotExist:
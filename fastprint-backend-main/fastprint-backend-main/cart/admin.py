@@ -35,7 +35,8 @@ class CartItemAdmin(admin.ModelAdmin):
         ('Product Details', {
             'fields': (
                 'product_quantity', 'product_price',
-                'subtotal', 'display_total_cost'
+                'subtotal', 'display_total_cost',
+                'quote_config', 'price_list'
             )
         }),
         ('Timestamps', {
@@ -50,6 +50,16 @@ class CartItem(models.Model):
     product_price = models.DecimalField(max_digits=12, decimal_places=2, null=True, blank=True)
     subtotal = models.DecimalField(max_digits=12, decimal_places=2)
     display_total_cost = models.DecimalField(max_digits=12, decimal_places=2)
+
+    # Calculator configuration and the price list it was priced against
+    quote_config = models.JSONField(null=True, blank=True)
+    price_list = models.ForeignKey(
+        'pricing.PriceList',
+        on_delete=models.PROTECT,
+        null=True,
+        blank=True,
+        related_name='+'
+    )
     
     # Metadata
     created_at = models.DateTimeField(auto_now_add=True)
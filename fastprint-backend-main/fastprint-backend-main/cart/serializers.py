@@ -1,8 +1,9 @@
 from rest_framework import serializers
 from .models import CartItem
+from pricing.serializers import PinnedQuoteMixin
 
 
-class CartItemSerializer(serializers.ModelSerializer):
+class CartItemSerializer(PinnedQuoteMixin, serializers.ModelSerializer):
     """
     Serializer for CartItem model.
     Handles all cart item data including JSON fields.
@@ -39,10 +40,12 @@ class CartItemSerializer(serializers.ModelSerializer):
             'product_price',
             'subtotal',
             'display_total_cost',
+            'quote_config',
+            'price_list',
             'created_at',
             'updated_at',
         ]
-        read_only_fields = ['user', 'created_at', 'updated_at']
+        read_only_fields = ['user', 'price_list', 'created_at', 'updated_at']
     
     def get_user_email(self, obj):
         return obj.user.email if obj.user else None
@@ -1,7 +1,8 @@
 from django.urls import path
-from .views import CartItemListCreateView, CartItemDetailView
+from .views import CartItemListCreateView, CartItemDetailView, CartValidateView
 
 urlpatterns = [
     path('items/', CartItemListCreateView.as_view(), name='cart-item-list-create'),
     path('items/<int:pk>/', CartItemDetailView.as_view(), name='cart-item-detail'),
+    path('validate/', CartValidateView.as_view(), name='cart-validate'),
 ]
\ No newline at end of file
@@ -5,6 +5,7 @@ from rest_framework.permissions import IsAuthenticated
 from django.shortcuts import get_object_or_404
 from .models import CartItem
 from .serializers import CartItemSerializer
+from pricing.price_lists import check_item_total
 import logging
 
 logger = logging.getLogger(__name__)
@@ -166,4 +167,40 @@ class CartItemDetailView(APIView):
             return Response({
                 'status': 'error',
                 'message': 'Failed to delete cart item'
-            }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
\ No newline at end of file
+            }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+class CartValidateView(APIView):
+    """
+    POST: Re-derive every cart item total from its pinned price list in one pass
+    """
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request):
+        """Validate all cart items of the current user"""
+        try:
+            cart_items = CartItem.objects.filter(user=request.user).values(
+                'id', 'quote_config', 'price_list_id', 'product_quantity', 'product_price', 'subtotal'
+            )
+            results = []
+            for item in cart_items:
+                if item['price_list_id'] is None:
+                    result = {'valid': False, 'error': 'Cart item is not pinned to a price list.'}
+                else:
+                    result = check_item_total(
+                        item['price_list_id'], item['quote_config'], item['product_quantity'],
+                        item['subtotal'], item['product_price']
+                    )
+                results.append({'id': item['id'], **result})
+            return Response({
+                'status': 'success',
+                'valid': all(r['valid'] for r in results),
+                'results': len(results),
+                'data': results
+            }, status=status.HTTP_200_OK)
+        except Exception as e:
+            logger.error(f"Error validating cart: {str(e)}", exc_info=True)
+            return Response({
+                'status': 'error',
+                'message': 'Failed to validate cart'
+            }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
@@ -1,4 +1,3 @@
-from django.contrib import admin
 from .models import (
     ComicTrimSize,
     ComicBindingType,
@@ -6,9 +5,14 @@ from .models import (
     ComicPaperType,
     ComicCoverFinish,
 )
+from .views import CATALOG
+from pricing.admin import register_catalog_options
 
-admin.site.register(ComicTrimSize)
-admin.site.register(ComicBindingType)
-admin.site.register(ComicInteriorColor)
-admin.site.register(ComicPaperType)
-admin.site.register(ComicCoverFinish)
+register_catalog_options(
+    CATALOG,
+    ComicTrimSize,
+    ComicBindingType,
+    ComicInteriorColor,
+    ComicPaperType,
+    ComicCoverFinish,
+)
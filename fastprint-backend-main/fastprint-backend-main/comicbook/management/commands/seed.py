@@ -6,6 +6,7 @@ from comicbook.models import (
     ComicPaperType,
     ComicCoverFinish
 )
+from pricing.catalog import bump_catalog_version
 
 class Command(BaseCommand):
     help = "Seeds the database with Comic Book data"
@@ -51,5 +52,7 @@ class Command(BaseCommand):
         ComicBindingType.objects.get_or_create(name="Linen Wrap", price=13.80, trim_size=manga, min_pages=32)
         ComicBindingType.objects.get_or_create(name="Coil Bound", price=6.18, trim_size=manga, min_pages=3)
 
+        bump_catalog_version('comicbook', reset=True)
+
         self.stdout.write(self.style.SUCCESS("✅ Comic Book sample data seeded."))
 
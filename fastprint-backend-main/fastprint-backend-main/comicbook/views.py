@@ -4,20 +4,32 @@ from rest_framework.response import Response
 from rest_framework import status
 from .models import *
 from .serializers import *
-from .utils import get_allowed_binding_names
-from decimal import Decimal
+from pricing.catalog import bump_catalog_version, catalog_condition
+from pricing.eligibility import binding_snapshot
+from pricing.engine import get_price_plan
+from pricing.money import to_decimal
+from pricing.quote_cache import get_quote_cache
+from pricing.quote_urls import cacheable_quote, quote_payload
 
+CATALOG = 'comicbook'
 
+binding_catalog = binding_snapshot(CATALOG, ComicBindingType, ComicBindingTypeSerializer, by_trim_size=True)
 
-@api_view(['GET'])
-@permission_classes([AllowAny])
-def get_comic_dropdowns(request):
-    return Response({
+
+def dropdown_data():
+    return {
         'trim_sizes': ComicTrimSizeSerializer(ComicTrimSize.objects.all(), many=True).data,
         'interior_colors': ComicInteriorColorSerializer(ComicInteriorColor.objects.all(), many=True).data,
         'paper_types': ComicPaperTypeSerializer(ComicPaperType.objects.all(), many=True).data,
         'cover_finishes': ComicCoverFinishSerializer(ComicCoverFinish.objects.all(), many=True).data,
-    })
+    }
+
+
+@catalog_condition(CATALOG)
+@api_view(['GET'])
+@permission_classes([AllowAny])
+def get_comic_dropdowns(request):
+    return Response(dropdown_data())
 
 
 @api_view(['GET'])
@@ -29,44 +41,30 @@ def get_comic_bindings(request):
     except (TypeError, ValueError):
         return Response({'error': 'Invalid parameters'}, status=status.HTTP_400_BAD_REQUEST)
 
-    allowed = get_allowed_binding_names(page_count)
-    bindings = ComicBindingType.objects.filter(trim_size_id=trim_size_id, name__in=allowed, min_pages__lte=page_count)
-    if bindings.exists():
-        bindings = bindings if not bindings[0].max_pages else bindings.filter(max_pages__gte=page_count)
-
-    return Response(ComicBindingTypeSerializer(bindings, many=True).data)
+    return Response(binding_catalog.get().bindings_for(page_count, trim_size_id))
 
 
-@api_view(['POST'])
-@permission_classes([AllowAny])
-def calculate_comic_cost(request):
-    try:
-        data = request.data
-        page_count = int(data['page_count'])
-        quantity = int(data['quantity'])
+quote_cache = get_quote_cache(CATALOG)
 
-        binding = ComicBindingType.objects.get(id=data['binding_id'])
-        interior = ComicInteriorColor.objects.get(id=data['interior_color_id'])
-        paper = ComicPaperType.objects.get(id=data['paper_type_id'])
-        cover = ComicCoverFinish.objects.get(id=data['cover_finish_id'])
 
-        unit_price = (Decimal(binding.price)
-                      + Decimal(interior.price_per_page) * page_count
-                      + Decimal(paper.price_per_page) * page_count
-                      + Decimal(cover.price))
+def _comic_cost(quote):
+    return {
+        'cost_per_book': to_decimal(quote.cost_per_book),
+        'total_cost': to_decimal(quote.total_cost),
+        'discount': to_decimal(quote.discount),
+        'final_price': to_decimal(quote.final_price)
+    }
 
-        total_price = unit_price * quantity
 
-        discount = Decimal('0.00')
-        if quantity > 100:
-            discount = total_price * Decimal('0.10')  # example 10% discount
-
-        return Response({
-            'cost_per_book': round(unit_price, 2),
-            'total_cost': round(total_price, 2),
-            'discount': round(discount, 2),
-            'final_price': round(total_price - discount, 2)
-        })
+@cacheable_quote(CATALOG)
+@api_view(['GET', 'POST'])
+@permission_classes([AllowAny])
+def calculate_comic_cost(request):
+    try:
+        data = quote_payload(request)
+        plan = get_price_plan(CATALOG)
+        key = plan.config_key(data)
+        return Response(quote_cache.get_or_compute(plan.version, key, lambda: _comic_cost(plan.quote(data))))
 
     except Exception as e:
         return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
@@ -80,6 +78,7 @@ def update_comic_binding_type(request, pk):
     serializer = ComicBindingTypeSerializer(obj, data=request.data, partial=True)
     if serializer.is_valid():
         serializer.save()
+        bump_catalog_version(CATALOG)
         return Response(serializer.data)
     return Response(serializer.errors, status=400)
 
@@ -93,6 +92,7 @@ def update_comic_interior_color(request, pk):
     serializer = ComicInteriorColorSerializer(obj, data=request.data, partial=True)
     if serializer.is_valid():
         serializer.save()
+        bump_catalog_version(CATALOG)
         return Response(serializer.data)
     return Response(serializer.errors, status=400)
 
@@ -106,6 +106,7 @@ def update_comic_paper_type(request, pk):
     serializer = ComicPaperTypeSerializer(obj, data=request.data, partial=True)
     if serializer.is_valid():
         serializer.save()
+        bump_catalog_version(CATALOG)
         return Response(serializer.data)
     return Response(serializer.errors, status=400)
 
@@ -119,6 +120,7 @@ def update_comic_cover_finish(request, pk):
     serializer = ComicCoverFinishSerializer(obj, data=request.data, partial=True)
     if serializer.is_valid():
         serializer.save()
+        bump_catalog_version(CATALOG)
         return Response(serializer.data)
     return Response(serializer.errors, status=400)
 @api_view(['GET'])
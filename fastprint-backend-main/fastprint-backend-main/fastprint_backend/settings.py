@@ -11,6 +11,7 @@ https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
 import os
+import tempfile
 from pathlib import Path
 from datetime import timedelta
 from decouple import config
@@ -354,6 +355,33 @@ SESSION_COOKIE_SAMESITE = 'Lax'
 FILE_UPLOAD_MAX_MEMORY_SIZE = 104857600  # 100 MB
 DATA_UPLOAD_MAX_MEMORY_SIZE = 104857600  # 100 MB
 
+# Resumable chunked uploads (book/uploads.py). Partial files are assembled in
+# UPLOAD_SESSION_DIR; keep it on the MEDIA_ROOT filesystem so finished files
+# are moved into place rather than copied.
+UPLOAD_SESSION_DIR = config('UPLOAD_SESSION_DIR', default=os.path.join(BASE_DIR, 'upload_sessions'))
+UPLOAD_MAX_SIZE = config('UPLOAD_MAX_SIZE', default=2 * 1024 ** 3, cast=int)  # 2 GB
+UPLOAD_CHUNK_MAX_SIZE = config('UPLOAD_CHUNK_MAX_SIZE', default=8 * 1024 ** 2, cast=int)  # 8 MB
+
+# Seconds a worker trusts its cached catalog version before re-reading it from
+# the database. Can be raised when CACHES points at a shared backend (Redis),
+# where a bump is visible to every worker immediately.
+CATALOG_VERSION_CACHE_TIMEOUT = config('CATALOG_VERSION_CACHE_TIMEOUT', default=5, cast=int)
+
+# Per-process memoization of calculator quotes (entries, seconds)
+QUOTE_CACHE_MAXSIZE = config('QUOTE_CACHE_MAXSIZE', default=2048, cast=int)
+QUOTE_CACHE_TTL = config('QUOTE_CACHE_TTL', default=300, cast=int)
+
+# Cache-Control max-age (seconds) of GET quote responses; caches revalidate
+# them with the catalog ETag afterwards
+QUOTE_HTTP_MAX_AGE = config('QUOTE_HTTP_MAX_AGE', default=60, cast=int)
+
+# Print book price grid written by `manage.py build_price_grid` and memory-mapped
+# by every worker; quotes fall back to the catalog snapshot while it is missing or
+# stale. A generated file, so it defaults to outside the source tree.
+PRICE_GRID_PATH = config(
+    'PRICE_GRID_PATH', default=os.path.join(tempfile.gettempdir(), 'fastprint', 'printbook_price_grid.bin')
+)
+
 # Cache Configuration (Optional - for production)
 # CACHES = {
 #     'default': {
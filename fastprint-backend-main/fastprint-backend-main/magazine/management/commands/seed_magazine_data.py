@@ -1,5 +1,6 @@
 from django.core.management.base import BaseCommand
 from magazine.models import TrimSize, InteriorColor, PaperType, BindingType, CoverFinish
+from pricing.catalog import bump_catalog_version
 
 class Command(BaseCommand):
     help = 'Seed initial magazine data'
@@ -23,11 +24,13 @@ class Command(BaseCommand):
         CoverFinish.objects.get_or_create(name="Gloss", price=0.00)
         CoverFinish.objects.get_or_create(name="Matte", price=0.00)
 
-        # Binding Types with Prices
-        BindingType.objects.get_or_create(name="Perfect bond", price=2.50)
-        BindingType.objects.get_or_create(name="Saddle Stitch", price=5.00)
-        BindingType.objects.get_or_create(name="Case Wrap", price=9.75)
-        BindingType.objects.get_or_create(name="Linen Wrap", price=13.80)
-        BindingType.objects.get_or_create(name="Coil Bond", price=6.18)
+        # Binding Types with Prices and minimum page counts
+        BindingType.objects.get_or_create(name="Perfect bond", price=2.50, min_pages=32)
+        BindingType.objects.get_or_create(name="Saddle Stitch", price=5.00, min_pages=4)
+        BindingType.objects.get_or_create(name="Case Wrap", price=9.75, min_pages=24)
+        BindingType.objects.get_or_create(name="Linen Wrap", price=13.80, min_pages=32)
+        BindingType.objects.get_or_create(name="Coil Bond", price=6.18, min_pages=3)
+
+        bump_catalog_version('magazine', reset=True)
 
         self.stdout.write(self.style.SUCCESS('✅ Magazine seed data loaded successfully.'))
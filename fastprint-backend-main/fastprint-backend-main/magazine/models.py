@@ -6,6 +6,8 @@ class TrimSize(models.Model):
 class BindingType(models.Model):
     name = models.CharField(max_length=100)
     price = models.DecimalField(max_digits=6, decimal_places=2)
+    min_pages = models.IntegerField(default=0)
+    max_pages = models.IntegerField(default=10000)
 
 class InteriorColor(models.Model):
     name = models.CharField(max_length=100)
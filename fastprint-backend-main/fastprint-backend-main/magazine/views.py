@@ -3,61 +3,53 @@ from rest_framework.response import Response
 from rest_framework import status
 from .models import *
 from .serializers import *
-from decimal import Decimal
+from pricing.catalog import bump_catalog_version, catalog_condition
+from pricing.eligibility import binding_snapshot
+from pricing.engine import get_price_plan
+from pricing.money import to_decimal
+from pricing.quote_cache import get_quote_cache
+from pricing.quote_urls import cacheable_quote, quote_payload
 
-@api_view(['GET'])
-def get_dropdowns(request):
-    return Response({
+CATALOG = 'magazine'
+
+binding_catalog = binding_snapshot(CATALOG, BindingType, BindingTypeSerializer)
+
+def dropdown_data():
+    return {
         "trim_sizes": TrimSizeSerializer(TrimSize.objects.all(), many=True).data,
         "interior_colors": InteriorColorSerializer(InteriorColor.objects.all(), many=True).data,
         "paper_types": PaperTypeSerializer(PaperType.objects.all(), many=True).data,
         "cover_finishes": CoverFinishSerializer(CoverFinish.objects.all(), many=True).data,
         "binding_types": BindingTypeSerializer(BindingType.objects.all(), many=True).data,
-    })
+    }
+
+
+@catalog_condition(CATALOG)
+@api_view(['GET'])
+def get_dropdowns(request):
+    return Response(dropdown_data())
 
 @api_view(['GET'])
 def get_bindings(request):
     page_count = int(request.GET.get('page_count', 0))
-    if page_count >= 32:
-        bindings = BindingType.objects.all()
-    elif page_count >= 24:
-        bindings = BindingType.objects.filter(name__in=['Coil Bound', 'Saddle Stitch', 'Case Wrap'])
-    elif page_count >= 4:
-        bindings = BindingType.objects.filter(name__in=['Coil Bound', 'Saddle Stitch'])
-    elif page_count >= 3:
-        bindings = BindingType.objects.filter(name='Coil Bound')
-    else:
-        bindings = BindingType.objects.none()
-    return Response(BindingTypeSerializer(bindings, many=True).data)
+    return Response(binding_catalog.get().bindings_for(page_count))
 
-@api_view(['POST'])
-def calculate_price(request):
-    data = request.data
-    try:
-        pages = int(data['page_count'])
-        qty = int(data['quantity'])
-
-        binding = BindingType.objects.get(id=data['binding_id'])
-        interior = InteriorColor.objects.get(id=data['interior_color_id'])
-        paper = PaperType.objects.get(id=data['paper_type_id'])
-        cover = CoverFinish.objects.get(id=data['cover_finish_id'])
-
-        binding_price = binding.price
-        interior_price = interior.price_per_page * pages
-        paper_price = paper.price_per_page * pages
-        cover_price = cover.price
+quote_cache = get_quote_cache(CATALOG)
 
-        cost_per_book = binding_price + interior_price + paper_price + cover_price
-        total_cost = cost_per_book * qty
-
-        if qty > 100:
-            discount = total_cost * Decimal('0.05')
-            total_cost -= discount
+def _price(quote):
+    return {
+        "cost_per_book": to_decimal(quote.cost_per_book),
+        "total_cost": to_decimal(quote.final_price)
+    }
 
-        return Response({
-            "cost_per_book": round(cost_per_book, 2),
-            "total_cost": round(total_cost, 2)
-        })
+@cacheable_quote(CATALOG)
+@api_view(['GET', 'POST'])
+def calculate_price(request):
+    data = quote_payload(request)
+    try:
+        plan = get_price_plan(CATALOG)
+        key = plan.config_key(data)
+        return Response(quote_cache.get_or_compute(plan.version, key, lambda: _price(plan.quote(data))))
 
     except Exception as e:
         return Response({"error": str(e)}, status=400)
@@ -77,6 +69,7 @@ def update_price(type_name):
             new_price = request.data.get(field)
             setattr(instance, field, new_price)
             instance.save()
+            bump_catalog_version(CATALOG)
             return Response({field: getattr(instance, field)})
         except Model.DoesNotExist:
             return Response({'error': 'Not found'}, status=status.HTTP_404_NOT_FOUND)
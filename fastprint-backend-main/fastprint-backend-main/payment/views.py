@@ -8,6 +8,9 @@ import stripe
 import paypalrestsdk
 from .models import PaymentMethodSettings
 from .serializers import PaymentMethodSettingsSerializer
+from pricing.bootstrap import PAYMENT_METHODS
+from pricing.catalog import bump_catalog_version
+from pricing.money import format_cents, parse_cents, to_cents
 from rest_framework.views import APIView  # <-- FIX: Import APIView
 
 
@@ -64,7 +67,7 @@ def create_checkout_session(request):
                     'product_data': {
                         'name': item['name'],
                     },
-                    'unit_amount': int(item['unit_amount']),  # in cents
+                    'unit_amount': parse_cents(item['unit_amount']),  # in cents
                 },
                 'quantity': int(item['quantity']),
             })
@@ -128,8 +131,8 @@ def create_paypal_payment(request):
             )
         
         try:
-            amount_float = float(amount)
-            if amount_float <= 0:
+            amount_cents = to_cents(amount)
+            if amount_cents <= 0:
                 return Response(
                     {'error': 'Amount must be greater than 0'}, 
                     status=status.HTTP_400_BAD_REQUEST
@@ -159,13 +162,13 @@ def create_paypal_payment(request):
                     "items": [{
                         "name": "Book Order",
                         "sku": "book-001",
-                        "price": f"{amount_float:.2f}",
+                        "price": format_cents(amount_cents),
                         "currency": currency,
                         "quantity": 1
                     }]
                 },
                 "amount": {
-                    "total": f"{amount_float:.2f}",
+                    "total": format_cents(amount_cents),
                     "currency": currency
                 },
                 "description": "Book purchase transaction"
@@ -325,15 +328,17 @@ def admin_payment_settings(request):
         serializer = PaymentMethodSettingsSerializer(settings, data=request.data)
         if serializer.is_valid():
             serializer.save()
+            bump_catalog_version(PAYMENT_METHODS)
             return Response(serializer.data)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
+def payment_methods_data():
+    return PaymentMethodSettingsSerializer(PaymentMethodSettings.load()).data
+
 @api_view(['GET'])
 def payment_methods_status(request):
     """GET /api/payment/methods-status/"""
-    settings = PaymentMethodSettings.load()
-    serializer = PaymentMethodSettingsSerializer(settings)
-    return Response(serializer.data)
+    return Response(payment_methods_data())
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
 def send_thank_you_email(request):
@@ -369,7 +374,7 @@ class CreatePaymentIntentView(APIView):
 
     def post(self, request):
         try:
-            amount = int(request.data.get('amount', 0))
+            amount = parse_cents(request.data.get('amount', 0))
             currency = request.data.get('currency', 'usd')
             if amount <= 0:
                 return Response({'error': 'Invalid amount'}, status=status.HTTP_400_BAD_REQUEST)
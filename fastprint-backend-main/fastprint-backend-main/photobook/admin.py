@@ -1,12 +1,8 @@
-from django.contrib import admin
 from .models import *
+from .views import CATALOG
+from pricing.admin import register_catalog_options
 
-admin.site.register(BindingType)
-admin.site.register(Spine)
-admin.site.register(ExteriorColor)
-admin.site.register(FoilStamping)
-admin.site.register(ScreenStamping)
-admin.site.register(CornerProtector)
-admin.site.register(InteriorColor)
-admin.site.register(PaperType)
-admin.site.register(TrimSize)
\ No newline at end of file
+register_catalog_options(
+    CATALOG,
+    BindingType, Spine, ExteriorColor, FoilStamping, ScreenStamping, CornerProtector, InteriorColor, PaperType, TrimSize,
+)
@@ -3,6 +3,7 @@ from photobook.models import (
     TrimSize, BindingType, Spine, ExteriorColor, FoilStamping, ScreenStamping,
     CornerProtector, InteriorColor, PaperType
 )
+from pricing.catalog import bump_catalog_version
 
 class Command(BaseCommand):
     help = 'Seeds Photobook Calculator data based on formula sheet'
@@ -77,4 +78,6 @@ class Command(BaseCommand):
             PaperType(name="80# White-Coated", price_per_page=0.015),
         ])
 
+        bump_catalog_version('photobook', reset=True)
+
         self.stdout.write(self.style.SUCCESS("✅ PhotoBook Calculator options seeded as per formula sheet."))
@@ -4,11 +4,16 @@ from .models import *
 from .serializers import *
 from django.shortcuts import get_object_or_404
 
-from decimal import Decimal
+from pricing.catalog import bump_catalog_version, catalog_condition
+from pricing.engine import get_price_plan
+from pricing.money import to_decimal
+from pricing.quote_cache import get_quote_cache
+from pricing.quote_urls import cacheable_quote, quote_payload
 
-@api_view(['GET'])
-def get_dropdowns(request):
-    return Response({
+CATALOG = 'photobook'
+
+def dropdown_data():
+    return {
         "trim_sizes": TrimSizeSerializer(TrimSize.objects.all(), many=True).data,
         "interior_colors": InteriorColorSerializer(InteriorColor.objects.all(), many=True).data,
         "paper_types": PaperTypeSerializer(PaperType.objects.all(), many=True).data,
@@ -18,62 +23,30 @@ def get_dropdowns(request):
         "foil_stampings": FoilStampingSerializer(FoilStamping.objects.all(), many=True).data,
         "screen_stampings": ScreenStampingSerializer(ScreenStamping.objects.all(), many=True).data,
         "bindings": BindingTypeSerializer(BindingType.objects.all(), many=True).data,
-    })
+    }
+
+
+@catalog_condition(CATALOG)
+@api_view(['GET'])
+def get_dropdowns(request):
+    return Response(dropdown_data())
+
+quote_cache = get_quote_cache(CATALOG)
+
+def _price(quote):
+    return {
+        "cost_per_book": to_decimal(quote.cost_per_book),
+        "total_cost": to_decimal(quote.final_price)
+    }
 
-@api_view(['POST'])
+@cacheable_quote(CATALOG)
+@api_view(['GET', 'POST'])
 def calculate_price(request):
-    data = request.data
+    data = quote_payload(request)
     try:
-        pages = int(data['page_count'])
-        qty = int(data['quantity'])
-
-        binding = BindingType.objects.get(id=data['binding_id'])
-        interior = InteriorColor.objects.get(id=data['interior_color_id'])
-        paper = PaperType.objects.get(id=data['paper_type_id'])
-        corner = CornerProtector.objects.get(id=data['cover_finish_id'])
-
-        base_price = binding.price
-        spine_price = Decimal(5)
-        color_price = Decimal(0)
-        paper_price = Decimal(0)
-
-        if data.get('spine_id'):
-            spine = Spine.objects.get(id=data['spine_id'])
-            spine_price = spine.price
-
-        if data.get('exterior_color_id'):
-            ext = ExteriorColor.objects.get(id=data['exterior_color_id'])
-            color_price = ext.price
-
-        if data.get('foil_stamping_id'):
-            foil = FoilStamping.objects.get(id=data['foil_stamping_id'])
-            foil_price = foil.price
-        else:
-            foil_price = Decimal(0)
-
-        if data.get('screen_stamping_id'):
-            screen = ScreenStamping.objects.get(id=data['screen_stamping_id'])
-            screen_price = screen.price
-        else:
-            screen_price = Decimal(0)
-
-        interior_price = interior.price_per_page * pages
-        paper_price = paper.price_per_page * pages
-        cover_price = corner.price
-
-        book_price = base_price + spine_price + color_price + foil_price + screen_price + interior_price + paper_price + cover_price
-        total_cost = book_price * qty
-
-        if qty > 100:
-            discount = Decimal(0.05) * total_cost
-            discounted = total_cost - discount
-        else:
-            discounted = total_cost
-
-        return Response({
-            "cost_per_book": round(book_price, 2),
-            "total_cost": round(discounted, 2)
-        })
+        plan = get_price_plan(CATALOG)
+        key = plan.config_key(data)
+        return Response(quote_cache.get_or_compute(plan.version, key, lambda: _price(plan.quote(data))))
     except Exception as e:
         return Response({"error": str(e)}, status=400)
 @api_view(['GET'])
@@ -97,6 +70,7 @@ def update_binding(request, pk):
     binding = get_object_or_404(BindingType, pk=pk)
     binding.price = request.data.get('price', binding.price)
     binding.save()
+    bump_catalog_version(CATALOG)
     return Response({"success": True})
 
 
@@ -105,6 +79,7 @@ def update_interior_color(request, pk):
     color = get_object_or_404(InteriorColor, pk=pk)
     color.price_per_page = request.data.get('price_per_page', color.price_per_page)
     color.save()
+    bump_catalog_version(CATALOG)
     return Response({"success": True})
 
 
@@ -113,6 +88,7 @@ def update_paper_type(request, pk):
     paper = get_object_or_404(PaperType, pk=pk)
     paper.price_per_page = request.data.get('price_per_page', paper.price_per_page)
     paper.save()
+    bump_catalog_version(CATALOG)
     return Response({"success": True})
 
 
@@ -121,6 +97,7 @@ def update_cover_finish(request, pk):
     cover = get_object_or_404(CornerProtector, pk=pk)
     cover.price = request.data.get('price', cover.price)
     cover.save()
+    bump_catalog_version(CATALOG)
     return Response({"success": True})
 
 
@@ -129,6 +106,7 @@ def update_spine(request, pk):
     spine = get_object_or_404(Spine, pk=pk)
     spine.price = request.data.get('price', spine.price)
     spine.save()
+    bump_catalog_version(CATALOG)
     return Response({"success": True})
 
 
@@ -137,6 +115,7 @@ def update_exterior_color(request, pk):
     ext = get_object_or_404(ExteriorColor, pk=pk)
     ext.price = request.data.get('price', ext.price)
     ext.save()
+    bump_catalog_version(CATALOG)
     return Response({"success": True})
 
 
@@ -145,6 +124,7 @@ def update_foil_stamping(request, pk):
     foil = get_object_or_404(FoilStamping, pk=pk)
     foil.price = request.data.get('price', foil.price)
     foil.save()
+    bump_catalog_version(CATALOG)
     return Response({"success": True})
 
 
@@ -153,4 +133,5 @@ def update_screen_stamping(request, pk):
     screen = get_object_or_404(ScreenStamping, pk=pk)
     screen.price = request.data.get('price', screen.price)
     screen.save()
+    bump_catalog_version(CATALOG)
     return Response({"success": True})
\ No newline at end of file
@@ -1,11 +1,74 @@
 from django.contrib import admin
 from .models import *
+from .catalog import bump_catalog_version
+from .pricing_engine import CATALOG
 
-admin.site.register(BindingType)
-admin.site.register(SpineType)
-admin.site.register(ExteriorColor)
-admin.site.register(FoilStamping)
-admin.site.register(ScreenStamping)
-admin.site.register(CornerProtector)
-admin.site.register(InteriorColor)
-admin.site.register(PaperType)
+
+class CatalogOptionAdmin(admin.ModelAdmin):
+    """
+    Admin of a catalog's option table. Every write bumps the catalog version,
+    so snapshots, price plans and quote caches pick the edit up at once.
+    """
+    catalog = None
+
+    def save_model(self, request, obj, form, change):
+        super().save_model(request, obj, form, change)
+        bump_catalog_version(self.catalog)
+
+    def delete_model(self, request, obj):
+        super().delete_model(request, obj)
+        bump_catalog_version(self.catalog)
+
+    def delete_queryset(self, request, queryset):
+        super().delete_queryset(request, queryset)
+        bump_catalog_version(self.catalog)
+
+
+def register_catalog_options(catalog, *models):
+    """Register the option tables of ``catalog`` with a CatalogOptionAdmin."""
+    admin_class = type(f'{catalog.title()}OptionAdmin', (CatalogOptionAdmin,), {'catalog': catalog})
+    for model in models:
+        admin.site.register(model, admin_class)
+
+
+register_catalog_options(
+    CATALOG,
+    BindingType, SpineType, ExteriorColor, FoilStamping, ScreenStamping, CornerProtector, InteriorColor, PaperType,
+)
+
+
+@admin.register(PriceList)
+class PriceListAdmin(admin.ModelAdmin):
+    list_display = ('catalog', 'version', 'created_at')
+    list_filter = ('catalog',)
+    readonly_fields = ('catalog', 'version', 'prices', 'created_at')
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+
+@admin.register(DiscountTier)
+class DiscountTierAdmin(admin.ModelAdmin):
+    list_display = ('catalog', 'min_quantity', 'percent')
+    list_filter = ('catalog',)
+    ordering = ('catalog', 'min_quantity')
+
+    # Tiers are compiled into each catalog's price plan
+    def save_model(self, request, obj, form, change):
+        super().save_model(request, obj, form, change)
+        bump_catalog_version(obj.catalog)
+        if change and 'catalog' in form.changed_data:
+            bump_catalog_version(form.initial['catalog'])
+
+    def delete_model(self, request, obj):
+        super().delete_model(request, obj)
+        bump_catalog_version(obj.catalog)
+
+    def delete_queryset(self, request, queryset):
+        catalogs = set(queryset.values_list('catalog', flat=True))
+        super().delete_queryset(request, queryset)
+        for catalog in sorted(catalogs):
+            bump_catalog_version(catalog)
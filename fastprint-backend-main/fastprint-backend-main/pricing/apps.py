@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class PricingConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'pricing'
+
+    def ready(self):
+        from .changes import connect_change_log
+        connect_change_log()
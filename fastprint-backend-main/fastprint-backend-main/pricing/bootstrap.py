@@ -0,0 +1,68 @@
+"""
+Bootstrap payload of the frontend: the dropdowns of every product catalog and
+the payment methods that are enabled, in one response instead of eight.
+
+The payload is serialized to JSON once and kept together with its gzip
+encoding, per process, until the version of one of its catalogs moves. The
+payment method settings are versioned like a catalog (PAYMENT_METHODS), so a
+request in steady state is a cache read of the versions and a write of bytes
+that are already built.
+"""
+import gzip
+import json
+import re
+from collections import namedtuple
+
+from django.utils.module_loading import import_string
+from rest_framework.utils.encoders import JSONEncoder
+
+from .catalog import CatalogsSnapshot
+
+# Version of the payment method settings, bumped when an admin saves them
+PAYMENT_METHODS = 'payment-methods'
+
+# Section of the payload -> function returning its data (the same data as
+# the section's own endpoint)
+SECTIONS = {
+    'printbook': 'printbookcalculator.views.dropdown_data',
+    'comicbook': 'comicbook.views.dropdown_data',
+    'photobook': 'photobook.views.dropdown_data',
+    'magazine': 'magazine.views.dropdown_data',
+    'yearbook': 'yearbook.views.dropdown_data',
+    'calender': 'calender.views.dropdown_data',
+    'pricing': 'pricing.views.dropdown_data',
+    PAYMENT_METHODS: 'payment.views.payment_methods_data',
+}
+
+Bootstrap = namedtuple('Bootstrap', 'versions content gzip_content')
+
+_accepts_gzip = re.compile(r'\bgzip\b')
+
+
+def build_bootstrap(versions):
+    payload = {'versions': dict(zip(SECTIONS, versions))}
+    payload.update((section, import_string(path)()) for section, path in SECTIONS.items())
+    content = json.dumps(payload, cls=JSONEncoder, separators=(',', ':')).encode()
+    return Bootstrap(versions, content, gzip.compress(content, mtime=0))
+
+
+_bootstrap = CatalogsSnapshot(SECTIONS, build_bootstrap)
+
+
+def get_bootstrap():
+    """The bootstrap payload at the current catalog versions."""
+    return _bootstrap.get()
+
+
+def accepts_gzip(request):
+    return bool(_accepts_gzip.search(request.META.get('HTTP_ACCEPT_ENCODING', '')))
+
+
+def bootstrap_etag(versions, gzipped):
+    # Each encoding is a different representation, with its own tag
+    return f'"bootstrap-{".".join(map(str, versions))}{"-gzip" if gzipped else ""}"'
+
+
+def bootstrap_condition_etag(request, *args, **kwargs):
+    """``etag_func`` of the bootstrap view, for ``condition``."""
+    return bootstrap_etag(_bootstrap.current_version(), accepts_gzip(request))
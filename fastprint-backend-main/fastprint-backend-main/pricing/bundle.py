@@ -0,0 +1,91 @@
+"""
+Client pricing bundles.
+
+A bundle is everything a browser needs to price configurations of one catalog
+itself, with the same integer arithmetic as ``PricePlan`` (see engine.py and
+money.py), so a live quote needs no request and the calculate endpoint is only
+called to confirm at checkout::
+
+    {"catalog": "comicbook", "version": 7, "units_per_dollar": 10000,
+     "options": [{"key": "binding_id", "per_page": false, "required": true,
+                  "default": null, "prices": [[1, 25000], [2, 35000]]}, ...],
+     "eligibility": {"binding_id": [[1, 2, 1, 200], ...]},
+     "discount_tiers": [[101, 1000]]}
+
+Prices are ints in units (1/10000 dollar) and discount rates in basis points.
+A client reproduces a quote exactly as:
+
+    units         sum of the fixed options
+                  + page_count × sum of the per-page options;
+                  an omitted optional option costs its ``default``
+    cost_per_book units / 100, rounded half up, in cents
+    total_cost    cost_per_book × quantity
+    discount      total_cost × rate / 10000, rounded half up; the rate
+                  is that of the last tier with min_quantity <= quantity
+                  (0 below the first tier)
+    final_price   total_cost - discount
+
+Eligibility rows are ``[option id, trim size id or null, min pages, max pages
+or null]`` for option tables that limit page counts; they tell the client
+which bindings to offer for a trim size and page count.
+
+Bundles are serialized once per catalog version and served as bytes.
+"""
+import json
+
+from .catalog import VersionedSnapshot
+from .engine import FORMULAS, PricePlan, option_prices
+from .money import UNITS_PER_DOLLAR
+from .price_sheet import price_table
+
+
+def _eligibility(catalog, table):
+    """Eligibility rows of an option table, or None if it does not limit page counts."""
+    model, _ = price_table(catalog, table)
+    columns = {field.attname for field in model._meta.concrete_fields}
+    if not {'min_pages', 'max_pages'} <= columns:
+        return None
+    trim_field = 'trim_size_id' if 'trim_size_id' in columns else None
+    rows = model.objects.order_by('id').values_list('id', 'min_pages', 'max_pages', *filter(None, [trim_field]))
+    return [
+        [pk, trim_size_id[0] if trim_size_id else None, min_pages, max_pages]
+        for pk, min_pages, max_pages, *trim_size_id in rows
+    ]
+
+
+def build_bundle(catalog, version):
+    """The pricing bundle of ``catalog`` at ``version``, as compact JSON bytes."""
+    plan = PricePlan(catalog, version, option_prices(catalog))
+    options = []
+    eligibility = {}
+    for option, per_page, prices in plan.price_columns():
+        options.append({
+            'key': option.key,
+            'per_page': per_page,
+            'required': option.required,
+            'default': option.default,
+            'prices': sorted(prices.items()),
+        })
+        rows = _eligibility(catalog, option.table)
+        if rows is not None:
+            eligibility[option.key] = rows
+    bundle = {
+        'catalog': catalog,
+        'version': version,
+        'units_per_dollar': UNITS_PER_DOLLAR,
+        'options': options,
+        'eligibility': eligibility,
+        'discount_tiers': plan.discount_tiers,
+    }
+    return json.dumps(bundle, separators=(',', ':')).encode()
+
+
+_bundles = {
+    catalog: VersionedSnapshot(catalog, lambda version, catalog=catalog: build_bundle(catalog, version))
+    for catalog in FORMULAS
+}
+
+
+def get_pricing_bundle(catalog):
+    """Serialized pricing bundle of ``catalog`` at its current version."""
+    return _bundles[catalog].get()
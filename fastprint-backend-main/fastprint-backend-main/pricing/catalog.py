@@ -0,0 +1,150 @@
+"""
+Catalog versioning shared by the product calculators.
+
+Every product catalog ("printbook", "comicbook", ...) carries a version number
+that the price update views bump after writing. Readers keep process-local
+snapshots of a catalog and only rebuild them when the version moves, so the hot
+GET paths never touch the option tables in steady state.
+
+Each bump also publishes the catalog's change log (see changes.py), which
+lets clients sync the option rows written since a version they already have,
+freezes the catalog's prices as the pinned price list of the new version
+(see price_lists.py), and mirrors the changed rows into the generic product
+tables (see products.py), all in the transaction that sets the version.
+
+The current version is read through Django's cache, and a bump publishes it
+there when its transaction commits. With a shared backend (Redis) a bump is
+then visible to every worker immediately; with the default per-process cache
+other workers pick it up once CATALOG_VERSION_CACHE_TIMEOUT expires.
+"""
+import threading
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+from django.views.decorators.http import condition
+
+from .models import CatalogChange, CatalogVersion
+
+CACHE_KEY = 'pricing:catalog-version:{}'
+
+
+def _cache_timeout():
+    return getattr(settings, 'CATALOG_VERSION_CACHE_TIMEOUT', 5)
+
+
+def get_catalog_state(catalog):
+    """Return ``(version, updated_at)`` for ``catalog``; ``(0, None)`` if it was never bumped."""
+    key = CACHE_KEY.format(catalog)
+    state = cache.get(key)
+    if state is None:
+        row = CatalogVersion.objects.filter(catalog=catalog).values_list('version', 'updated_at').first()
+        state = row or (0, None)
+        cache.set(key, state, _cache_timeout())
+    return state
+
+
+def get_catalog_version(catalog):
+    """Return the current version of ``catalog`` (0 if it was never bumped)."""
+    return get_catalog_state(catalog)[0]
+
+
+def get_catalog_versions(catalogs):
+    """Current versions of ``catalogs``, as a tuple in the same order."""
+    keys = [CACHE_KEY.format(catalog) for catalog in catalogs]
+    states = cache.get_many(keys)
+    return tuple(
+        states[key][0] if key in states else get_catalog_version(catalog)
+        for catalog, key in zip(catalogs, keys)
+    )
+
+
+def bump_catalog_version(catalog, reset=False):
+    """
+    Increment the version of ``catalog`` and, once the transaction commits,
+    publish it to the cache, together with the option rows recorded in its
+    change log since the last bump and the price list of the new version. With ``reset`` (or when nothing was
+    recorded) the version is logged as a reset, telling delta clients to
+    reload the catalog in full.
+    """
+    from .price_lists import freeze_price_list
+    from .products import sync_catalog_version
+
+    with transaction.atomic():
+        CatalogVersion.objects.get_or_create(catalog=catalog)
+        CatalogVersion.objects.filter(catalog=catalog).update(
+            version=F('version') + 1, updated_at=timezone.now()
+        )
+        state = CatalogVersion.objects.values_list('version', 'updated_at').get(catalog=catalog)
+        published = CatalogChange.objects.filter(catalog=catalog, version__isnull=True).update(version=state[0])
+        if reset or not published:
+            CatalogChange.objects.create(catalog=catalog, version=state[0])
+        freeze_price_list(catalog, state[0])
+        # In the same transaction, so no reader sees the new version before
+        # the generic tables hold its rows
+        sync_catalog_version(catalog, state[0])
+        # Publish the version once it commits. The bump may run inside the
+        # caller's transaction (the Django admin, a price sheet import), and
+        # readers must not rebuild from rows that are not committed yet.
+        transaction.on_commit(lambda: cache.set(CACHE_KEY.format(catalog), state, _cache_timeout()))
+    return state[0]
+
+
+def catalog_etag(catalog):
+    return f'"{catalog}-v{get_catalog_version(catalog)}"'
+
+
+def catalog_condition(catalog=None):
+    """
+    ``condition`` decorator answering conditional GETs (If-None-Match /
+    If-Modified-Since) from the catalog version, so unchanged catalogs get a
+    304 without the view running. Apply it outside ``@api_view``. Without
+    ``catalog``, the catalog is the view's ``catalog`` URL argument.
+    """
+    return condition(
+        etag_func=lambda request, *args, **kwargs: catalog_etag(catalog or kwargs['catalog']),
+        last_modified_func=lambda request, *args, **kwargs: get_catalog_state(catalog or kwargs['catalog'])[1],
+    )
+
+
+class VersionedSnapshot:
+    """
+    Process-local value built by ``builder`` and rebuilt only when the version
+    of ``catalog`` changes. Builders must return immutable data because the
+    same object is shared by every request thread in the worker.
+    """
+
+    def __init__(self, catalog, builder):
+        self.catalog = catalog
+        self.builder = builder
+        self._lock = threading.Lock()
+        self._version = None
+        self._value = None
+
+    def current_version(self):
+        return get_catalog_version(self.catalog)
+
+    def get(self):
+        version = self.current_version()
+        if version != self._version:
+            with self._lock:
+                if version != self._version:
+                    self._value = self.builder(version)
+                    self._version = version
+        return self._value
+
+
+class CatalogsSnapshot(VersionedSnapshot):
+    """
+    VersionedSnapshot of a value built from several catalogs. Its version is
+    the tuple of their versions, so it is rebuilt when any of them moves.
+    """
+
+    def __init__(self, catalogs, builder):
+        super().__init__(None, builder)
+        self.catalogs = tuple(catalogs)
+
+    def current_version(self):
+        return get_catalog_versions(self.catalogs)
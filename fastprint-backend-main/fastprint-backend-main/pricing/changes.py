@@ -0,0 +1,106 @@
+"""
+Catalog change log and delta sync.
+
+Saving or deleting an option row of a catalog records a CatalogChange
+through model signals; ``bump_catalog_version`` then stamps the recorded rows
+with the new version. Clients that hold a catalog at version N call the
+changes endpoint with ``since=N`` and receive only the rows written after it:
+their current values, or their ids if they were deleted.
+
+Bulk writes do not send signals. The price sheet import records its rows with
+``record_changes``; seed commands bump with ``reset=True``, which tells
+clients to reload the catalog in full.
+"""
+from django.apps import apps
+from django.db.models.signals import post_delete, post_save
+
+from .models import CatalogChange
+from .price_sheet import PRICE_TABLES
+
+# Option tables of each catalog that are not priced (and so are not in PRICE_TABLES)
+EXTRA_TABLES = {
+    'printbook': {
+        'trim-size': 'printbookcalculator.TrimSize',
+        'option-alias': 'printbookcalculator.OptionAlias',
+    },
+    'comicbook': {'trim-size': 'comicbook.ComicTrimSize'},
+    'photobook': {'trim-size': 'photobook.TrimSize'},
+    'magazine': {'trim-size': 'magazine.TrimSize'},
+    'yearbook': {'trim-size': 'yearbook.TrimSize'},
+}
+
+# Discount tiers belong to the catalog named on each row
+DISCOUNT_TIER_TABLE = 'discount-tier'
+
+
+def change_tables(catalog):
+    """``{table: model label}`` of every table logged for ``catalog``."""
+    tables = {table: label for table, (label, _) in PRICE_TABLES.get(catalog, {}).items()}
+    tables.update(EXTRA_TABLES.get(catalog, {}))
+    tables[DISCOUNT_TIER_TABLE] = 'pricing.DiscountTier'
+    return tables
+
+
+def record_changes(catalog, table, row_ids, deleted=False):
+    """Log rows written without model signals; published by the next bump."""
+    CatalogChange.objects.bulk_create([
+        CatalogChange(catalog=catalog, table=table, row_id=row_id, deleted=deleted)
+        for row_id in row_ids
+    ])
+
+
+def _receiver(catalog, table):
+    def record(sender, instance, signal, **kwargs):
+        CatalogChange.objects.create(
+            catalog=catalog, table=table, row_id=instance.pk, deleted=signal is post_delete
+        )
+    return record
+
+
+def _record_discount_tier(sender, instance, signal, **kwargs):
+    CatalogChange.objects.create(
+        catalog=instance.catalog, table=DISCOUNT_TIER_TABLE, row_id=instance.pk, deleted=signal is post_delete
+    )
+
+
+def connect_change_log():
+    """Connect the change log to every logged table. Called from PricingConfig.ready()."""
+    for catalog in PRICE_TABLES:
+        for table, label in change_tables(catalog).items():
+            receiver = _record_discount_tier if table == DISCOUNT_TIER_TABLE else _receiver(catalog, table)
+            uid = 'catalog-change-discount-tier' if table == DISCOUNT_TIER_TABLE else f'catalog-change-{catalog}-{table}'
+            model = apps.get_model(label)
+            post_save.connect(receiver, sender=model, weak=False, dispatch_uid=uid)
+            post_delete.connect(receiver, sender=model, weak=False, dispatch_uid=uid)
+
+
+def catalog_changes(catalog, since, version):
+    """
+    Rows of ``catalog`` changed after version ``since`` up to ``version``, as
+    ``{table: {"updated": [row dicts], "deleted": [ids]}}``; None when the
+    client must reload the catalog in full instead.
+    """
+    if since > version:
+        return None
+    log = CatalogChange.objects.filter(catalog=catalog, version__gt=since, version__lte=version)
+    latest = {}
+    for table, row_id, deleted in log.order_by('version', 'id').values_list('table', 'row_id', 'deleted'):
+        if not table:
+            return None
+        latest[(table, row_id)] = deleted
+
+    tables = change_tables(catalog)
+    changes = {}
+    for (table, row_id), deleted in latest.items():
+        entry = changes.setdefault(table, {'updated': [], 'deleted': []})
+        entry['deleted' if deleted else 'updated'].append(row_id)
+
+    for table, entry in changes.items():
+        ids = entry['updated']
+        if not ids:
+            continue
+        entry['updated'] = list(apps.get_model(tables[table]).objects.filter(pk__in=ids).order_by('pk').values())
+        # Rows saved and then deleted without a bump in between
+        found = {row['id'] for row in entry['updated']}
+        entry['deleted'].extend(row_id for row_id in ids if row_id not in found)
+    return changes
@@ -0,0 +1,114 @@
+"""
+Cross-product quote comparison.
+
+Given a manuscript spec (page count, quantity and optionally a trim size and
+black & white or color interior), every product line is priced at its
+cheapest configuration that fits the spec: the trim sizes whose name matches,
+the bindings available for that trim and page count, interior colors of the
+requested kind, and the cheapest option of every other required group.
+Optional extras (spines, foil stamping, ...) are left out.
+
+A book's price is a sum of independent option prices, so the cheapest option
+of each group gives the cheapest configuration of a trim size; only the trim
+sizes are compared with each other. Options come from the generic product
+snapshots and quotes from the price plans, both in memory, so a comparison
+runs no queries once the catalogs are loaded.
+"""
+from .engine import FORMULAS, QuoteError, get_price_plan
+from .products import TRIM_SIZE_GROUP, get_product
+
+# The product lines compared, in display order
+COMPARED_PRODUCTS = ('printbook', 'comicbook', 'photobook', 'magazine', 'yearbook', 'calender')
+
+COLORS = ('bw', 'color')
+
+
+class NotAvailable(Exception):
+    """A product has no configuration that fits the spec."""
+
+
+def _trim_matches(option, trim_size):
+    # "A4" matches "A4 (8.27 x 11.69 in / 210 x 297 mm)" but not "A4 Landscape (...)"
+    name = option['name'].casefold()
+    trim_size = trim_size.strip().casefold()
+    return name == trim_size or name.split(' (')[0] == trim_size
+
+
+def _color_matches(option, color):
+    is_bw = 'black' in option['name'].casefold()
+    return is_bw == (color == 'bw')
+
+
+def _fits(option, trim_size_id, page_count):
+    if option['trim_size_id'] is not None and option['trim_size_id'] != trim_size_id:
+        return False
+    if option['min_pages'] is not None and page_count < option['min_pages']:
+        return False
+    return option['max_pages'] is None or page_count <= option['max_pages']
+
+
+def _cheapest_configuration(catalog, groups, trim_size_id, spec):
+    """The configuration payload of ``catalog`` for one trim size, and its option names."""
+    config = {'page_count': spec['page_count'], 'quantity': spec['quantity']}
+    names = {}
+    for option in FORMULAS[catalog].fixed + FORMULAS[catalog].per_page:
+        if not option.required:
+            continue
+        candidates = [o for o in groups.get(option.table, ()) if _fits(o, trim_size_id, spec['page_count'])]
+        if option.table == 'interior-color' and spec.get('color'):
+            candidates = [o for o in candidates if _color_matches(o, spec['color'])]
+        if not candidates:
+            raise NotAvailable(f"No {option.table.replace('-', ' ')} fits this spec.")
+        choice = min(candidates, key=lambda o: (o['price'], o['id']))
+        config[option.key] = choice['id']
+        names[option.table] = choice['name']
+    return config, names
+
+
+def compare_product(catalog, spec):
+    """The cheapest quote of ``catalog`` for ``spec``; raises NotAvailable."""
+    product = get_product(catalog)
+    plan = get_price_plan(catalog)
+    groups = {group['slug']: group['options'] for group in product['groups']}
+
+    trim_sizes = groups.get(TRIM_SIZE_GROUP)
+    if trim_sizes is None:
+        trim_sizes = [None]
+    elif spec.get('trim_size'):
+        trim_sizes = [o for o in trim_sizes if _trim_matches(o, spec['trim_size'])]
+        if not trim_sizes:
+            raise NotAvailable(f"No trim size matches '{spec['trim_size']}'.")
+
+    best = None
+    reason = None
+    for trim_size in trim_sizes:
+        trim_size_id = trim_size['id'] if trim_size else None
+        try:
+            config, names = _cheapest_configuration(catalog, groups, trim_size_id, spec)
+            quote = plan.quote(config)
+        except (NotAvailable, QuoteError) as e:
+            reason = str(e)
+            continue
+        if best is None or quote.final_price < best[0].final_price:
+            if trim_size:
+                config['trim_size_id'] = trim_size_id
+                names = dict({TRIM_SIZE_GROUP: trim_size['name']}, **names)
+            best = (quote, config, names)
+    if best is None:
+        raise NotAvailable(reason)
+    return best
+
+
+def compare_products(spec):
+    """
+    ``[(catalog, (quote, configuration, option names) or None, reason)]`` for
+    every compared product line; ``spec`` has ``page_count``, ``quantity``
+    and optionally ``trim_size`` and ``color`` (one of COLORS).
+    """
+    results = []
+    for catalog in COMPARED_PRODUCTS:
+        try:
+            results.append((catalog, compare_product(catalog, spec), None))
+        except NotAvailable as e:
+            results.append((catalog, None, str(e)))
+    return results
@@ -0,0 +1,78 @@
+"""
+Page-range binding eligibility shared by the product calculators.
+
+Each binding row carries a ``min_pages``/``max_pages`` range (``max_pages`` may
+be None for "no upper limit"). The index sorts the range boundaries of every
+trim size into elementary segments and stores, per segment, the bindings that
+cover it, so a ``(trim, page_count)`` lookup is one bisect instead of a
+filtered query or a chain of hand-written branches.
+
+``binding_snapshot`` keeps such an index of a catalog's serialized binding
+rows per catalog version, for the calculators whose bindings endpoint only
+filters by page range.
+"""
+from bisect import bisect_right
+from dataclasses import dataclass
+
+from .catalog import VersionedSnapshot
+
+
+class BindingEligibilityIndex:
+
+    def __init__(self, rows):
+        """
+        ``rows`` is an iterable of ``(trim_key, min_pages, max_pages, item)``.
+        ``trim_key`` is None for catalogs whose bindings are not tied to a trim
+        size. Items keep their input order within each lookup result.
+        """
+        by_trim = {}
+        for trim_key, min_pages, max_pages, item in rows:
+            by_trim.setdefault(trim_key, []).append((min_pages or 0, max_pages, item))
+
+        self._index = {trim_key: self._compile(ranges) for trim_key, ranges in by_trim.items()}
+
+    @staticmethod
+    def _compile(ranges):
+        bounds = sorted({lo for lo, _, _ in ranges} | {hi + 1 for _, hi, _ in ranges if hi is not None})
+        segments = tuple(
+            tuple(item for lo, hi, item in ranges if lo <= start and (hi is None or start <= hi))
+            for start in bounds
+        )
+        return tuple(bounds), segments
+
+    def lookup(self, trim_key, page_count):
+        """Items eligible for ``page_count`` pages on ``trim_key``."""
+        compiled = self._index.get(trim_key)
+        if compiled is None:
+            return ()
+        bounds, segments = compiled
+        i = bisect_right(bounds, page_count) - 1
+        return segments[i] if i >= 0 else ()
+
+
+@dataclass(frozen=True)
+class BindingCatalog:
+    version: int
+    # Serialized binding rows by (trim_size_id, page_count); the trim key is
+    # None for catalogs whose bindings are not tied to a trim size
+    eligibility: BindingEligibilityIndex
+
+    def bindings_for(self, page_count, trim_size_id=None):
+        return list(self.eligibility.lookup(trim_size_id, page_count))
+
+
+def binding_snapshot(catalog, model, serializer_class, by_trim_size=False):
+    """
+    VersionedSnapshot of the BindingCatalog of ``catalog``: the rows of
+    ``model`` serialized by ``serializer_class``, indexed by their page range
+    (and by their ``trim_size`` with ``by_trim_size``).
+    """
+    def build(version):
+        bindings = [dict(b) for b in serializer_class(model.objects.order_by('id'), many=True).data]
+        return BindingCatalog(
+            version=version,
+            eligibility=BindingEligibilityIndex(
+                (b['trim_size'] if by_trim_size else None, b['min_pages'], b['max_pages'], b) for b in bindings
+            ),
+        )
+    return VersionedSnapshot(catalog, build)
@@ -0,0 +1,295 @@
+"""
+Unified pricing engine for the product calculators.
+
+Every calculator prices a configuration the same way: the fixed options of a
+book are added once, the per-page options are multiplied by the page count and
+a quantity discount may come off the order total. Each product declares its
+options once, as a ``Formula`` in ``FORMULAS``; its quantity discounts are
+DiscountTier rows that admins edit.
+
+A ``PricePlan`` is a formula compiled against one set of option prices: a
+plain ``{option id: price in units}`` dict per option (see money.py), so
+quoting is a handful of dict lookups and integer operations with no database
+access. ``get_price_plan`` keeps one plan per catalog and process, compiled
+from the live option tables and rebuilt only when the catalog version moves. Pinned price lists
+(``price_lists.py``) compile into the same class from their frozen prices.
+
+Configurations are the payloads of the calculate endpoints, with options given
+by id, e.g.::
+
+    {"page_count": 48, "quantity": 20, "binding_id": 3,
+     "interior_color_id": 1, "paper_type_id": 2, "cover_finish_id": 1}
+"""
+from bisect import bisect_right
+from collections import namedtuple
+
+from .catalog import VersionedSnapshot
+from .models import DiscountTier
+from .money import UNITS_PER_DOLLAR, apply_rate, to_basis_points, to_units, units_to_cents
+from .price_sheet import PRICE_TABLES, price_table
+
+# Extra columns compiled with the price, for the rules that depend on them
+EXTRA_FIELDS = {
+    ('printbook', 'binding-type'): ('trim_size_id', 'min_pages', 'max_pages'),
+}
+
+# (table, config key, required, price in units used when the option is
+#  omitted, config key of a literal price accepted instead of the id)
+Option = namedtuple('Option', 'table key required default price_key', defaults=(None,))
+
+# How each calculator prices a book: fixed options are added once per book and
+# per-page options are multiplied by the page count.
+Formula = namedtuple('Formula', 'fixed per_page')
+
+# Key of the discount tiers in a prices dict (next to the option tables)
+DISCOUNT_TIERS = 'discount-tiers'
+
+FORMULAS = {
+    'printbook': Formula(
+        fixed=(Option('binding-type', 'binding_id', True, None), Option('cover-finish', 'cover_finish_id', True, None)),
+        per_page=(Option('interior-color', 'interior_color_id', True, None), Option('paper-type', 'paper_type_id', True, None)),
+    ),
+    'comicbook': Formula(
+        fixed=(Option('binding-type', 'binding_id', True, None), Option('cover-finish', 'cover_finish_id', True, None)),
+        per_page=(Option('interior-color', 'interior_color_id', True, None), Option('paper-type', 'paper_type_id', True, None)),
+    ),
+    'photobook': Formula(
+        fixed=(
+            Option('binding-type', 'binding_id', True, None),
+            Option('cover-finish', 'cover_finish_id', True, None),
+            Option('spine', 'spine_id', False, 5 * UNITS_PER_DOLLAR),
+            Option('exterior-color', 'exterior_color_id', False, 0),
+            Option('foil-stamping', 'foil_stamping_id', False, 0),
+            Option('screen-stamping', 'screen_stamping_id', False, 0),
+        ),
+        per_page=(Option('interior-color', 'interior_color_id', True, None), Option('paper-type', 'paper_type_id', True, None)),
+    ),
+    'magazine': Formula(
+        fixed=(Option('binding-type', 'binding_id', True, None), Option('cover-finish', 'cover_finish_id', True, None)),
+        per_page=(Option('interior-color', 'interior_color_id', True, None), Option('paper-type', 'paper_type_id', True, None)),
+    ),
+    'yearbook': Formula(
+        fixed=(Option('binding-type', 'binding_id', True, None), Option('cover-finish', 'cover_finish_id', True, None)),
+        per_page=(Option('interior-color', 'interior_color_id', True, None), Option('paper-type', 'paper_type_id', True, None)),
+    ),
+    'calender': Formula(
+        fixed=(Option('binding-type', 'binding_id', True, None),),
+        per_page=(),
+    ),
+    'pricing': Formula(
+        fixed=(
+            Option('binding-type', 'binding_type_id', False, 0, 'binding_price'),
+            Option('spine-type', 'spine_type_id', False, 0, 'spine_price'),
+            Option('exterior-color', 'exterior_color_id', False, 0, 'exterior_color_price'),
+            Option('foil-stamping', 'foil_stamping_id', False, 0, 'foil_stamping_price'),
+            Option('screen-stamping', 'screen_stamping_id', False, 0, 'screen_stamping_price'),
+            Option('corner-protector', 'corner_protector_id', False, 0, 'corner_protector_price'),
+        ),
+        per_page=(
+            Option('interior-color', 'interior_color_id', False, 0, 'interior_color_price_per_page'),
+            Option('paper-type', 'paper_type_id', False, 0, 'paper_type_price_per_page'),
+        ),
+    ),
+}
+
+# Amounts in cents; total_cost is cost_per_book * quantity
+Quote = namedtuple('Quote', 'cost_per_book total_cost discount final_price')
+
+
+class QuoteError(ValueError):
+    """A configuration cannot be priced."""
+
+
+def option_prices(catalog):
+    """
+    Current option prices of ``catalog`` in the JSON form stored by PriceList:
+    ``{table: {"<id>": {"name": ..., "price": "<decimal>", ...extra fields}}}``
+    plus the discount tiers under DISCOUNT_TIERS, as
+    ``[{"min_quantity": ..., "percent": "<decimal>"}]``.
+    """
+    prices = {}
+    for table in PRICE_TABLES[catalog]:
+        model, field_name = price_table(catalog, table)
+        extra_fields = EXTRA_FIELDS.get((catalog, table), ())
+        rows = {}
+        for row in model.objects.order_by('id').values('id', 'name', field_name, *extra_fields):
+            entry = {'name': row['name'], 'price': str(row[field_name])}
+            entry.update((field, row[field]) for field in extra_fields)
+            rows[str(row['id'])] = entry
+        prices[table] = rows
+    prices[DISCOUNT_TIERS] = [
+        {'min_quantity': min_quantity, 'percent': str(percent)}
+        for min_quantity, percent in DiscountTier.objects.filter(catalog=catalog)
+        .order_by('min_quantity').values_list('min_quantity', 'percent')
+    ]
+    return prices
+
+
+def _option_id(value):
+    if value in (None, ''):
+        return None
+    return int(value)
+
+
+class PricePlan:
+    """A product's formula compiled against one set of option prices."""
+
+    def __init__(self, catalog, version, prices):
+        self.catalog = catalog
+        self.version = version
+        self.formula = FORMULAS[catalog]
+        self.fields = ('quantity',) + (('page_count',) if self.formula.per_page else ()) + tuple(
+            option.key for option in self.formula.fixed + self.formula.per_page
+        )
+        self._prices = {}
+        self._page_ranges = {}
+        for option in self.formula.fixed + self.formula.per_page:
+            rows = prices.get(option.table, {})
+            # Keyed by the id as int and as str, so JSON and form payloads
+            # are looked up without conversion
+            column = {}
+            for pk, entry in rows.items():
+                column[int(pk)] = column[str(pk)] = to_units(entry['price'])
+            self._prices[option.key] = column
+            self._page_ranges[option.key] = {
+                int(pk): (entry['min_pages'], entry['max_pages'])
+                for pk, entry in rows.items() if 'min_pages' in entry
+            }
+        tiers = sorted(
+            (tier['min_quantity'], to_basis_points(tier['percent']))
+            for tier in prices.get(DISCOUNT_TIERS, ())
+        )
+        self._tier_minimums = [min_quantity for min_quantity, _ in tiers]
+        self._tier_rates = [rate for _, rate in tiers]
+        self._columns = tuple(
+            (option, self._prices[option.key], self._page_ranges[option.key], per_page)
+            for options, per_page in ((self.formula.fixed, False), (self.formula.per_page, True))
+            for option in options
+        )
+
+    def config_key(self, config):
+        """
+        Normalized, hashable form of ``config`` (ints, None for omitted
+        options), for memoizing quotes. Raises QuoteError.
+        """
+        try:
+            return tuple(_option_id(config.get(field)) for field in self.fields)
+        except (TypeError, ValueError) as e:
+            raise QuoteError(f'Invalid configuration: {e}')
+
+    def _option_price(self, option, config, page_count, price_overrides):
+        """Price of one option, with the overrides, defaults and checks of ``quote``."""
+        if price_overrides and option.price_key and config.get(option.price_key) not in (None, ''):
+            try:
+                return to_units(config[option.price_key])
+            except ValueError:
+                raise QuoteError(f"'{option.price_key}' must be a number.")
+
+        try:
+            option_id = _option_id(config.get(option.key))
+        except (TypeError, ValueError):
+            raise QuoteError(f"'{option.key}' must be an id.")
+        if not option_id:
+            if option.required:
+                raise QuoteError(f"Missing '{option.key}'.")
+            return option.default
+
+        price = self._prices[option.key].get(option_id)
+        if price is None:
+            raise QuoteError(f"'{option.key}' {option_id} is not in {self.catalog} prices v{self.version}.")
+        page_range = self._page_ranges[option.key].get(option_id)
+        if page_range is not None and not page_range[0] <= page_count <= page_range[1]:
+            raise QuoteError(f"'{option.key}' {option_id} is not available for {page_count} pages.")
+        return price
+
+    def unit_price(self, config, price_overrides=False):
+        """Per-book price of ``config`` in cents; raises QuoteError."""
+        if not isinstance(config, dict):
+            raise QuoteError('The configuration must be an object.')
+        try:
+            page_count = int(config['page_count']) if self.formula.per_page else 0
+        except KeyError as e:
+            raise QuoteError(f'Missing {e}.')
+        except (TypeError, ValueError) as e:
+            raise QuoteError(f'Invalid page count: {e}')
+
+        unit_price = 0
+        for option, prices, page_ranges, per_page in self._columns:
+            # Fast path: a known id of an option without page limits
+            try:
+                price = None if price_overrides or page_ranges else prices.get(config.get(option.key))
+            except TypeError:
+                raise QuoteError(f"'{option.key}' must be an id.")
+            if price is None:
+                price = self._option_price(option, config, page_count, price_overrides)
+            unit_price += price * page_count if per_page else price
+        return units_to_cents(unit_price)
+
+    def price_columns(self):
+        """``(option, per_page, {id: price in units})`` for every option, in formula order."""
+        return [
+            (option, per_page, {pk: price for pk, price in prices.items() if isinstance(pk, int)})
+            for option, prices, _, per_page in self._columns
+        ]
+
+    @property
+    def discount_tiers(self):
+        """``(min_quantity, rate in basis points)`` pairs, by minimum."""
+        return list(zip(self._tier_minimums, self._tier_rates))
+
+    def discount_rate(self, quantity):
+        """Discount in basis points for an order of ``quantity`` copies."""
+        i = bisect_right(self._tier_minimums, quantity)
+        return self._tier_rates[i - 1] if i else 0
+
+    def _quote(self, cost_per_book, quantity):
+        total_cost = cost_per_book * quantity
+        discount = apply_rate(total_cost, self.discount_rate(quantity))
+        return Quote(cost_per_book, total_cost, discount, total_cost - discount)
+
+    def quote(self, config, price_overrides=False):
+        """
+        Price ``config``; raises QuoteError. With ``price_overrides``, options
+        that declare a ``price_key`` may be given as a literal price instead
+        of an id (the legacy payload of the pricing calculator).
+        """
+        if not isinstance(config, dict):
+            raise QuoteError('The configuration must be an object.')
+        try:
+            quantity = int(config['quantity'])
+        except KeyError as e:
+            raise QuoteError(f'Missing {e}.')
+        except (TypeError, ValueError) as e:
+            raise QuoteError(f'Invalid quantity: {e}')
+        return self._quote(self.unit_price(config, price_overrides), quantity)
+
+    def quantity_curve(self, config, max_quantity):
+        """
+        Quotes of ``config`` for every quantity from 1 to ``max_quantity``.
+        The per-book price is computed once and each run of quantities between
+        two price breaks shares its discount rate, so the curve is one
+        multiplication per point.
+        """
+        cost_per_book = self.unit_price(config)
+        curve = []
+        starts = [1] + [q for q in self._tier_minimums if 1 < q <= max_quantity]
+        for start, end in zip(starts, starts[1:] + [max_quantity + 1]):
+            rate = self.discount_rate(start)
+            for quantity in range(start, end):
+                total_cost = cost_per_book * quantity
+                discount = apply_rate(total_cost, rate)
+                curve.append(Quote(cost_per_book, total_cost, discount, total_cost - discount))
+        return curve
+
+
+_plans = {
+    catalog: VersionedSnapshot(
+        catalog, lambda version, catalog=catalog: PricePlan(catalog, version, option_prices(catalog))
+    )
+    for catalog in FORMULAS
+}
+
+
+def get_price_plan(catalog):
+    """The price plan of ``catalog`` at its current version."""
+    return _plans[catalog].get()
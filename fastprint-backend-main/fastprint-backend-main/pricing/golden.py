@@ -0,0 +1,264 @@
+"""
+Golden quote corpus of the seven calculators.
+
+``golden_quotes.json`` holds configurations of every calculate endpoint with
+the response each returned from the calculators as they were before the
+shared pricing engine (commit 5ef0c46), on freshly seeded catalogs
+(SEED_COMMANDS, plus the thesis binding rows of seed_thesis_catalog). The
+tests replay it, so any change to a pricing path that moves a price, a
+rounding or an error message fails them; ``manage.py benchmark_calculators``
+replays it for timing.
+
+Responses that differ from the baseline on purpose are recorded on their
+entry as a ``change``: the current response and the INTENDED_CHANGES reason
+that explains it. ``change_reason`` decides whether a difference is one of
+them, so a new difference cannot be recorded without a reason.
+
+Options are stored as positions in their option table (ordered by id) rather
+than as ids, so the corpus does not depend on the ids a database assigned.
+Regenerate it with ``manage.py build_golden_quotes --baseline <url>``, where
+the URL serves the baseline code on catalogs seeded the same way.
+"""
+import json
+import os
+import random
+from urllib.error import HTTPError
+from urllib.request import Request, urlopen
+
+from django.apps import apps
+from django.urls import resolve
+from rest_framework.test import APIRequestFactory
+
+from .catalog import bump_catalog_version
+from .changes import change_tables
+from .engine import FORMULAS
+from .price_sheet import price_table
+
+CORPUS_PATH = os.path.join(os.path.dirname(__file__), 'golden_quotes.json')
+
+SEED_COMMANDS = ('seed_data', 'seed', 'seed_photobook_data', 'seed_magazine_data', 'seed_yearbook', 'seed_calender')
+
+# Calculator -> (catalog, calculate URL)
+CALCULATORS = {
+    'printbook': ('printbook', '/api/calculator/calculate/'),
+    'comicbook': ('comicbook', '/api/comicbook/calculate/'),
+    'photobook': ('photobook', '/api/photobook/calculate/'),
+    'magazine': ('magazine', '/api/magazine/calculate/'),
+    'yearbook': ('yearbook', '/api/yearbook/calculate/'),
+    'calender': ('calender', '/api/calender/calculate/'),
+    'pricing': ('pricing', '/api/pricing/calculate/'),
+}
+
+PAGE_COUNTS = (2, 24, 32, 48, 100, 120, 250, 470, 800)
+QUANTITIES = (1, 2, 50, 99, 100, 101, 150, 250, 1000)
+# Literal prices of the thesis binding calculator's legacy payload
+LITERAL_PRICES = ('0', '0.5', '1.25', '2.99', '10')
+
+# The print book calculator takes these options by name, as its frontend sends them
+NAMED_OPTIONS = {'printbook': ('binding_id', 'interior_color_id', 'paper_type_id', 'cover_finish_id')}
+
+# Rows of the thesis binding catalog, which no seed command writes
+THESIS_CATALOG = {
+    'binding-type': [('Hardcover', '25.00'), ('Softcover', '12.50'), ('Leather', '48.75')],
+    'spine-type': [('Round', '3.00'), ('Flat', '2.25')],
+    'exterior-color': [('Black', '0.00'), ('Navy', '1.50'), ('Burgundy', '1.75')],
+    'foil-stamping': [('Gold', '4.25'), ('Silver', '3.99')],
+    'screen-stamping': [('White', '2.10'), ('Gold', '2.60')],
+    'corner-protector': [('None', '0.00'), ('Brass', '5.35')],
+    'interior-color': [('Black and white', '0.0350'), ('Color', '0.1475')],
+    'paper-type': [('80 gsm', '0.0125'), ('100 gsm', '0.0185')],
+}
+
+# Differences from the baseline responses that are intended
+INTENDED_CHANGES = {
+    'cent-rounding': (
+        "Amounts are rounded half up to the cent, the per-book price before it is "
+        "multiplied by the quantity, and the discount before it is subtracted; "
+        "the baseline rounded half to even, or only the final float."
+    ),
+    'option-not-found': (
+        "A print book option that does not exist for the trim size and page count "
+        "answers 404 naming the option; the baseline answered 500."
+    ),
+    'option-name-case': (
+        "Print book option names match whatever their case ('coil bond' is 'Coil bond'), "
+        "as the baseline's lookups did on MySQL's case-insensitive collation but not on SQLite."
+    ),
+}
+
+
+def option_tables(catalog):
+    """Configuration key -> model label of the options a calculator takes by id."""
+    tables = change_tables(catalog)
+    keys = {option.key: tables[option.table] for option in FORMULAS[catalog].fixed + FORMULAS[catalog].per_page}
+    if 'trim-size' in tables:
+        keys['trim_size_id'] = tables['trim-size']
+    return keys
+
+
+def seed_thesis_catalog():
+    """Write THESIS_CATALOG, unless the thesis binding catalog already has rows."""
+    for table, rows in THESIS_CATALOG.items():
+        model, price_field = price_table('pricing', table)
+        if model.objects.exists():
+            return
+        model.objects.bulk_create(model(name=name, **{price_field: price}) for name, price in rows)
+    bump_catalog_version('pricing', reset=True)
+
+
+def _option_ids(calculator):
+    catalog, _ = CALCULATORS[calculator]
+    named = NAMED_OPTIONS.get(calculator, ())
+    return {
+        key: list(apps.get_model(label).objects.order_by('id').values_list('name' if key in named else 'id', flat=True))
+        for key, label in option_tables(catalog).items()
+    }
+
+
+def resolve_entry(entry, option_ids):
+    """The payload of a corpus entry, with option positions replaced by ids (or names)."""
+    payload = dict(entry['config'])
+    payload.update((key, option_ids[key][position]) for key, position in entry['options'].items())
+    return payload
+
+
+def post_quote(url, payload):
+    """POST ``payload`` to a calculate view; returns ``(status, parsed body)``."""
+    request = APIRequestFactory().post(url, payload, format='json')
+    response = resolve(url).func(request)
+    response.render()
+    return response.status_code, json.loads(response.content)
+
+
+def post_baseline(base_url, url, payload):
+    """POST ``payload`` to ``url`` of the baseline server at ``base_url``; returns ``(status, parsed body)``."""
+    request = Request(
+        base_url.rstrip('/') + url, data=json.dumps(payload).encode(),
+        headers={'Content-Type': 'application/json', 'Accept': 'application/json'},
+    )
+    try:
+        with urlopen(request) as response:
+            return response.status, json.loads(response.read())
+    except HTTPError as e:
+        return e.code, json.loads(e.read())
+
+
+def baseline_payload(calculator, payload):
+    """
+    ``payload`` as the baseline calculator takes it: the thesis binding
+    calculator only took literal prices, so options given by id are replaced
+    by the prices of their rows.
+    """
+    if calculator != 'pricing':
+        return payload
+    payload = dict(payload)
+    for option in FORMULAS['pricing'].fixed + FORMULAS['pricing'].per_page:
+        if option.key in payload:
+            model, price_field = price_table('pricing', option.table)
+            payload[option.price_key] = str(getattr(model.objects.get(pk=payload.pop(option.key)), price_field))
+    return payload
+
+
+def change_reason(entry, baseline, current):
+    """
+    The INTENDED_CHANGES reason of a response ``current`` that differs from
+    the ``baseline`` response (both ``(status, body)``), or None.
+    """
+    if entry['calculator'] == 'printbook' and baseline[0] == 500:
+        # The baseline answered 500 for every option it could not find
+        return {404: 'option-not-found', 200: 'option-name-case'}.get(current[0])
+    if baseline[0] == current[0] == 200 and baseline[1].keys() == current[1].keys():
+        # Half a cent per book, plus the cent of the final rounding
+        tolerance = 0.005 * max(int(entry['config'].get('quantity', 1)), 1) + 0.01
+        if all(
+            isinstance(value, (int, float)) and abs(value - current[1][key]) <= tolerance
+            for key, value in baseline[1].items()
+        ):
+            return 'cent-rounding'
+    return None
+
+
+def expected_response(entry):
+    """``(status, body)`` the current calculators answer ``entry`` with."""
+    expected = entry.get('change', entry)
+    return expected['status'], expected['response']
+
+
+def _sample(calculator, rng):
+    catalog, _ = CALCULATORS[calculator]
+    config = {'page_count': rng.choice(PAGE_COUNTS), 'quantity': rng.choice(QUANTITIES)}
+    options = {}
+    if catalog == 'pricing':
+        # Each option by id, as a legacy literal price, or left out
+        tables = change_tables(catalog)
+        for option in FORMULAS[catalog].fixed + FORMULAS[catalog].per_page:
+            choice = rng.random()
+            if choice < 0.4:
+                options[option.key] = rng.randrange(apps.get_model(tables[option.table]).objects.count())
+            elif choice < 0.7:
+                config[option.price_key] = rng.choice(LITERAL_PRICES)
+        return config, options
+
+    for key, label in option_tables(catalog).items():
+        if key == 'trim_size_id' and calculator != 'printbook':
+            # Only the print book calculator prices by trim size
+            continue
+        count = apps.get_model(label).objects.count()
+        required = key == 'trim_size_id' or any(
+            option.required for option in FORMULAS[catalog].fixed + FORMULAS[catalog].per_page if option.key == key
+        )
+        if count and (required or rng.random() < 0.6):
+            options[key] = rng.randrange(count)
+    return config, options
+
+
+class UnexplainedChange(Exception):
+    """Current responses differ from the baseline in a way INTENDED_CHANGES does not cover."""
+
+    def __init__(self, entries):
+        super().__init__(f"{len(entries)} responses differ from the baseline without an intended reason.")
+        self.entries = entries
+
+
+def build_corpus(baseline_url, per_calculator=30, seed=20):
+    """
+    Sample configurations of every calculator and record the baseline
+    server's response to each, with the current response as a ``change``
+    where the two differ.
+    """
+    rng = random.Random(seed)
+    corpus, unexplained = [], []
+    for calculator, (_, url) in CALCULATORS.items():
+        option_ids = _option_ids(calculator)
+        for _ in range(per_calculator):
+            config, options = _sample(calculator, rng)
+            entry = {'calculator': calculator, 'config': config, 'options': options}
+            payload = resolve_entry(entry, option_ids)
+            baseline = post_baseline(baseline_url, url, baseline_payload(calculator, payload))
+            current = post_quote(url, payload)
+            entry['status'], entry['response'] = baseline
+            if current != baseline:
+                reason = change_reason(entry, baseline, current)
+                if reason is None:
+                    unexplained.append(dict(entry, current={'status': current[0], 'response': current[1]}))
+                entry['change'] = {'reason': reason, 'status': current[0], 'response': current[1]}
+            corpus.append(entry)
+    if unexplained:
+        raise UnexplainedChange(unexplained)
+    return corpus
+
+
+def write_corpus(corpus, path=CORPUS_PATH):
+    with open(path, 'w') as f:
+        json.dump(corpus, f, indent=1, sort_keys=True)
+        f.write('\n')
+
+
+def load_corpus(path=CORPUS_PATH):
+    with open(path) as f:
+        return json.load(f)
+
+
+def option_ids():
+    """``{calculator: {key: [ids (or names) by position]}}`` of the current catalogs."""
+    return {calculator: _option_ids(calculator) for calculator in CALCULATORS}
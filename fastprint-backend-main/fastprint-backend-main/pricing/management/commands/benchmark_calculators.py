@@ -0,0 +1,44 @@
+import time
+from collections import defaultdict
+
+from django.core.cache import cache
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from pricing.golden import CALCULATORS, load_corpus, option_ids, post_quote, resolve_entry, seed_thesis_catalog
+
+
+class Command(BaseCommand):
+    help = "Replays the golden quote corpus against every calculate view and reports quotes/s and queries per quote"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rounds', type=int, default=20, help='Warm passes over the corpus')
+
+    def handle(self, *args, **options):
+        seed_thesis_catalog()
+        ids = option_ids()
+        payloads = defaultdict(list)
+        for entry in load_corpus():
+            payloads[entry['calculator']].append(resolve_entry(entry, ids[entry['calculator']]))
+
+        self.stdout.write(f"{'calculator':<12} {'cold q/s':>10} {'cold queries/quote':>19} {'warm q/s':>10} {'warm queries/quote':>19}")
+        for calculator, (_, url) in CALCULATORS.items():
+            # Cold: catalog versions and snapshots are reloaded
+            cache.clear()
+            cold = self.measure(url, payloads[calculator], 1)
+            warm = self.measure(url, payloads[calculator], options['rounds'])
+            self.stdout.write(
+                f"{calculator:<12} {cold[0]:10.0f} {cold[1]:19.2f} {warm[0]:10.0f} {warm[1]:19.2f}"
+            )
+
+    def measure(self, url, payloads, rounds):
+        """``(quotes per second, queries per quote)`` of ``rounds`` passes over ``payloads``."""
+        count = len(payloads) * rounds
+        with CaptureQueriesContext(connection) as queries:
+            start = time.perf_counter()
+            for _ in range(rounds):
+                for payload in payloads:
+                    post_quote(url, payload)
+            seconds = time.perf_counter() - start
+        return count / seconds, len(queries) / count
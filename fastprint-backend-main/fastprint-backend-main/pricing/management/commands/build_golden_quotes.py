@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from pricing.golden import CORPUS_PATH, UnexplainedChange, build_corpus, seed_thesis_catalog, write_corpus
+
+
+class Command(BaseCommand):
+    help = (
+        "Records the golden quote corpus of every calculator from a server running the baseline "
+        "calculators, on catalogs freshly seeded like the current ones"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--baseline', required=True, help='Base URL of the baseline server, e.g. http://127.0.0.1:8001')
+        parser.add_argument('--count', type=int, default=30, help='Configurations per calculator')
+        parser.add_argument('--seed', type=int, default=20)
+        parser.add_argument('--output', default=CORPUS_PATH)
+
+    def handle(self, *args, **options):
+        seed_thesis_catalog()
+        try:
+            corpus = build_corpus(options['baseline'], options['count'], options['seed'])
+        except UnexplainedChange as e:
+            for entry in e.entries:
+                self.stderr.write(f"{entry['calculator']} {entry['config']} {entry['options']}")
+                self.stderr.write(f"  baseline {entry['status']} {entry['response']}")
+                self.stderr.write(f"  current  {entry['current']['status']} {entry['current']['response']}")
+            raise CommandError(str(e))
+        write_corpus(corpus, options['output'])
+        changes = sum('change' in entry for entry in corpus)
+        self.stdout.write(self.style.SUCCESS(
+            f"Wrote {len(corpus)} quotes to {options['output']}, {changes} with an intended change"
+        ))
@@ -0,0 +1,39 @@
+import os
+
+from django.core.management.base import BaseCommand, CommandError
+
+from pricing.price_sheet import PriceSheetError, import_price_sheet, read_price_sheet
+
+
+class Command(BaseCommand):
+    help = "Imports a CSV/XLSX price sheet into the product catalogs in one transaction"
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='Sheet with catalog, table, id, name and price columns')
+        parser.add_argument('--dry-run', action='store_true', help='Only report the changes')
+
+    def handle(self, *args, **options):
+        path = options['path']
+        try:
+            with open(path, 'rb') as f:
+                content = f.read()
+        except OSError as e:
+            raise CommandError(str(e))
+
+        try:
+            result = import_price_sheet(read_price_sheet(content, os.path.basename(path)), dry_run=options['dry_run'])
+        except PriceSheetError as e:
+            raise CommandError('\n'.join(e.errors))
+
+        for change in result['changes']:
+            self.stdout.write(
+                f"{change['catalog']}/{change['table']} #{change['id']} {change['name']}: "
+                f"{change['field']} {change['old']} -> {change['new']}"
+            )
+        if result['applied']:
+            versions = ', '.join(f'{c} v{v}' for c, v in result['catalog_versions'].items()) or 'none'
+            self.stdout.write(self.style.SUCCESS(
+                f"✅ Applied {len(result['changes'])} price changes ({result['unchanged']} unchanged). Catalogs bumped: {versions}"
+            ))
+        else:
+            self.stdout.write(f"Dry run: {len(result['changes'])} price changes, {result['unchanged']} unchanged.")
@@ -0,0 +1,26 @@
+# Generated by Django 4.1 on 2026-10-18 11:19
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pricing', '0002_catalogversion'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PriceList',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('catalog', models.CharField(max_length=50)),
+                ('version', models.PositiveBigIntegerField()),
+                ('prices', models.JSONField(help_text='table -> option id -> {name, price, ...}')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'unique_together': {('catalog', 'version')},
+            },
+        ),
+    ]
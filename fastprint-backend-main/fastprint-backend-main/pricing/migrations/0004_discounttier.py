@@ -0,0 +1,56 @@
+# Generated by Django 4.1 on 2026-10-18 11:31
+
+import django.core.validators
+from django.db import migrations, models
+
+# The quantity discounts the calculators used to hard-code
+INITIAL_TIERS = [
+    ('comicbook', 101, '10.00'),
+    ('photobook', 101, '5.00'),
+    ('magazine', 101, '5.00'),
+    ('yearbook', 101, '5.00'),
+    ('calender', 101, '5.00'),
+    ('pricing', 100, '10.00'),
+]
+
+
+def seed_tiers(apps, schema_editor):
+    DiscountTier = apps.get_model('pricing', 'DiscountTier')
+    PriceList = apps.get_model('pricing', 'PriceList')
+    for catalog, min_quantity, percent in INITIAL_TIERS:
+        DiscountTier.objects.get_or_create(catalog=catalog, min_quantity=min_quantity, defaults={'percent': percent})
+
+    # Lists pinned before tiers existed were priced with the same discounts
+    for price_list in PriceList.objects.all():
+        if 'discount-tiers' in price_list.prices:
+            continue
+        prices = dict(price_list.prices)
+        prices['discount-tiers'] = [
+            {'min_quantity': min_quantity, 'percent': percent}
+            for catalog, min_quantity, percent in INITIAL_TIERS if catalog == price_list.catalog
+        ]
+        PriceList.objects.filter(pk=price_list.pk).update(prices=prices)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pricing', '0003_pricelist'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DiscountTier',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('catalog', models.CharField(choices=[('printbook', 'Print book'), ('comicbook', 'Comic book'), ('photobook', 'Photo book'), ('magazine', 'Magazine'), ('yearbook', 'Yearbook'), ('calender', 'Calendar'), ('pricing', 'Thesis binding')], max_length=50)),
+                ('min_quantity', models.PositiveIntegerField(validators=[django.core.validators.MinValueValidator(1)])),
+                ('percent', models.DecimalField(decimal_places=2, max_digits=5, validators=[django.core.validators.MinValueValidator(0), django.core.validators.MaxValueValidator(100)])),
+            ],
+            options={
+                'ordering': ('catalog', 'min_quantity'),
+                'unique_together': {('catalog', 'min_quantity')},
+            },
+        ),
+        migrations.RunPython(seed_tiers, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 4.1 on 2026-10-18 11:33
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pricing', '0004_discounttier'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CatalogChange',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('catalog', models.CharField(max_length=50)),
+                ('version', models.PositiveBigIntegerField(blank=True, null=True)),
+                ('table', models.CharField(blank=True, max_length=50)),
+                ('row_id', models.PositiveBigIntegerField(blank=True, null=True)),
+                ('deleted', models.BooleanField(default=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='catalogchange',
+            index=models.Index(fields=['catalog', 'version'], name='pricing_cat_catalog_097899_idx'),
+        ),
+    ]
@@ -0,0 +1,166 @@
+# Generated by Django 4.1 on 2026-10-18 11:40
+
+import django.core.serializers.json
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+# The product lines, their option tables and the per-page groups as of this
+# migration, frozen here so later changes to pricing.price_sheet / engine do
+# not change what it copies.
+PRODUCTS = [
+    ('printbook', 'Print book', [
+        ('trim-size', 'printbookcalculator.TrimSize', None),
+        ('binding-type', 'printbookcalculator.BindingType', 'price'),
+        ('interior-color', 'printbookcalculator.InteriorColor', 'price_per_page'),
+        ('paper-type', 'printbookcalculator.PaperType', 'price_per_page'),
+        ('cover-finish', 'printbookcalculator.CoverFinish', 'price'),
+    ]),
+    ('comicbook', 'Comic book', [
+        ('trim-size', 'comicbook.ComicTrimSize', None),
+        ('binding-type', 'comicbook.ComicBindingType', 'price'),
+        ('interior-color', 'comicbook.ComicInteriorColor', 'price_per_page'),
+        ('paper-type', 'comicbook.ComicPaperType', 'price_per_page'),
+        ('cover-finish', 'comicbook.ComicCoverFinish', 'price'),
+    ]),
+    ('photobook', 'Photo book', [
+        ('trim-size', 'photobook.TrimSize', None),
+        ('binding-type', 'photobook.BindingType', 'price'),
+        ('interior-color', 'photobook.InteriorColor', 'price_per_page'),
+        ('paper-type', 'photobook.PaperType', 'price_per_page'),
+        ('cover-finish', 'photobook.CornerProtector', 'price'),
+        ('spine', 'photobook.Spine', 'price'),
+        ('exterior-color', 'photobook.ExteriorColor', 'price'),
+        ('foil-stamping', 'photobook.FoilStamping', 'price'),
+        ('screen-stamping', 'photobook.ScreenStamping', 'price'),
+    ]),
+    ('magazine', 'Magazine', [
+        ('trim-size', 'magazine.TrimSize', None),
+        ('binding-type', 'magazine.BindingType', 'price'),
+        ('interior-color', 'magazine.InteriorColor', 'price_per_page'),
+        ('paper-type', 'magazine.PaperType', 'price_per_page'),
+        ('cover-finish', 'magazine.CoverFinish', 'price'),
+    ]),
+    ('yearbook', 'Yearbook', [
+        ('trim-size', 'yearbook.TrimSize', None),
+        ('binding-type', 'yearbook.BindingType', 'price'),
+        ('interior-color', 'yearbook.InteriorColor', 'price_per_page'),
+        ('paper-type', 'yearbook.PaperType', 'price_per_page'),
+        ('cover-finish', 'yearbook.CoverFinish', 'price'),
+    ]),
+    ('calender', 'Calendar', [
+        ('binding-type', 'calender.BindingType', 'price'),
+        ('interior-color', 'calender.InteriorColor', 'price'),
+        ('paper-type', 'calender.PaperType', 'price'),
+        ('cover-finish', 'calender.CoverFinish', 'price'),
+    ]),
+    ('pricing', 'Thesis binding', [
+        ('binding-type', 'pricing.BindingType', 'price'),
+        ('spine-type', 'pricing.SpineType', 'price'),
+        ('exterior-color', 'pricing.ExteriorColor', 'price'),
+        ('foil-stamping', 'pricing.FoilStamping', 'price'),
+        ('screen-stamping', 'pricing.ScreenStamping', 'price'),
+        ('corner-protector', 'pricing.CornerProtector', 'price'),
+        ('interior-color', 'pricing.InteriorColor', 'price_per_page'),
+        ('paper-type', 'pricing.PaperType', 'price_per_page'),
+    ]),
+]
+
+PER_PAGE_GROUPS = {'interior-color', 'paper-type'}
+PER_PAGE_PRODUCTS = {'printbook', 'comicbook', 'photobook', 'magazine', 'yearbook', 'pricing'}
+
+OPTION_COLUMNS = ('id', 'name', 'trim_size_id', 'min_pages', 'max_pages')
+
+
+def copy_options(apps, schema_editor):
+    Product = apps.get_model('pricing', 'Product')
+    OptionGroup = apps.get_model('pricing', 'OptionGroup')
+    Option = apps.get_model('pricing', 'Option')
+
+    for slug, name, groups in PRODUCTS:
+        product = Product.objects.create(slug=slug, name=name)
+        trim_sizes = {}
+        for position, (group_slug, label, price_field) in enumerate(groups):
+            group = OptionGroup.objects.create(
+                product=product, slug=group_slug, name=group_slug.replace('-', ' ').capitalize(),
+                per_page=slug in PER_PAGE_PRODUCTS and group_slug in PER_PAGE_GROUPS, position=position,
+            )
+            options = []
+            for row in apps.get_model(label).objects.order_by('id').values():
+                options.append(Option(
+                    group=group,
+                    source_id=row['id'],
+                    name=row['name'],
+                    price=row[price_field] if price_field else None,
+                    trim_size_id=trim_sizes.get(row.get('trim_size_id')),
+                    min_pages=row.get('min_pages'),
+                    max_pages=row.get('max_pages'),
+                    attributes={
+                        column: value for column, value in row.items()
+                        if column not in OPTION_COLUMNS and column != price_field
+                    },
+                ))
+            Option.objects.bulk_create(options)
+            if group_slug == 'trim-size':
+                trim_sizes = dict(Option.objects.filter(group=group).values_list('source_id', 'id'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pricing', '0005_catalogchange'),
+        ('printbookcalculator', '0003_option_slugs_and_aliases'),
+        ('comicbook', '0002_comicbindingtype_comiccoverfinish_and_more'),
+        ('photobook', '0002_foilstamping_interiorcolor_screenstamping_spine_and_more'),
+        ('magazine', '0002_bindingtype_page_range'),
+        ('yearbook', '0002_bindingtype_page_range'),
+        ('calender', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Product',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('slug', models.CharField(choices=[('printbook', 'Print book'), ('comicbook', 'Comic book'), ('photobook', 'Photo book'), ('magazine', 'Magazine'), ('yearbook', 'Yearbook'), ('calender', 'Calendar'), ('pricing', 'Thesis binding')], max_length=50, unique=True)),
+                ('name', models.CharField(max_length=100)),
+            ],
+            options={
+                'ordering': ('id',),
+            },
+        ),
+        migrations.CreateModel(
+            name='OptionGroup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('slug', models.CharField(max_length=50)),
+                ('name', models.CharField(max_length=100)),
+                ('per_page', models.BooleanField(default=False)),
+                ('position', models.PositiveSmallIntegerField(default=0)),
+                ('product', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='groups', to='pricing.product')),
+            ],
+            options={
+                'ordering': ('product', 'position'),
+                'unique_together': {('product', 'slug')},
+            },
+        ),
+        migrations.CreateModel(
+            name='Option',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('source_id', models.PositiveIntegerField()),
+                ('name', models.CharField(max_length=100)),
+                ('price', models.DecimalField(blank=True, decimal_places=4, max_digits=10, null=True)),
+                ('min_pages', models.IntegerField(blank=True, null=True)),
+                ('max_pages', models.IntegerField(blank=True, null=True)),
+                ('attributes', models.JSONField(blank=True, default=dict, encoder=django.core.serializers.json.DjangoJSONEncoder)),
+                ('group', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='options', to='pricing.optiongroup')),
+                ('trim_size', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='pricing.option')),
+            ],
+            options={
+                'ordering': ('group', 'source_id'),
+                'unique_together': {('group', 'source_id')},
+            },
+        ),
+        migrations.RunPython(copy_options, migrations.RunPython.noop),
+    ]
@@ -1,3 +1,5 @@
+from django.core.serializers.json import DjangoJSONEncoder
+from django.core.validators import MaxValueValidator, MinValueValidator
 from django.db import models
 
 class BindingType(models.Model):
@@ -34,3 +36,135 @@ class InteriorColor(models.Model):
 class PaperType(models.Model):
     name = models.CharField(max_length=100)
     price_per_page = models.DecimalField(max_digits=10, decimal_places=4)
+
+
+class CatalogVersion(models.Model):
+    # One row per product catalog ("printbook", "comicbook", ...). The version is
+    # bumped whenever a price or option row in that catalog is written.
+    catalog = models.CharField(max_length=50, unique=True)
+    version = models.PositiveBigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.catalog} v{self.version}"
+
+
+class PriceList(models.Model):
+    # Immutable copy of one catalog's prices at one catalog version. Carts and
+    # draft orders reference the list they were priced against, so their totals
+    # can be re-derived later without touching the option tables.
+    catalog = models.CharField(max_length=50)
+    version = models.PositiveBigIntegerField()
+    prices = models.JSONField(help_text="table -> option id -> {name, price, ...}")
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        unique_together = ('catalog', 'version')
+
+    def save(self, *args, **kwargs):
+        if self.pk is not None:
+            raise ValueError("Price lists are immutable.")
+        super().save(*args, **kwargs)
+
+    def __str__(self):
+        return f"{self.catalog} price list v{self.version}"
+
+
+CATALOG_CHOICES = [
+    ('printbook', 'Print book'),
+    ('comicbook', 'Comic book'),
+    ('photobook', 'Photo book'),
+    ('magazine', 'Magazine'),
+    ('yearbook', 'Yearbook'),
+    ('calender', 'Calendar'),
+    ('pricing', 'Thesis binding'),
+]
+
+
+class DiscountTier(models.Model):
+    # Quantity discount of one product catalog: orders of at least
+    # ``min_quantity`` copies get ``percent`` off the total. When several
+    # tiers are reached, the one with the highest minimum applies.
+    catalog = models.CharField(max_length=50, choices=CATALOG_CHOICES)
+    min_quantity = models.PositiveIntegerField(validators=[MinValueValidator(1)])
+    percent = models.DecimalField(
+        max_digits=5, decimal_places=2,
+        validators=[MinValueValidator(0), MaxValueValidator(100)]
+    )
+
+    class Meta:
+        unique_together = ('catalog', 'min_quantity')
+        ordering = ('catalog', 'min_quantity')
+
+    def __str__(self):
+        return f"{self.catalog}: {self.percent}% from {self.min_quantity}"
+
+
+class CatalogChange(models.Model):
+    # Log of option rows written in a catalog. Rows are recorded with no version
+    # and stamped with the catalog version that publishes them. A row without a
+    # table is a reset: the catalog changed in ways that were not recorded (seed
+    # commands, bulk writes), so clients must reload it in full.
+    catalog = models.CharField(max_length=50)
+    version = models.PositiveBigIntegerField(null=True, blank=True)
+    table = models.CharField(max_length=50, blank=True)
+    row_id = models.PositiveBigIntegerField(null=True, blank=True)
+    deleted = models.BooleanField(default=False)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [models.Index(fields=['catalog', 'version'])]
+
+    def __str__(self):
+        return f"{self.catalog} v{self.version}: {self.table or 'reset'} {self.row_id or ''}".rstrip()
+
+
+class Product(models.Model):
+    # One configurable product line; ``slug`` is its catalog name.
+    slug = models.CharField(max_length=50, unique=True, choices=CATALOG_CHOICES)
+    name = models.CharField(max_length=100)
+
+    class Meta:
+        ordering = ('id',)
+
+    def __str__(self):
+        return self.name
+
+
+class OptionGroup(models.Model):
+    # A set of options of a product ("binding-type", "paper-type", ...).
+    # Options of per-page groups are priced per page.
+    product = models.ForeignKey(Product, on_delete=models.CASCADE, related_name='groups')
+    slug = models.CharField(max_length=50)
+    name = models.CharField(max_length=100)
+    per_page = models.BooleanField(default=False)
+    position = models.PositiveSmallIntegerField(default=0)
+
+    class Meta:
+        unique_together = ('product', 'slug')
+        ordering = ('product', 'position')
+
+    def __str__(self):
+        return f"{self.product.slug} {self.slug}"
+
+
+class Option(models.Model):
+    # One option of a group, mirrored from the product's own option table;
+    # ``source_id`` is the id of that row, which calculators are given.
+    # ``price`` is empty for groups that are not priced (trim sizes).
+    group = models.ForeignKey(OptionGroup, on_delete=models.CASCADE, related_name='options')
+    source_id = models.PositiveIntegerField()
+    name = models.CharField(max_length=100)
+    price = models.DecimalField(max_digits=10, decimal_places=4, null=True, blank=True)
+    trim_size = models.ForeignKey('self', on_delete=models.CASCADE, null=True, blank=True, related_name='+')
+    min_pages = models.IntegerField(null=True, blank=True)
+    max_pages = models.IntegerField(null=True, blank=True)
+    # Remaining columns of the source row (slug, dimensions, image_url, ...)
+    attributes = models.JSONField(default=dict, blank=True, encoder=DjangoJSONEncoder)
+
+    class Meta:
+        unique_together = ('group', 'source_id')
+        ordering = ('group', 'source_id')
+
+    def __str__(self):
+        return f"{self.group}: {self.name}"
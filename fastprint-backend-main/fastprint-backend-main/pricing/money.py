@@ -0,0 +1,90 @@
+"""
+Fixed-point integer money.
+
+Amounts are plain ints in one of two scales:
+
+    units   ten-thousandths of a dollar, the precision of the option prices
+            (per-page prices have four decimal places)
+    cents   hundredths of a dollar, what is quoted, stored on carts and orders
+            and sent to Stripe as ``unit_amount``
+
+Option prices are converted to units once, when a price plan or snapshot is
+compiled; quoting is then integer arithmetic only. Every conversion to cents
+rounds half up, in one place, and totals are built from the per-book price
+already rounded to the cent (``cents × quantity``). A quote therefore equals
+the Stripe line item (``unit_amount × quantity``) and the stored cart totals
+exactly.
+
+Discount and tax rates are given in basis points (1/100 of a percent).
+"""
+from decimal import Decimal, InvalidOperation, ROUND_HALF_UP
+
+UNITS_PER_DOLLAR = 10000
+UNITS_PER_CENT = 100
+CENTS_PER_DOLLAR = 100
+BASIS_POINTS = 10000
+
+
+def _divide(value, divisor):
+    """``value / divisor`` rounded half up (away from zero), in integers."""
+    quotient, remainder = divmod(abs(value), divisor)
+    if remainder * 2 >= divisor:
+        quotient += 1
+    return quotient if value >= 0 else -quotient
+
+
+def _decimal(value):
+    if isinstance(value, float):
+        # repr() is the shortest string that round-trips, so 0.1 -> '0.1'
+        value = repr(value)
+    try:
+        amount = Decimal(value)
+    except (InvalidOperation, TypeError):
+        raise ValueError(f"'{value}' is not an amount of money.")
+    if not amount.is_finite():
+        raise ValueError(f"'{value}' is not an amount of money.")
+    return amount
+
+
+def to_units(value):
+    """An amount in dollars (Decimal, str, int or float) as units."""
+    return int((_decimal(value) * UNITS_PER_DOLLAR).to_integral_value(ROUND_HALF_UP))
+
+
+def to_cents(value):
+    """An amount in dollars (Decimal, str, int or float) as cents."""
+    return int((_decimal(value) * CENTS_PER_DOLLAR).to_integral_value(ROUND_HALF_UP))
+
+
+def to_basis_points(percent):
+    """A percentage (Decimal, str, int or float) as basis points."""
+    return int((_decimal(percent) * 100).to_integral_value(ROUND_HALF_UP))
+
+
+def parse_cents(value):
+    """An amount already in cents (e.g. a Stripe ``unit_amount``); must be whole."""
+    amount = _decimal(value)
+    if amount != amount.to_integral_value():
+        raise ValueError(f"'{value}' is not a whole number of cents.")
+    return int(amount)
+
+
+def units_to_cents(units):
+    return _divide(units, UNITS_PER_CENT)
+
+
+def apply_rate(cents, basis_points):
+    """``basis_points`` of ``cents``, in cents."""
+    return _divide(cents * basis_points, BASIS_POINTS)
+
+
+def to_decimal(cents):
+    """Cents as a two-place Decimal of dollars, for model fields and responses."""
+    return Decimal(cents).scaleb(-2)
+
+
+def format_cents(cents):
+    """Cents as a plain ``'12.34'`` string."""
+    sign = '-' if cents < 0 else ''
+    dollars, cents = divmod(abs(cents), CENTS_PER_DOLLAR)
+    return f'{sign}{dollars}.{cents:02d}'
@@ -0,0 +1,105 @@
+"""
+Pinned, versioned price lists.
+
+Every bump of a catalog version freezes the catalog's prices in a PriceList
+row, in the same transaction, and ``pin_price_list(catalog)`` returns the row
+of the current version. Carts and draft orders store that row next to the
+calculator configuration they were priced with (``quote_config``), so their
+totals can be re-derived from the pinned prices at any time: loaded lists are compiled once per process into the
+engine's PricePlan, and quoting them is pure in-memory arithmetic.
+
+``quote_config`` is the payload of the product's calculate endpoint plus a
+``catalog`` key, with options given by id, e.g.::
+
+    {"catalog": "comicbook", "page_count": 48, "quantity": 20, "binding_id": 3,
+     "interior_color_id": 1, "paper_type_id": 2, "cover_finish_id": 1}
+"""
+from functools import lru_cache
+
+from .catalog import bump_catalog_version
+from .engine import FORMULAS, PricePlan, QuoteError, option_prices
+from .money import to_cents, to_decimal
+from .models import CatalogVersion, PriceList
+
+
+class PriceListError(QuoteError):
+    """A price list cannot be pinned."""
+
+
+def freeze_price_list(catalog, version):
+    """
+    Store the prices of ``catalog`` as its list for ``version``. Called by
+    ``bump_catalog_version`` in the transaction that sets the version, so a
+    list only ever holds the prices its version was published with.
+    """
+    if catalog in FORMULAS:
+        PriceList.objects.get_or_create(catalog=catalog, version=version, defaults={'prices': option_prices(catalog)})
+
+
+def pin_price_list(catalog):
+    """Return the PriceList of ``catalog`` at its current version."""
+    if catalog not in FORMULAS:
+        raise PriceListError(f"Unknown catalog '{catalog}'.")
+    # The option rows may already hold prices that the version does not cover
+    # yet (an update view saves before it bumps), so the list is never compiled
+    # here: read the version from the database and take the list frozen with it.
+    version = CatalogVersion.objects.filter(catalog=catalog).values_list('version', flat=True).first()
+    price_list = PriceList.objects.filter(catalog=catalog, version=version).first() if version else None
+    if price_list is None:
+        # Not bumped since price lists are frozen on bump: publish the current prices
+        price_list = PriceList.objects.get(catalog=catalog, version=bump_catalog_version(catalog))
+    return price_list
+
+
+@lru_cache(maxsize=64)
+def _compiled(price_list_id):
+    price_list = PriceList.objects.get(pk=price_list_id)
+    return PricePlan(price_list.catalog, price_list.version, price_list.prices)
+
+
+def get_price_list(price_list_id):
+    """PricePlan of a price list, by id. Price lists never change, so they are cached for the process lifetime."""
+    return _compiled(price_list_id)
+
+
+def validate_quote_config(config):
+    """
+    Check that ``config`` names a known catalog and prices against the
+    catalog's current list. Returns the pinned PriceList.
+    """
+    if not isinstance(config, dict):
+        raise QuoteError('quote_config must be an object.')
+    price_list = pin_price_list(config.get('catalog'))
+    get_price_list(price_list.pk).quote(config)
+    return price_list
+
+
+def check_item_total(price_list_id, config, quantity, subtotal, product_price=None):
+    """
+    Re-derive an item's total from its pinned price list and compare it with
+    the stored ``subtotal`` and, when set, the per-book ``product_price``.
+    Amounts must match to the cent. Returns a result dict.
+    """
+    try:
+        price_list = get_price_list(price_list_id)
+        quote = price_list.quote(config)
+    except (QuoteError, PriceList.DoesNotExist) as e:
+        return {'valid': False, 'error': str(e)}
+
+    errors = []
+    if quantity is not None and int(config.get('quantity', 0)) != quantity:
+        errors.append('Quantity does not match the priced configuration.')
+    if subtotal is None or to_cents(subtotal) != quote.final_price:
+        errors.append('Subtotal does not match the pinned price list.')
+    if product_price is not None and to_cents(product_price) != quote.cost_per_book:
+        errors.append('Product price does not match the pinned price list.')
+    result = {
+        'valid': not errors,
+        'catalog': price_list.catalog,
+        'price_list_version': price_list.version,
+        'expected_cost_per_book': to_decimal(quote.cost_per_book),
+        'expected_subtotal': to_decimal(quote.final_price),
+    }
+    if errors:
+        result['error'] = ' '.join(errors)
+    return result
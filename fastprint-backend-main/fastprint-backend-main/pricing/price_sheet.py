@@ -0,0 +1,326 @@
+"""
+Bulk price sheets for every product catalog.
+
+A price sheet is a CSV or XLSX table with one row per priced option::
+
+    catalog,table,id,name,price
+    printbook,binding-type,12,Coil Bound,6.18
+
+``table`` uses the same names as the per-row update endpoints of each app and
+``name`` is informational. Importing a sheet validates every row first, diffs
+it against the current rows and writes all changes with ``bulk_update`` inside
+one transaction, then bumps each touched catalog version once, so calculators
+never see a half-repriced catalog.
+"""
+import csv
+import io
+import zipfile
+from decimal import Decimal, InvalidOperation
+from xml.etree import ElementTree
+
+from django.apps import apps
+from django.core.exceptions import ValidationError
+from django.db import transaction
+
+from .catalog import bump_catalog_version
+
+COLUMNS = ('catalog', 'table', 'id', 'name', 'price')
+
+# catalog -> table -> (model, price field)
+PRICE_TABLES = {
+    'printbook': {
+        'binding-type': ('printbookcalculator.BindingType', 'price'),
+        'interior-color': ('printbookcalculator.InteriorColor', 'price_per_page'),
+        'paper-type': ('printbookcalculator.PaperType', 'price_per_page'),
+        'cover-finish': ('printbookcalculator.CoverFinish', 'price'),
+    },
+    'comicbook': {
+        'binding-type': ('comicbook.ComicBindingType', 'price'),
+        'interior-color': ('comicbook.ComicInteriorColor', 'price_per_page'),
+        'paper-type': ('comicbook.ComicPaperType', 'price_per_page'),
+        'cover-finish': ('comicbook.ComicCoverFinish', 'price'),
+    },
+    'photobook': {
+        'binding-type': ('photobook.BindingType', 'price'),
+        'interior-color': ('photobook.InteriorColor', 'price_per_page'),
+        'paper-type': ('photobook.PaperType', 'price_per_page'),
+        'cover-finish': ('photobook.CornerProtector', 'price'),
+        'spine': ('photobook.Spine', 'price'),
+        'exterior-color': ('photobook.ExteriorColor', 'price'),
+        'foil-stamping': ('photobook.FoilStamping', 'price'),
+        'screen-stamping': ('photobook.ScreenStamping', 'price'),
+    },
+    'magazine': {
+        'binding-type': ('magazine.BindingType', 'price'),
+        'interior-color': ('magazine.InteriorColor', 'price_per_page'),
+        'paper-type': ('magazine.PaperType', 'price_per_page'),
+        'cover-finish': ('magazine.CoverFinish', 'price'),
+    },
+    'yearbook': {
+        'binding-type': ('yearbook.BindingType', 'price'),
+        'interior-color': ('yearbook.InteriorColor', 'price_per_page'),
+        'paper-type': ('yearbook.PaperType', 'price_per_page'),
+        'cover-finish': ('yearbook.CoverFinish', 'price'),
+    },
+    'calender': {
+        'binding-type': ('calender.BindingType', 'price'),
+        'interior-color': ('calender.InteriorColor', 'price'),
+        'paper-type': ('calender.PaperType', 'price'),
+        'cover-finish': ('calender.CoverFinish', 'price'),
+    },
+    'pricing': {
+        'binding-type': ('pricing.BindingType', 'price'),
+        'spine-type': ('pricing.SpineType', 'price'),
+        'exterior-color': ('pricing.ExteriorColor', 'price'),
+        'foil-stamping': ('pricing.FoilStamping', 'price'),
+        'screen-stamping': ('pricing.ScreenStamping', 'price'),
+        'corner-protector': ('pricing.CornerProtector', 'price'),
+        'interior-color': ('pricing.InteriorColor', 'price_per_page'),
+        'paper-type': ('pricing.PaperType', 'price_per_page'),
+    },
+}
+
+
+class PriceSheetError(ValueError):
+    """The sheet could not be read or has invalid rows; nothing was imported."""
+
+    def __init__(self, errors):
+        super().__init__('; '.join(errors))
+        self.errors = errors
+
+
+def price_table(catalog, table):
+    """Return ``(model, price field name)`` for a sheet table, or None."""
+    model_label, field_name = PRICE_TABLES.get(catalog, {}).get(table, (None, None))
+    if model_label is None:
+        return None
+    return apps.get_model(model_label), field_name
+
+
+# -----------------------
+# Reading
+# -----------------------
+XLSX_NS = {'s': 'http://schemas.openxmlformats.org/spreadsheetml/2006/main'}
+
+
+def _column_index(cell_ref):
+    index = 0
+    for char in cell_ref:
+        if not char.isalpha():
+            break
+        index = index * 26 + ord(char.upper()) - ord('A') + 1
+    return index - 1
+
+
+def _xlsx_rows(content):
+    """Rows of the first worksheet of an XLSX file, as lists of strings."""
+    with zipfile.ZipFile(io.BytesIO(content)) as archive:
+        shared = []
+        if 'xl/sharedStrings.xml' in archive.namelist():
+            root = ElementTree.fromstring(archive.read('xl/sharedStrings.xml'))
+            for item in root.findall('s:si', XLSX_NS):
+                shared.append(''.join(t.text or '' for t in item.iter(f"{{{XLSX_NS['s']}}}t")))
+        sheet_names = sorted(n for n in archive.namelist() if n.startswith('xl/worksheets/sheet'))
+        if not sheet_names:
+            raise PriceSheetError(['The workbook has no worksheet.'])
+        root = ElementTree.fromstring(archive.read(sheet_names[0]))
+
+    for row in root.iterfind('s:sheetData/s:row', XLSX_NS):
+        values = {}
+        for cell in row.findall('s:c', XLSX_NS):
+            cell_type = cell.get('t')
+            if cell_type == 'inlineStr':
+                text = ''.join(t.text or '' for t in cell.iter(f"{{{XLSX_NS['s']}}}t"))
+            else:
+                value = cell.find('s:v', XLSX_NS)
+                text = value.text if value is not None and value.text is not None else ''
+                if cell_type == 's' and text:
+                    text = shared[int(text)]
+            values[_column_index(cell.get('r', 'A'))] = text
+        yield [values.get(i, '') for i in range(max(values, default=-1) + 1)]
+
+
+def _csv_rows(content):
+    try:
+        text = content.decode('utf-8-sig')
+    except UnicodeDecodeError:
+        raise PriceSheetError(['CSV files must be UTF-8 encoded.'])
+    return csv.reader(io.StringIO(text))
+
+
+def read_price_sheet(content, filename):
+    """
+    Parse an uploaded sheet into ``(line number, row dict)`` pairs. The first
+    row must be the header; column order does not matter.
+    """
+    try:
+        if filename.lower().endswith('.xlsx'):
+            rows = list(_xlsx_rows(content))
+        else:
+            rows = list(_csv_rows(content))
+    except PriceSheetError:
+        raise
+    except (zipfile.BadZipFile, ElementTree.ParseError, csv.Error, KeyError, IndexError, ValueError) as e:
+        raise PriceSheetError([f'Could not read {filename}: {e}'])
+
+    if not rows:
+        raise PriceSheetError(['The sheet is empty.'])
+    header = [str(h).strip().lower() for h in rows[0]]
+    missing = [c for c in ('catalog', 'table', 'id', 'price') if c not in header]
+    if missing:
+        raise PriceSheetError([f"Missing column(s): {', '.join(missing)}."])
+
+    parsed = []
+    for line, row in enumerate(rows[1:], start=2):
+        if not any(str(value).strip() for value in row):
+            continue
+        parsed.append((line, {name: str(row[i]).strip() if i < len(row) else '' for i, name in enumerate(header)}))
+    return parsed
+
+
+# -----------------------
+# Diff and import
+# -----------------------
+def _clean_price(field, raw):
+    try:
+        value = Decimal(raw)
+    except InvalidOperation:
+        raise ValidationError(f"'{raw}' is not a number.")
+    # Spreadsheet apps store numbers as binary floats (6.18 -> 6.1799999999999997)
+    rounded = round(value, field.decimal_places)
+    if abs(value - rounded) < Decimal('1e-9'):
+        value = rounded
+    return field.clean(value, None)
+
+
+def _validate(rows):
+    """Group valid rows by ``(catalog, table)``; raise PriceSheetError listing every bad row."""
+    errors = []
+    grouped = {}
+    seen = set()
+    for line, row in rows:
+        catalog, table = row.get('catalog', ''), row.get('table', '')
+        target = price_table(catalog, table)
+        if target is None:
+            errors.append(f"Row {line}: unknown catalog/table '{catalog}/{table}'.")
+            continue
+        model, field_name = target
+        try:
+            pk = int(row['id'])
+        except ValueError:
+            errors.append(f"Row {line}: invalid id '{row['id']}'.")
+            continue
+        if (catalog, table, pk) in seen:
+            errors.append(f'Row {line}: {catalog}/{table} id {pk} appears more than once.')
+            continue
+        seen.add((catalog, table, pk))
+        try:
+            price = _clean_price(model._meta.get_field(field_name), row['price'])
+        except ValidationError as e:
+            errors.append(f"Row {line}: {' '.join(e.messages)}")
+            continue
+        grouped.setdefault((catalog, table), []).append((line, pk, price))
+    if errors:
+        raise PriceSheetError(errors)
+    return grouped
+
+
+def _diff(grouped, lock=False):
+    """
+    Compare validated rows with the database. Returns the changed instances
+    per ``(catalog, table)`` and the change list reported to the caller.
+    """
+    errors = []
+    changed = {}
+    changes = []
+    unchanged = 0
+    for (catalog, table), entries in grouped.items():
+        model, field_name = price_table(catalog, table)
+        queryset = model.objects.all()
+        if lock:
+            queryset = queryset.select_for_update()
+        current = queryset.in_bulk([pk for _, pk, _ in entries])
+        for line, pk, price in entries:
+            instance = current.get(pk)
+            if instance is None:
+                errors.append(f'Row {line}: {catalog}/{table} id {pk} does not exist.')
+                continue
+            old_price = getattr(instance, field_name)
+            if old_price is not None and Decimal(old_price) == price:
+                unchanged += 1
+                continue
+            setattr(instance, field_name, price)
+            changed.setdefault((catalog, table), []).append(instance)
+            changes.append({
+                'catalog': catalog,
+                'table': table,
+                'id': pk,
+                'name': getattr(instance, 'name', ''),
+                'field': field_name,
+                'old': str(old_price),
+                'new': str(price),
+            })
+    if errors:
+        raise PriceSheetError(errors)
+    return changed, changes, unchanged
+
+
+def import_price_sheet(rows, dry_run=False):
+    """
+    Validate and apply parsed sheet rows. Either every change is written or
+    none is. Returns a summary with the changes and the new catalog versions.
+    """
+    grouped = _validate(rows)
+
+    if dry_run:
+        _, changes, unchanged = _diff(grouped)
+        return {'applied': False, 'changes': changes, 'unchanged': unchanged, 'catalog_versions': {}}
+
+    from .changes import record_changes
+
+    with transaction.atomic():
+        changed, changes, unchanged = _diff(grouped, lock=True)
+        for (catalog, table), instances in changed.items():
+            model, field_name = price_table(catalog, table)
+            model.objects.bulk_update(instances, [field_name])
+            # bulk_update sends no signals, so log the rows for delta clients
+            record_changes(catalog, table, [instance.pk for instance in instances])
+
+    catalog_versions = {
+        catalog: bump_catalog_version(catalog)
+        for catalog in sorted({catalog for catalog, _ in changed})
+    }
+    return {'applied': True, 'changes': changes, 'unchanged': unchanged, 'catalog_versions': catalog_versions}
+
+
+# -----------------------
+# Export
+# -----------------------
+def price_sheet_rows(catalogs=None):
+    """Current prices as sheet rows (a template for the next import)."""
+    for catalog, tables in PRICE_TABLES.items():
+        if catalogs and catalog not in catalogs:
+            continue
+        for table in tables:
+            model, field_name = price_table(catalog, table)
+            for pk, name, price in model.objects.order_by('id').values_list('id', 'name', field_name):
+                yield [catalog, table, pk, name, str(price)]
+
+
+def write_price_sheet_csv(rows, stream):
+    writer = csv.writer(stream)
+    writer.writerow(COLUMNS)
+    writer.writerows(rows)
+
+
+def write_price_sheet_xlsx(rows, stream):
+    import xlsxwriter
+
+    workbook = xlsxwriter.Workbook(stream, {'in_memory': True})
+    worksheet = workbook.add_worksheet('Prices')
+    worksheet.write_row(0, 0, COLUMNS)
+    for i, (catalog, table, pk, name, price) in enumerate(rows, start=1):
+        worksheet.write_row(i, 0, [catalog, table, pk, name])
+        # Prices stay text so the sheet round-trips without float rounding
+        worksheet.write_string(i, 4, price)
+    workbook.close()
@@ -0,0 +1,174 @@
+"""
+Generic product schema.
+
+Every product line is a Product with OptionGroups ("trim-size",
+"binding-type", "paper-type", ...) of Options, in three indexed tables shared
+by all products. The generic views serve any product from one snapshot per
+catalog version, built with two queries, instead of one serializer and query
+per option table and app.
+
+The option tables of each app (see PRICE_TABLES) remain the rows that prices
+are written to and that calculators are given ids of. Options mirror them:
+``bump_catalog_version`` syncs the rows published with each version into the
+generic tables in the bump's transaction, and a reset syncs the whole
+product. Option ids exposed by the generic views are the ids of the source
+rows.
+"""
+from django.apps import apps
+from django.db import transaction
+
+from .catalog import VersionedSnapshot, get_catalog_versions
+from .changes import EXTRA_TABLES
+from .engine import FORMULAS
+from .models import CATALOG_CHOICES, CatalogChange, Option, OptionGroup, Product
+from .price_sheet import PRICE_TABLES
+
+PRODUCT_NAMES = dict(CATALOG_CHOICES)
+
+TRIM_SIZE_GROUP = 'trim-size'
+
+# Columns of a source row with a column of their own on Option
+OPTION_COLUMNS = ('id', 'name', 'trim_size_id', 'min_pages', 'max_pages')
+
+OPTION_FIELDS = ('name', 'price', 'trim_size', 'min_pages', 'max_pages', 'attributes')
+
+
+def product_groups(catalog):
+    """``(group, model label, price field or None)`` of ``catalog``, in display order."""
+    groups = []
+    trim_sizes = EXTRA_TABLES.get(catalog, {}).get(TRIM_SIZE_GROUP)
+    if trim_sizes:
+        groups.append((TRIM_SIZE_GROUP, trim_sizes, None))
+    groups.extend((group, label, price_field) for group, (label, price_field) in PRICE_TABLES[catalog].items())
+    return groups
+
+
+def _option(row, group, price_field, trim_sizes):
+    return {
+        'group': group,
+        'source_id': row['id'],
+        'name': row['name'],
+        'price': row[price_field] if price_field else None,
+        'trim_size_id': trim_sizes.get(row.get('trim_size_id')),
+        'min_pages': row.get('min_pages'),
+        'max_pages': row.get('max_pages'),
+        'attributes': {
+            column: value for column, value in row.items()
+            if column not in OPTION_COLUMNS and column != price_field
+        },
+    }
+
+
+def sync_product(catalog, row_ids=None):
+    """
+    Mirror the option rows of ``catalog`` into the generic tables: every row,
+    or only ``row_ids`` (``{group: ids}``) of the groups listed.
+    """
+    product, _ = Product.objects.get_or_create(slug=catalog, defaults={'name': PRODUCT_NAMES[catalog]})
+    per_page_groups = {option.table for option in FORMULAS[catalog].per_page}
+
+    for position, (slug, label, price_field) in enumerate(product_groups(catalog)):
+        if row_ids is not None and slug not in row_ids:
+            continue
+        group, _ = OptionGroup.objects.update_or_create(
+            product=product, slug=slug,
+            defaults={
+                'name': slug.replace('-', ' ').capitalize(),
+                'per_page': slug in per_page_groups,
+                'position': position,
+            },
+        )
+        model = apps.get_model(label)
+        rows = model.objects.order_by('id')
+        options = Option.objects.filter(group=group)
+        if row_ids is not None:
+            rows = rows.filter(pk__in=row_ids[slug])
+            options = options.filter(source_id__in=row_ids[slug])
+        trim_sizes = {}
+        if 'trim_size_id' in {field.attname for field in model._meta.concrete_fields}:
+            trim_sizes = dict(
+                Option.objects.filter(group__product=product, group__slug=TRIM_SIZE_GROUP)
+                .values_list('source_id', 'id')
+            )
+
+        existing = dict(options.values_list('source_id', 'id'))
+        created, updated = [], []
+        for row in rows.values():
+            option = Option(**_option(row, group, price_field, trim_sizes))
+            option.pk = existing.pop(row['id'], None)
+            (created if option.pk is None else updated).append(option)
+        Option.objects.bulk_create(created)
+        Option.objects.bulk_update(updated, OPTION_FIELDS)
+        # Source rows that are gone
+        Option.objects.filter(pk__in=existing.values()).delete()
+
+
+def sync_catalog_version(catalog, version):
+    """
+    Mirror the rows published with ``version`` of ``catalog``. Called by
+    ``bump_catalog_version`` in the transaction that sets the version.
+    """
+    if catalog not in PRICE_TABLES:
+        return
+    row_ids = {}
+    for table, row_id in CatalogChange.objects.filter(catalog=catalog, version=version).values_list('table', 'row_id'):
+        if not table:
+            # A reset: rows were written without being recorded
+            row_ids = None
+            break
+        row_ids.setdefault(table, set()).add(row_id)
+    with transaction.atomic():
+        sync_product(catalog, row_ids)
+
+
+def _option_data(option):
+    data = {
+        'id': option['source_id'],
+        'name': option['name'],
+        'price': option['price'],
+        'trim_size_id': option['trim_size__source_id'],
+        'min_pages': option['min_pages'],
+        'max_pages': option['max_pages'],
+    }
+    data.update(option['attributes'])
+    return data
+
+
+def build_product(catalog, version):
+    groups = {
+        group['id']: dict(group, options=[])
+        for group in OptionGroup.objects.filter(product__slug=catalog).order_by('position')
+        .values('id', 'slug', 'name', 'per_page')
+    }
+    options = Option.objects.filter(group__product__slug=catalog).order_by('source_id').values(
+        'group_id', 'source_id', 'name', 'price', 'trim_size__source_id', 'min_pages', 'max_pages', 'attributes'
+    )
+    for option in options:
+        groups[option['group_id']]['options'].append(_option_data(option))
+    for group in groups.values():
+        del group['id']
+    return {
+        'product': catalog,
+        'name': PRODUCT_NAMES[catalog],
+        'version': version,
+        'groups': list(groups.values()),
+    }
+
+
+_products = {
+    catalog: VersionedSnapshot(catalog, lambda version, catalog=catalog: build_product(catalog, version))
+    for catalog in FORMULAS
+}
+
+
+def get_product(catalog):
+    """Groups and options of ``catalog`` at its current version."""
+    return _products[catalog].get()
+
+
+def get_product_list():
+    """Every product with its current catalog version."""
+    return [
+        {'product': catalog, 'name': PRODUCT_NAMES[catalog], 'version': version}
+        for catalog, version in zip(FORMULAS, get_catalog_versions(tuple(FORMULAS)))
+    ]
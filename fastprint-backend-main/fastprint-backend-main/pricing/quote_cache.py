@@ -0,0 +1,98 @@
+"""
+Memoization of calculator quotes.
+
+Quotes are a pure function of the normalized configuration and the catalog
+prices, so each calculate view keeps a bounded LRU cache keyed by
+``(catalog version, configuration)``. The version is the one of the snapshot
+or price plan that computes the quote, not a second read of the current
+version, which a bump may have moved in between. A price update bumps the
+catalog version, which makes every older entry unreachable; those entries
+then age out through the LRU bound or the TTL. Caches are per worker process, and so are their
+counters.
+"""
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+
+
+class QuoteCache:
+
+    def __init__(self, catalog, maxsize=None, ttl=None):
+        self.catalog = catalog
+        self.maxsize = maxsize if maxsize is not None else getattr(settings, 'QUOTE_CACHE_MAXSIZE', 2048)
+        self.ttl = ttl if ttl is not None else getattr(settings, 'QUOTE_CACHE_TTL', 300)
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get_or_compute(self, version, key, compute):
+        """
+        Return the cached quote for ``key`` under catalog ``version``, the
+        version of the snapshot or plan that ``compute()`` prices with, calling
+        ``compute()`` on a miss. Exceptions raised by ``compute`` are
+        propagated and nothing is cached.
+        """
+        key = (version, key)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires_at, value = entry
+                if expires_at > now:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._entries[key]
+                self.expirations += 1
+            self.misses += 1
+
+        value = compute()
+
+        with self._lock:
+            self._entries[key] = (now + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self._entries),
+                'maxsize': self.maxsize,
+                'ttl': self.ttl,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else None,
+            }
+
+
+_caches = {}
+_caches_lock = threading.Lock()
+
+
+def get_quote_cache(catalog):
+    """Return the process-wide QuoteCache of ``catalog``."""
+    with _caches_lock:
+        if catalog not in _caches:
+            _caches[catalog] = QuoteCache(catalog)
+        return _caches[catalog]
+
+
+def quote_cache_stats():
+    with _caches_lock:
+        caches = list(_caches.values())
+    return {cache.catalog: cache.stats() for cache in caches}
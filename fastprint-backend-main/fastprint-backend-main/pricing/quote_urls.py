@@ -0,0 +1,78 @@
+"""
+HTTP-cacheable GET variant of the calculate endpoints.
+
+A quote is a pure function of its configuration and the catalog version, so
+the calculate views also answer ``GET ?page_count=...&quantity=...&...``.
+Each configuration has one canonical query string: the configuration's fields
+in a fixed order with normalized values (ints, canonical option keys), and
+without unknown or empty parameters. Any other spelling of the same
+configuration is redirected to it, so browser and proxy caches hold one entry
+per configuration instead of one per spelling.
+
+Canonical responses carry ``Cache-Control: public, max-age=QUOTE_HTTP_MAX_AGE``
+and the catalog ETag; once an entry is stale the cache revalidates it and gets
+a 304 until the catalog changes.
+"""
+from functools import wraps
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.http import HttpResponseRedirect
+from django.utils.cache import patch_cache_control
+
+from .catalog import catalog_condition
+from .engine import QuoteError, get_price_plan
+
+
+def _max_age():
+    return getattr(settings, 'QUOTE_HTTP_MAX_AGE', 60)
+
+
+def plan_query(catalog):
+    """Canonical query of a configuration of an engine catalog (see PricePlan.config_key)."""
+    def canonical_query(query):
+        plan = get_price_plan(catalog)
+        pairs = list(zip(plan.fields, plan.config_key(query)))
+        for field, value in pairs:
+            if value is None and field in ('quantity', 'page_count'):
+                raise QuoteError(f"Missing '{field}'.")
+        return [(field, value) for field, value in pairs if value is not None]
+    return canonical_query
+
+
+def quote_payload(request):
+    """The configuration of a calculate request: the query string of a GET, else the body."""
+    return request.query_params.dict() if request.method == 'GET' else request.data
+
+
+def cacheable_quote(catalog, canonical_query=None):
+    """
+    Decorator for calculate views that also accept GET (apply it outside
+    ``@api_view``). ``canonical_query(query)`` returns the ``(field, value)``
+    pairs of the canonical query, or raises if the configuration is invalid;
+    the view then answers with its usual error, which is not cached.
+    """
+    canonical_query = canonical_query or plan_query(catalog)
+
+    def decorator(view):
+        conditional_view = catalog_condition(catalog)(view)
+
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            if request.method != 'GET':
+                return view(request, *args, **kwargs)
+            try:
+                query = urlencode(canonical_query(request.GET))
+            except Exception:
+                return view(request, *args, **kwargs)
+
+            if query != request.META.get('QUERY_STRING', ''):
+                response = HttpResponseRedirect(f'{request.path}?{query}')
+            else:
+                response = conditional_view(request, *args, **kwargs)
+                if response.status_code not in (200, 304):
+                    return response
+            patch_cache_control(response, public=True, max_age=_max_age())
+            return response
+        return wrapper
+    return decorator
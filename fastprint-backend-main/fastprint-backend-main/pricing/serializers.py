@@ -1,5 +1,8 @@
 from rest_framework import serializers
 from .models import *
+from .compare import COLORS
+from .engine import QuoteError
+from .price_lists import validate_quote_config
 
 class OptionSerializer(serializers.ModelSerializer):
     class Meta:
@@ -11,4 +14,29 @@ def get_option_serializer(model_class):
         class Meta:
             model = model_class
             fields = [f.name for f in model_class._meta.fields if f.name in ['id', 'name', 'price']]
-    return OptionSerializer
\ No newline at end of file
+    return OptionSerializer
+
+
+class PinnedQuoteMixin:
+    """
+    For serializers of models with ``quote_config`` and ``price_list`` fields:
+    pins the catalog's current price list whenever the configuration is set.
+    """
+
+    def validate(self, attrs):
+        attrs = super().validate(attrs)
+        if 'quote_config' in attrs:
+            attrs['price_list'] = None
+            if attrs['quote_config'] is not None:
+                try:
+                    attrs['price_list'] = validate_quote_config(attrs['quote_config'])
+                except QuoteError as e:
+                    raise serializers.ValidationError({'quote_config': str(e)})
+        return attrs
+
+
+class QuoteComparisonSerializer(serializers.Serializer):
+    page_count = serializers.IntegerField(min_value=1)
+    quantity = serializers.IntegerField(min_value=1)
+    trim_size = serializers.CharField(required=False, allow_blank=True)
+    color = serializers.ChoiceField(choices=COLORS, required=False)
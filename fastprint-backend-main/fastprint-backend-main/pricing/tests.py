@@ -1,3 +1,269 @@
-from django.test import TestCase
+import io
+import zipfile
+from decimal import Decimal
 
-# Create your tests here.
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+
+from .catalog import bump_catalog_version, get_catalog_version
+from .golden import (
+    CALCULATORS, INTENDED_CHANGES, SEED_COMMANDS, change_reason, expected_response, load_corpus, option_ids,
+    post_quote, resolve_entry, seed_thesis_catalog,
+)
+from .models import CatalogChange, PriceList
+from .price_lists import pin_price_list
+from .price_sheet import PriceSheetError, import_price_sheet, price_table, read_price_sheet
+from .quote_cache import QuoteCache, get_quote_cache
+
+
+# Price from the catalog tables only, never from a grid file left on disk
+@override_settings(PRICE_GRID_PATH='/nonexistent/printbook_price_grid.bin')
+class GoldenQuoteTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        for command in SEED_COMMANDS:
+            call_command(command, stdout=open('/dev/null', 'w'))
+        seed_thesis_catalog()
+
+    def setUp(self):
+        # Catalog versions are cached, and a previous test may have left
+        # versions (and snapshots built at them) of other catalog rows
+        cache.clear()
+        for catalog, _ in CALCULATORS.values():
+            get_quote_cache(catalog).clear()
+        self.corpus = load_corpus()
+        self.option_ids = option_ids()
+
+    def test_corpus_covers_every_calculator(self):
+        self.assertEqual({entry['calculator'] for entry in self.corpus}, set(CALCULATORS))
+
+    def test_thesis_options_by_id(self):
+        self.assertTrue(any(entry['calculator'] == 'pricing' and entry['options'] for entry in self.corpus))
+
+    def test_golden_quotes(self):
+        for i, entry in enumerate(self.corpus):
+            payload = resolve_entry(entry, self.option_ids[entry['calculator']])
+            with self.subTest(i=i, calculator=entry['calculator'], payload=payload):
+                status, response = post_quote(CALCULATORS[entry['calculator']][1], payload)
+                self.assertEqual((status, response), expected_response(entry))
+
+    def test_differences_from_the_baseline_are_intended(self):
+        for i, entry in enumerate(self.corpus):
+            if 'change' not in entry:
+                continue
+            with self.subTest(i=i, calculator=entry['calculator']):
+                self.assertIn(entry['change']['reason'], INTENDED_CHANGES)
+                reason = change_reason(entry, (entry['status'], entry['response']), expected_response(entry))
+                self.assertEqual(reason, entry['change']['reason'])
+
+    def test_warm_quotes_run_no_queries(self):
+        for calculator, (_, url) in CALCULATORS.items():
+            entry = next(
+                entry for entry in self.corpus
+                if entry['calculator'] == calculator and expected_response(entry)[0] == 200
+            )
+            payload = resolve_entry(entry, self.option_ids[calculator])
+            post_quote(url, payload)
+            with self.subTest(calculator=calculator), self.assertNumQueries(0):
+                post_quote(url, dict(payload, quantity=payload['quantity'] + 1))
+
+
+def _xlsx(rows):
+    """Minimal workbook with text cells inline and numbers as raw ``<v>`` text, as Excel writes them."""
+    cells = []
+    for r, row in enumerate(rows, start=1):
+        xml = ''.join(
+            f'<c r="{chr(65 + c)}{r}"><v>{value}</v></c>' if value[:1].isdigit()
+            else f'<c r="{chr(65 + c)}{r}" t="inlineStr"><is><t>{value}</t></is></c>'
+            for c, value in enumerate(row)
+        )
+        cells.append(f'<row r="{r}">{xml}</row>')
+    sheet = (
+        '<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+        f'<sheetData>{"".join(cells)}</sheetData></worksheet>'
+    )
+    content = io.BytesIO()
+    with zipfile.ZipFile(content, 'w') as archive:
+        archive.writestr('xl/worksheets/sheet1.xml', sheet)
+    return content.getvalue()
+
+
+class PriceSheetImportTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        for command in ('seed_data', 'seed', 'seed_magazine_data'):
+            call_command(command, stdout=open('/dev/null', 'w'))
+
+    def setUp(self):
+        cache.clear()
+
+    def row(self, catalog, table, index=0):
+        """An existing option row of ``catalog/table``: ``(model, price field, instance)``."""
+        model, field_name = price_table(catalog, table)
+        return model, field_name, model.objects.order_by('id')[index]
+
+    def sheet(self, *rows):
+        lines = ['catalog,table,id,price'] + [','.join(str(value) for value in row) for row in rows]
+        return read_price_sheet('\n'.join(lines).encode(), 'prices.csv')
+
+    def versions(self):
+        return {catalog: get_catalog_version(catalog) for catalog in ('printbook', 'comicbook', 'magazine')}
+
+    def test_bad_row_rejects_the_whole_sheet(self):
+        model, field_name, binding = self.row('printbook', 'binding-type')
+        before = getattr(binding, field_name)
+        versions = self.versions()
+        rows = self.sheet(
+            ('printbook', 'binding-type', binding.pk, '99.00'),
+            ('printbook', 'cover-finish', 999999, '1.00'),
+            ('printbook', 'paper-type', binding.pk, 'abc'),
+        )
+        with self.assertRaises(PriceSheetError) as raised:
+            import_price_sheet(rows)
+        self.assertEqual(len(raised.exception.errors), 1)
+        self.assertIn("Row 4: 'abc' is not a number.", raised.exception.errors)
+
+        # Rows that only fail against the database reject the sheet as well
+        with self.assertRaises(PriceSheetError) as raised:
+            import_price_sheet(rows[:2])
+        self.assertEqual(raised.exception.errors, ['Row 3: printbook/cover-finish id 999999 does not exist.'])
+
+        binding.refresh_from_db()
+        self.assertEqual(getattr(binding, field_name), before)
+        self.assertEqual(self.versions(), versions)
+        self.assertFalse(CatalogChange.objects.filter(version__isnull=True).exists())
+
+    def test_duplicate_ids(self):
+        _, _, binding = self.row('printbook', 'binding-type')
+        _, _, comic = self.row('comicbook', 'binding-type')
+        rows = self.sheet(
+            ('printbook', 'binding-type', binding.pk, '1.00'),
+            ('comicbook', 'binding-type', comic.pk, '1.00'),
+            ('printbook', 'binding-type', binding.pk, '2.00'),
+        )
+        with self.assertRaises(PriceSheetError) as raised:
+            import_price_sheet(rows)
+        self.assertEqual(
+            raised.exception.errors, [f'Row 4: printbook/binding-type id {binding.pk} appears more than once.']
+        )
+
+    def test_xlsx_float_prices_are_rounded(self):
+        model, field_name, binding = self.row('printbook', 'binding-type')
+        _, paper_field, paper = self.row('printbook', 'paper-type')
+        content = _xlsx([
+            ['catalog', 'table', 'id', 'price'],
+            ['printbook', 'binding-type', str(binding.pk), '6.1799999999999997'],
+            ['printbook', 'paper-type', str(paper.pk), '1.2300000000000001E-2'],
+        ])
+        result = import_price_sheet(read_price_sheet(content, 'prices.xlsx'))
+
+        self.assertEqual({change['new'] for change in result['changes']}, {'6.18', '0.0123'})
+        binding.refresh_from_db()
+        paper.refresh_from_db()
+        self.assertEqual(getattr(binding, field_name), Decimal('6.18'))
+        self.assertEqual(getattr(paper, paper_field), Decimal('0.0123'))
+
+        # Digits beyond the field's precision that are not float noise are refused
+        content = _xlsx([['catalog', 'table', 'id', 'price'], ['printbook', 'binding-type', str(binding.pk), '6.185']])
+        with self.assertRaises(PriceSheetError):
+            import_price_sheet(read_price_sheet(content, 'prices.xlsx'))
+
+    def test_dry_run_writes_nothing(self):
+        model, field_name, binding = self.row('printbook', 'binding-type')
+        before = getattr(binding, field_name)
+        versions = self.versions()
+        changes = CatalogChange.objects.count()
+
+        result = import_price_sheet(self.sheet(('printbook', 'binding-type', binding.pk, '77.00')), dry_run=True)
+
+        self.assertFalse(result['applied'])
+        self.assertEqual([(c['id'], c['old'], c['new']) for c in result['changes']], [(binding.pk, str(before), '77.00')])
+        binding.refresh_from_db()
+        self.assertEqual(getattr(binding, field_name), before)
+        self.assertEqual(self.versions(), versions)
+        self.assertEqual(CatalogChange.objects.count(), changes)
+
+    def test_each_touched_catalog_is_bumped_once(self):
+        versions = self.versions()
+        rows = []
+        for catalog, table in (
+            ('printbook', 'binding-type'), ('printbook', 'cover-finish'), ('printbook', 'paper-type'),
+            ('comicbook', 'binding-type'), ('comicbook', 'interior-color'),
+        ):
+            for index in (0, 1):
+                _, field_name, instance = self.row(catalog, table, index)
+                rows.append((catalog, table, instance.pk, getattr(instance, field_name) + Decimal('0.01')))
+        # An unchanged row still counts as unchanged, not as a bump of its catalog
+        _, field_name, magazine = self.row('magazine', 'binding-type')
+        rows.append(('magazine', 'binding-type', magazine.pk, getattr(magazine, field_name)))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            result = import_price_sheet(self.sheet(*rows))
+
+        self.assertTrue(result['applied'])
+        self.assertEqual(len(result['changes']), 10)
+        self.assertEqual(result['unchanged'], 1)
+        self.assertEqual(result['catalog_versions'], {
+            'comicbook': versions['comicbook'] + 1,
+            'printbook': versions['printbook'] + 1,
+        })
+        self.assertEqual(self.versions(), dict(versions, printbook=versions['printbook'] + 1, comicbook=versions['comicbook'] + 1))
+
+
+class PriceListPinTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        call_command('seed_data', stdout=open('/dev/null', 'w'))
+
+    def setUp(self):
+        cache.clear()
+
+    def test_pin_between_save_and_bump_keeps_the_published_prices(self):
+        price_list = pin_price_list('printbook')
+        self.assertEqual(price_list.version, get_catalog_version('printbook'))
+        model, field_name = price_table('printbook', 'binding-type')
+        binding = model.objects.order_by('id').first()
+        published = price_list.prices['binding-type'][str(binding.pk)]['price']
+
+        # An update view saves the row before it bumps the version
+        setattr(binding, field_name, Decimal('55.55'))
+        binding.save()
+        pinned = pin_price_list('printbook')
+        self.assertEqual(pinned.pk, price_list.pk)
+        self.assertEqual(pinned.prices['binding-type'][str(binding.pk)]['price'], published)
+
+        version = bump_catalog_version('printbook')
+        pinned = pin_price_list('printbook')
+        self.assertEqual(pinned.version, version)
+        self.assertEqual(pinned.prices['binding-type'][str(binding.pk)]['price'], '55.55')
+
+    def test_version_is_published_when_the_bump_commits(self):
+        version = get_catalog_version('printbook')
+        with self.captureOnCommitCallbacks() as callbacks:
+            bump_catalog_version('printbook')
+            # Still the committed version for every reader of the cache
+            self.assertEqual(get_catalog_version('printbook'), version)
+        for callback in callbacks:
+            callback()
+        self.assertEqual(get_catalog_version('printbook'), version + 1)
+
+    def test_catalog_without_a_frozen_list_is_published_on_pin(self):
+        PriceList.objects.filter(catalog='comicbook').delete()
+        version = get_catalog_version('comicbook')
+        price_list = pin_price_list('comicbook')
+        self.assertEqual(price_list.version, version + 1)
+        self.assertEqual(pin_price_list('comicbook').pk, price_list.pk)
+
+
+class QuoteCacheTests(TestCase):
+
+    def test_quotes_are_keyed_by_the_version_they_were_priced_at(self):
+        quote_cache = QuoteCache('magazine')
+        self.assertEqual(quote_cache.get_or_compute(3, 'config', lambda: 'v3 price'), 'v3 price')
+        # A bump after the plan was read does not file the old price under the new version
+        self.assertEqual(quote_cache.get_or_compute(4, 'config', lambda: 'v4 price'), 'v4 price')
+        self.assertEqual(quote_cache.get_or_compute(3, 'config', lambda: 'recomputed'), 'v3 price')
@@ -2,6 +2,17 @@ from django.urls import path
 from .views import (
     DropdownOptionsView,
     PricingCalculationView,
+    QuoteComparisonView,
+    CatalogChangesView,
+    PricingBundleView,
+    BootstrapView,
+    ProductListView,
+    ProductDetailView,
+    ProductOptionUpdateView,
+    QuantityCurveView,
+    QuoteCacheStatsView,
+    PriceSheetImportView,
+    PriceSheetExportView,
     BindingTypeUpdateView,
     SpineTypeUpdateView,
     ExteriorColorUpdateView,
@@ -15,6 +26,17 @@ from .views import (
 urlpatterns = [
     path('options/', DropdownOptionsView.as_view(), name='pricing-options'),
     path('calculate/', PricingCalculationView.as_view(), name='pricing-calculate'),
+    path('compare/', QuoteComparisonView.as_view(), name='pricing-compare'),
+    path('quantity-curve/<str:catalog>/', QuantityCurveView.as_view(), name='pricing-quantity-curve'),
+    path('bootstrap/', BootstrapView.as_view(), name='pricing-bootstrap'),
+    path('bundle/<str:catalog>/', PricingBundleView.as_view(), name='pricing-bundle'),
+    path('products/', ProductListView.as_view(), name='product-list'),
+    path('products/<str:catalog>/', ProductDetailView.as_view(), name='product-detail'),
+    path('products/<str:catalog>/<str:group>/<int:pk>/', ProductOptionUpdateView.as_view(), name='product-option-update'),
+    path('changes/<str:catalog>/', CatalogChangesView.as_view(), name='pricing-catalog-changes'),
+    path('quote-cache/', QuoteCacheStatsView.as_view(), name='pricing-quote-cache'),
+    path('price-sheet/import/', PriceSheetImportView.as_view(), name='price-sheet-import'),
+    path('price-sheet/export/<str:file_type>/', PriceSheetExportView.as_view(), name='price-sheet-export'),
 
     # Update endpoints for ThesisEditSettings.jsx
     path('binding-type/<int:pk>/update/', BindingTypeUpdateView.as_view(), name='binding-type-update'),
@@ -1,47 +1,356 @@
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
-from rest_framework.permissions import AllowAny
+from rest_framework.permissions import AllowAny, IsAdminUser
+from rest_framework.parsers import MultiPartParser, FormParser
+from django.apps import apps
+from django.core.exceptions import ValidationError
+from django.http import HttpResponse
 from django.shortcuts import get_object_or_404
+from django.utils.cache import patch_cache_control, patch_vary_headers
+from django.utils.decorators import method_decorator
+from django.views.decorators.http import condition
 
 from .models import *
 from .pricing_engine import calculate_book_price
-from .serializers import get_option_serializer
+from .engine import FORMULAS, QuoteError, get_price_plan
+from .bundle import get_pricing_bundle
+from .bootstrap import accepts_gzip, bootstrap_condition_etag, bootstrap_etag, get_bootstrap
+from .money import to_decimal
+from .serializers import QuoteComparisonSerializer, get_option_serializer
+from .catalog import bump_catalog_version, catalog_condition, get_catalog_version
+from .changes import catalog_changes
+from .products import PRODUCT_NAMES, get_product, get_product_list, product_groups
+from .compare import compare_products
+from .quote_cache import quote_cache_stats
+from .quote_urls import cacheable_quote, quote_payload
+from .price_sheet import (
+    PriceSheetError,
+    import_price_sheet,
+    price_sheet_rows,
+    read_price_sheet,
+    write_price_sheet_csv,
+    write_price_sheet_xlsx,
+)
+
+CATALOG = 'pricing'
 
 
 # -----------------------
 # Dropdown Options View
 # -----------------------
+def dropdown_data():
+    return {
+        "binding_types": get_option_serializer(BindingType)(BindingType.objects.all(), many=True).data,
+        "spine_types": get_option_serializer(SpineType)(SpineType.objects.all(), many=True).data,
+        "exterior_colors": get_option_serializer(ExteriorColor)(ExteriorColor.objects.all(), many=True).data,
+        "foil_stampings": get_option_serializer(FoilStamping)(FoilStamping.objects.all(), many=True).data,
+        "screen_stampings": get_option_serializer(ScreenStamping)(ScreenStamping.objects.all(), many=True).data,
+        "corner_protectors": get_option_serializer(CornerProtector)(CornerProtector.objects.all(), many=True).data,
+        "interior_colors": get_option_serializer(InteriorColor)(InteriorColor.objects.all(), many=True).data,
+        "paper_types": get_option_serializer(PaperType)(PaperType.objects.all(), many=True).data
+    }
+
+
+@method_decorator(catalog_condition(CATALOG), name='get')
 class DropdownOptionsView(APIView):
     permission_classes = [AllowAny]
 
     def get(self, request):
-        return Response({
-            "binding_types": get_option_serializer(BindingType)(BindingType.objects.all(), many=True).data,
-            "spine_types": get_option_serializer(SpineType)(SpineType.objects.all(), many=True).data,
-            "exterior_colors": get_option_serializer(ExteriorColor)(ExteriorColor.objects.all(), many=True).data,
-            "foil_stampings": get_option_serializer(FoilStamping)(FoilStamping.objects.all(), many=True).data,
-            "screen_stampings": get_option_serializer(ScreenStamping)(ScreenStamping.objects.all(), many=True).data,
-            "corner_protectors": get_option_serializer(CornerProtector)(CornerProtector.objects.all(), many=True).data,
-            "interior_colors": get_option_serializer(InteriorColor)(InteriorColor.objects.all(), many=True).data,
-            "paper_types": get_option_serializer(PaperType)(PaperType.objects.all(), many=True).data
-        })
+        return Response(dropdown_data())
 
 
 # -----------------------
 # Pricing Calculation View
 # -----------------------
+@method_decorator(cacheable_quote(CATALOG), name='get')
 class PricingCalculationView(APIView):
+    # GET takes options by id only; the legacy literal prices are POST-only
     permission_classes = [AllowAny]
 
+    def get(self, request):
+        return self.post(request)
+
     def post(self, request):
         try:
-            result = calculate_book_price(request.data)
+            result = calculate_book_price(quote_payload(request))
             return Response(result)
         except Exception as e:
             return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
 
+# -----------------------
+# Quote Comparison View
+# -----------------------
+class QuoteComparisonView(APIView):
+    """
+    POST: Cheapest quote of every product line for one manuscript spec
+    (``page_count``, ``quantity``, optional ``trim_size`` and ``color``),
+    see compare.py.
+    """
+    permission_classes = [AllowAny]
+
+    def post(self, request):
+        serializer = QuoteComparisonSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        quotes = []
+        for catalog, result, reason in compare_products(serializer.validated_data):
+            entry = {"product": catalog, "name": PRODUCT_NAMES[catalog], "available": result is not None}
+            if result is None:
+                entry["reason"] = reason
+            else:
+                quote, configuration, options = result
+                entry.update({
+                    "configuration": configuration,
+                    "options": options,
+                    "cost_per_book": to_decimal(quote.cost_per_book),
+                    "total_cost": to_decimal(quote.total_cost),
+                    "discount": to_decimal(quote.discount),
+                    "final_price": to_decimal(quote.final_price),
+                })
+            quotes.append(entry)
+        available = [entry for entry in quotes if entry["available"]]
+        return Response({
+            "quotes": quotes,
+            "cheapest": min(available, key=lambda entry: entry["final_price"])["product"] if available else None,
+        })
+
+
+# -----------------------
+# Quantity Curve View
+# -----------------------
+MAX_CURVE_QUANTITY = 1000
+
+
+@method_decorator(catalog_condition(), name='get')
+class QuantityCurveView(APIView):
+    """
+    GET: Total cost of one configuration for every quantity from 1 to
+    ``max_quantity``, with the catalog's price breaks. Options are passed as
+    query parameters, the same as the catalog's calculate payload.
+    """
+    permission_classes = [AllowAny]
+
+    def get(self, request, catalog):
+        if catalog not in FORMULAS:
+            return Response({"error": f"Unknown catalog '{catalog}'."}, status=status.HTTP_404_NOT_FOUND)
+        try:
+            max_quantity = int(request.GET.get('max_quantity', 250))
+        except ValueError:
+            return Response({"error": "max_quantity must be a number."}, status=status.HTTP_400_BAD_REQUEST)
+        if not 1 <= max_quantity <= MAX_CURVE_QUANTITY:
+            return Response(
+                {"error": f"max_quantity must be between 1 and {MAX_CURVE_QUANTITY}."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        plan = get_price_plan(catalog)
+        try:
+            curve = plan.quantity_curve(request.GET.dict(), max_quantity)
+        except QuoteError as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        return Response({
+            "catalog": catalog,
+            "cost_per_book": to_decimal(curve[0].cost_per_book),
+            "price_breaks": [
+                {"min_quantity": min_quantity, "percent": to_decimal(rate)}
+                for min_quantity, rate in plan.discount_tiers
+            ],
+            "points": [
+                {
+                    "quantity": quantity,
+                    "total_cost": to_decimal(quote.total_cost),
+                    "discount": to_decimal(quote.discount),
+                    "final_price": to_decimal(quote.final_price),
+                }
+                for quantity, quote in enumerate(curve, start=1)
+            ],
+        })
+
+
+# -----------------------
+# Pricing Bundle View
+# -----------------------
+@method_decorator(catalog_condition(), name='get')
+class PricingBundleView(APIView):
+    """
+    GET: Option prices, eligibility intervals and discount tiers of a catalog,
+    for computing live quotes in the browser (see bundle.py). Clients
+    revalidate with the ETag and get a 304 until the catalog changes.
+    """
+    permission_classes = [AllowAny]
+
+    def get(self, request, catalog):
+        if catalog not in FORMULAS:
+            return Response({"error": f"Unknown catalog '{catalog}'."}, status=status.HTTP_404_NOT_FOUND)
+        response = HttpResponse(get_pricing_bundle(catalog), content_type='application/json')
+        patch_cache_control(response, public=True, no_cache=True)
+        return response
+
+
+# -----------------------
+# Bootstrap View
+# -----------------------
+@method_decorator(condition(etag_func=bootstrap_condition_etag), name='get')
+class BootstrapView(APIView):
+    """
+    GET: Dropdowns of every catalog and the enabled payment methods, with
+    their versions (see bootstrap.py). Served gzip-compressed to clients
+    that accept it.
+    """
+    permission_classes = [AllowAny]
+
+    def get(self, request):
+        bootstrap = get_bootstrap()
+        gzipped = accepts_gzip(request)
+        response = HttpResponse(
+            bootstrap.gzip_content if gzipped else bootstrap.content, content_type='application/json'
+        )
+        if gzipped:
+            response['Content-Encoding'] = 'gzip'
+        response['ETag'] = bootstrap_etag(bootstrap.versions, gzipped)
+        patch_cache_control(response, public=True, no_cache=True)
+        patch_vary_headers(response, ('Accept-Encoding',))
+        return response
+
+
+# -----------------------
+# Generic Product Views
+# -----------------------
+class ProductListView(APIView):
+    """GET: Every product line with its catalog version."""
+    permission_classes = [AllowAny]
+
+    def get(self, request):
+        return Response(get_product_list())
+
+
+@method_decorator(catalog_condition(), name='get')
+class ProductDetailView(APIView):
+    """GET: Option groups and options of one product (see products.py)."""
+    permission_classes = [AllowAny]
+
+    def get(self, request, catalog):
+        if catalog not in FORMULAS:
+            return Response({"error": f"Unknown product '{catalog}'."}, status=status.HTTP_404_NOT_FOUND)
+        return Response(get_product(catalog))
+
+
+class ProductOptionUpdateView(APIView):
+    """
+    PUT: Update the name, price or page range of an option of any product,
+    e.g. ``products/magazine/binding-type/3/`` with ``{"price": "7.00"}``.
+    """
+    permission_classes = [IsAdminUser]
+
+    def put(self, request, catalog, group, pk):
+        groups = {slug: (label, price_field) for slug, label, price_field in product_groups(catalog)} if catalog in FORMULAS else {}
+        if group not in groups:
+            return Response({"error": f"Unknown option group '{catalog}/{group}'."}, status=status.HTTP_404_NOT_FOUND)
+        label, price_field = groups[group]
+        model_class = apps.get_model(label)
+        instance = get_object_or_404(model_class, pk=pk)
+
+        columns = {field.attname for field in model_class._meta.concrete_fields}
+        fields = {name: name for name in ('name', 'min_pages', 'max_pages') if name in columns}
+        if price_field:
+            fields['price'] = price_field
+        for name, field in fields.items():
+            if name in request.data:
+                setattr(instance, field, request.data[name])
+        try:
+            instance.full_clean()
+        except ValidationError as e:
+            return Response({"errors": e.message_dict}, status=status.HTTP_400_BAD_REQUEST)
+        instance.save()
+        bump_catalog_version(catalog)
+        return Response({"message": f"{model_class.__name__} updated successfully"})
+
+
+# -----------------------
+# Catalog Changes View
+# -----------------------
+@method_decorator(catalog_condition(), name='get')
+class CatalogChangesView(APIView):
+    """
+    GET ?since=<version>: Option rows of a catalog written after ``version``.
+    ``full_reload`` is true when the changes are not known row by row (the
+    catalog was reseeded, or ``since`` is ahead of the server); the client
+    should then refetch the catalog's dropdowns.
+    """
+    permission_classes = [AllowAny]
+
+    def get(self, request, catalog):
+        if catalog not in FORMULAS:
+            return Response({"error": f"Unknown catalog '{catalog}'."}, status=status.HTTP_404_NOT_FOUND)
+        try:
+            since = int(request.GET['since'])
+        except (KeyError, ValueError):
+            return Response({"error": "since must be a catalog version."}, status=status.HTTP_400_BAD_REQUEST)
+
+        version = get_catalog_version(catalog)
+        changes = catalog_changes(catalog, since, version)
+        return Response({
+            "catalog": catalog,
+            "since": since,
+            "version": version,
+            "full_reload": changes is None,
+            "changes": changes or {},
+        })
+
+
+# -----------------------
+# Quote Cache Stats View
+# -----------------------
+class QuoteCacheStatsView(APIView):
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        # Counters are per worker process
+        return Response(quote_cache_stats())
+
+
+# -----------------------
+# Price Sheet Import / Export Views
+# -----------------------
+class PriceSheetImportView(APIView):
+    permission_classes = [IsAdminUser]
+    parser_classes = [MultiPartParser, FormParser]
+
+    def post(self, request):
+        upload = request.FILES.get('file')
+        if upload is None:
+            return Response({"error": "A CSV or XLSX file is required."}, status=status.HTTP_400_BAD_REQUEST)
+        dry_run = str(request.data.get('dry_run', '')).lower() in ('1', 'true', 'yes')
+
+        try:
+            rows = read_price_sheet(upload.read(), upload.name)
+            result = import_price_sheet(rows, dry_run=dry_run)
+        except PriceSheetError as e:
+            return Response({"errors": e.errors}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(result)
+
+
+class PriceSheetExportView(APIView):
+    permission_classes = [IsAdminUser]
+
+    def get(self, request, file_type):
+        rows = price_sheet_rows(request.GET.getlist('catalog'))
+        if file_type == 'csv':
+            response = HttpResponse(content_type='text/csv')
+            write_price_sheet_csv(rows, response)
+        elif file_type == 'xlsx':
+            response = HttpResponse(content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet')
+            write_price_sheet_xlsx(rows, response)
+        else:
+            return Response({"error": "file_type must be csv or xlsx."}, status=status.HTTP_400_BAD_REQUEST)
+        response['Content-Disposition'] = f'attachment; filename="price-sheet.{file_type}"'
+        return response
+
+
 # -----------------------
 # Reusable Update View
 # -----------------------
@@ -55,6 +364,7 @@ def create_update_view(model_class, field_names):
                 if field in request.data:
                     setattr(instance, field, request.data[field])
             instance.save()
+            bump_catalog_version(CATALOG)
             return Response({"message": f"{model_class.__name__} updated successfully"})
     return UpdateView
 
@@ -1,8 +1,15 @@
 from django.contrib import admin
-from .models import TrimSize, BindingType, InteriorColor, PaperType, CoverFinish
+from .models import TrimSize, BindingType, InteriorColor, PaperType, CoverFinish, OptionAlias
+from .snapshot import CATALOG
+from pricing.admin import CatalogOptionAdmin, register_catalog_options
 
-admin.site.register(TrimSize)
-admin.site.register(BindingType)
-admin.site.register(InteriorColor)
-admin.site.register(PaperType)
-admin.site.register(CoverFinish)
+register_catalog_options(CATALOG, TrimSize, BindingType, InteriorColor, PaperType, CoverFinish)
+
+
+@admin.register(OptionAlias)
+class OptionAliasAdmin(CatalogOptionAdmin):
+    # Aliases are part of the calculator's in-memory resolver
+    catalog = CATALOG
+    list_display = ('kind', 'alias', 'slug')
+    list_filter = ('kind',)
+    search_fields = ('alias', 'slug')
@@ -4,3 +4,8 @@ from django.apps import AppConfig
 class PrintbookcalculatorConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'printbookcalculator'
+
+    def ready(self):
+        # Map the precomputed price grid up front so the first quote does not pay for it
+        from .price_grid import load_price_grid
+        load_price_grid()
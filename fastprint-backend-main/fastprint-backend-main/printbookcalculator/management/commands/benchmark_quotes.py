@@ -0,0 +1,61 @@
+import random
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIRequestFactory
+
+from printbookcalculator.snapshot import get_catalog
+from printbookcalculator.views import calculate_cost, calculate_cost_batch
+
+
+class Command(BaseCommand):
+    help = "Compares print book quote throughput of calculate/ (one per request) and calculate-batch/"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--count', type=int, default=200, help='Configurations to price (max 500 per batch)')
+        parser.add_argument('--seed', type=int, default=0)
+
+    def handle(self, *args, **options):
+        catalog = get_catalog()
+        rng = random.Random(options['seed'])
+        items = []
+        while len(items) < options['count']:
+            trim = rng.choice(catalog.trim_sizes)['id']
+            page_count = rng.randint(2, 470)
+            bindings = catalog.bindings_for(trim, page_count)
+            if not bindings:
+                continue
+            items.append({
+                'trim_size_id': trim,
+                'page_count': page_count,
+                'quantity': rng.randint(1, 500),
+                'binding_id': rng.choice(bindings)['name'],
+                'interior_color_id': rng.choice(catalog.interior_colors)['name'],
+                'paper_type_id': rng.choice(catalog.paper_types)['name'],
+                'cover_finish_id': rng.choice(catalog.cover_finishes)['name'],
+            })
+
+        factory = APIRequestFactory()
+
+        with CaptureQueriesContext(connection) as queries:
+            start = time.perf_counter()
+            for item in items:
+                calculate_cost(factory.post('/api/calculator/calculate/', item, format='json')).render()
+            single = time.perf_counter() - start
+        self.report('calculate/', len(items), single, len(queries))
+
+        with CaptureQueriesContext(connection) as queries:
+            start = time.perf_counter()
+            calculate_cost_batch(factory.post('/api/calculator/calculate-batch/', {'items': items}, format='json')).render()
+            batch = time.perf_counter() - start
+        self.report('calculate-batch/', len(items), batch, len(queries))
+
+        self.stdout.write(self.style.SUCCESS(f"Batch speed-up: {single / batch:.1f}x"))
+
+    def report(self, label, count, seconds, queries):
+        self.stdout.write(
+            f"{label:<18} {count} quotes in {seconds * 1000:8.1f} ms  "
+            f"{count / seconds:10.0f} quotes/s  {queries} queries"
+        )
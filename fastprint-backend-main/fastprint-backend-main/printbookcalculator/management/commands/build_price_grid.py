@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from printbookcalculator.price_grid import MAX_PAGES, MIN_PAGES, grid_path, write_price_grid
+from printbookcalculator.snapshot import get_catalog
+
+
+class Command(BaseCommand):
+    help = "Precomputes the print book price grid that calculator workers memory-map"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--path', help='Output file (defaults to settings.PRICE_GRID_PATH)')
+        parser.add_argument('--min-pages', type=int, default=MIN_PAGES)
+        parser.add_argument('--max-pages', type=int, default=MAX_PAGES)
+
+    def handle(self, *args, **options):
+        if not 0 <= options['min_pages'] <= options['max_pages']:
+            raise CommandError('Invalid page count range.')
+
+        catalog = get_catalog()
+        path = options['path'] or grid_path()
+        cells = write_price_grid(catalog, path, options['min_pages'], options['max_pages'])
+        self.stdout.write(self.style.SUCCESS(
+            f"✅ Wrote {cells} prices for catalog version {catalog.version} to {path}"
+        ))
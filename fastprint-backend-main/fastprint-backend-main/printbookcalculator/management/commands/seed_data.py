@@ -1,5 +1,6 @@
 from django.core.management.base import BaseCommand
 from printbookcalculator.models import *
+from pricing.catalog import bump_catalog_version
 
 class Command(BaseCommand):
     def handle(self, *args, **kwargs):
@@ -161,4 +162,6 @@ class Command(BaseCommand):
                     max_pages=max_pages
                 )
 
+        bump_catalog_version('printbook', reset=True)
+
         self.stdout.write(self.style.SUCCESS("✅ All trim sizes and binding types seeded as per calculation table!"))
\ No newline at end of file
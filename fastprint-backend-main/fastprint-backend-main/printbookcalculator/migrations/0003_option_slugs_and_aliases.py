@@ -0,0 +1,77 @@
+# Generated by Django 4.1 on 2026-10-18 11:21
+
+from django.db import migrations, models
+from django.utils.text import slugify
+
+
+# Spellings previously translated by the name mapping dicts in views.calculate_cost
+ALIASES = [
+    ('interior_color', 'Standard Black and White', 'Standard Black & White'),
+    ('interior_color', 'Premium Black and White', 'Premium Black & White'),
+    ('paper_type', '60# Cream Uncoated', '60# Cream-Uncoated'),
+    ('paper_type', '60# White Uncoated', '60# White-Uncoated'),
+    ('paper_type', '80# White Coated', '80# White-Coated'),
+    ('paper_type', '100# White Coated', '100# White-Coated'),
+    ('cover_finish', 'Glossy', 'Gloss'),
+]
+
+
+def set_slugs_and_aliases(apps, schema_editor):
+    for model_name in ('TrimSize', 'BindingType', 'InteriorColor', 'PaperType', 'CoverFinish'):
+        model = apps.get_model('printbookcalculator', model_name)
+        for option in model.objects.all():
+            option.slug = slugify(option.name)
+            option.save(update_fields=['slug'])
+
+    OptionAlias = apps.get_model('printbookcalculator', 'OptionAlias')
+    for kind, alias, name in ALIASES:
+        OptionAlias.objects.get_or_create(kind=kind, alias=' '.join(alias.split()).casefold(), defaults={'slug': slugify(name)})
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('printbookcalculator', '0002_bindingtype_max_pages_bindingtype_min_pages'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='bindingtype',
+            name='slug',
+            field=models.SlugField(blank=True, max_length=100),
+        ),
+        migrations.AddField(
+            model_name='coverfinish',
+            name='slug',
+            field=models.SlugField(blank=True, max_length=100),
+        ),
+        migrations.AddField(
+            model_name='interiorcolor',
+            name='slug',
+            field=models.SlugField(blank=True, max_length=100),
+        ),
+        migrations.AddField(
+            model_name='papertype',
+            name='slug',
+            field=models.SlugField(blank=True, max_length=100),
+        ),
+        migrations.AddField(
+            model_name='trimsize',
+            name='slug',
+            field=models.SlugField(blank=True, max_length=100),
+        ),
+        migrations.CreateModel(
+            name='OptionAlias',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('trim_size', 'Trim size'), ('binding_type', 'Binding type'), ('interior_color', 'Interior color'), ('paper_type', 'Paper type'), ('cover_finish', 'Cover finish')], max_length=20)),
+                ('alias', models.CharField(max_length=100)),
+                ('slug', models.SlugField(max_length=100)),
+            ],
+            options={
+                'verbose_name_plural': 'Option aliases',
+                'unique_together': {('kind', 'alias')},
+            },
+        ),
+        migrations.RunPython(set_slugs_and_aliases, migrations.RunPython.noop),
+    ]
@@ -1,7 +1,27 @@
 from django.db import models
+from django.utils.text import slugify
 
 
-class TrimSize(models.Model):
+def normalize_option_name(value):
+    """Case- and whitespace-insensitive form of an option name or alias."""
+    return ' '.join(str(value).split()).casefold()
+
+
+class SlugOption(models.Model):
+    # Stable, indexed key the calculator resolves names and IDs to; derived
+    # from the name unless set explicitly.
+    slug = models.SlugField(max_length=100, blank=True)
+
+    class Meta:
+        abstract = True
+
+    def save(self, *args, **kwargs):
+        if not self.slug:
+            self.slug = slugify(self.name)
+        super().save(*args, **kwargs)
+
+
+class TrimSize(SlugOption):
     name = models.CharField(max_length=100)  # e.g. A5, US Letter
     # e.g. 5 x 8 in / 127 x 203 mm
     dimensions = models.CharField(max_length=100)
@@ -10,7 +30,7 @@ class TrimSize(models.Model):
         return self.name
 
 
-class BindingType(models.Model):
+class BindingType(SlugOption):
     # Perfect Bound, Saddle Stitch, etc.
     name = models.CharField(max_length=100)
     trim_size = models.ForeignKey(TrimSize, on_delete=models.CASCADE)
@@ -22,7 +42,7 @@ class BindingType(models.Model):
         return f"{self.name} - {self.trim_size.name}"
 
 
-class InteriorColor(models.Model):
+class InteriorColor(SlugOption):
     # Standard B&W, Premium Color, etc.
     name = models.CharField(max_length=100)
     price_per_page = models.DecimalField(max_digits=5, decimal_places=4)
@@ -31,7 +51,7 @@ class InteriorColor(models.Model):
         return self.name
 
 
-class PaperType(models.Model):
+class PaperType(SlugOption):
     # 60# Cream-Uncoated, 80# White-Coated
     name = models.CharField(max_length=100)
     price_per_page = models.DecimalField(max_digits=5, decimal_places=4)
@@ -40,9 +60,34 @@ class PaperType(models.Model):
         return self.name
 
 
-class CoverFinish(models.Model):
+class CoverFinish(SlugOption):
     name = models.CharField(max_length=100)  # Matte, Gloss
     price = models.DecimalField(max_digits=5, decimal_places=2)
 
     def __str__(self):
         return self.name
+
+
+class OptionAlias(models.Model):
+    # Alternative spellings accepted by the calculator, e.g. "Glossy" -> gloss
+    KIND_CHOICES = [
+        ('trim_size', 'Trim size'),
+        ('binding_type', 'Binding type'),
+        ('interior_color', 'Interior color'),
+        ('paper_type', 'Paper type'),
+        ('cover_finish', 'Cover finish'),
+    ]
+    kind = models.CharField(max_length=20, choices=KIND_CHOICES)
+    alias = models.CharField(max_length=100)
+    slug = models.SlugField(max_length=100)
+
+    class Meta:
+        unique_together = ('kind', 'alias')
+        verbose_name_plural = 'Option aliases'
+
+    def save(self, *args, **kwargs):
+        self.alias = normalize_option_name(self.alias)
+        super().save(*args, **kwargs)
+
+    def __str__(self):
+        return f"{self.alias} -> {self.slug}"
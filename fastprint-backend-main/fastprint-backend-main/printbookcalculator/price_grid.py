@@ -0,0 +1,193 @@
+"""
+Precomputed, memory-mapped print book price grid.
+
+``manage.py build_price_grid`` writes the per-book price of every trim size ×
+binding × interior color × paper × cover finish × page count combination to
+one binary file. Workers map it read-only, so the data lives once in the OS
+page cache and is shared by every gunicorn worker instead of being copied into
+each process, and a quote is a single array read.
+
+File layout (little-endian):
+
+    header  MAGIC, catalog version, min/max page count, length of the axes block
+    axes    JSON object of the option keys (trim IDs, option slugs) along each
+            axis, in grid order
+    cells   int32 per-book prices in PRICE_SCALE units, page count varying
+            fastest; INELIGIBLE where the binding does not cover the page count
+
+The grid is stamped with the catalog version it was built from. Once the
+catalog moves past it, quotes fall back to the in-memory snapshot until the
+command is run again; meanwhile a worker looks for a rebuilt file at most
+every GRID_RECHECK_SECONDS rather than on every quote.
+"""
+import json
+import os
+import mmap
+import struct
+import threading
+import time
+
+from django.conf import settings
+
+from .snapshot import binding_price_for
+
+MAGIC = b'FPGRID02'
+HEADER = struct.Struct('<8sQiiI')
+CELL = struct.Struct('<i')
+
+MIN_PAGES = 2
+MAX_PAGES = 800
+
+INELIGIBLE = -1
+
+# Seconds between looks for a rebuilt grid while the mapped one is missing or stale
+GRID_RECHECK_SECONDS = 5
+
+AXES = ('trim_sizes', 'bindings', 'interior_colors', 'paper_types', 'cover_finishes')
+
+
+def grid_path():
+    return settings.PRICE_GRID_PATH
+
+
+def _axes(catalog):
+    return {
+        'trim_sizes': [trim['id'] for trim in catalog.trim_sizes],
+        'bindings': list(dict.fromkeys(b['slug'] for b in catalog.binding_types)),
+        'interior_colors': list(catalog.interior_prices),
+        'paper_types': list(catalog.paper_prices),
+        'cover_finishes': list(catalog.cover_prices),
+    }
+
+
+def write_price_grid(catalog, path, min_pages=MIN_PAGES, max_pages=MAX_PAGES):
+    """
+    Write the grid of ``catalog`` to ``path`` and return the number of cells.
+    The file is written next to ``path`` and moved into place, so workers
+    never map a partially written grid.
+    """
+    axes = _axes(catalog)
+    pages = range(min_pages, max_pages + 1)
+    axes_block = json.dumps(axes, separators=(',', ':')).encode()
+    cells = 0
+
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    tmp_path = f'{path}.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, catalog.version, min_pages, max_pages, len(axes_block)))
+        f.write(axes_block)
+        for trim_size_id in axes['trim_sizes']:
+            for binding in axes['bindings']:
+                ranges = catalog.binding_prices.get((binding, trim_size_id), ())
+                binding_column = [binding_price_for(ranges, n) for n in pages]
+                for interior in axes['interior_colors']:
+                    for paper in axes['paper_types']:
+                        per_page = catalog.interior_prices[interior] + catalog.paper_prices[paper]
+                        for cover in axes['cover_finishes']:
+                            fixed = catalog.cover_prices[cover]
+                            row = [
+                                INELIGIBLE if price is None else price + fixed + per_page * n
+                                for price, n in zip(binding_column, pages)
+                            ]
+                            f.write(struct.pack(f'<{len(row)}i', *row))
+                            cells += len(row)
+    os.replace(tmp_path, path)
+    forget_grid_miss()
+    return cells
+
+
+class PriceGrid:
+    """Read-only view of a grid file written by ``write_price_grid``."""
+
+    def __init__(self, path):
+        with open(path, 'rb') as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self.version, self.min_pages, self.max_pages, axes_length = HEADER.unpack_from(self._mmap)
+        if magic != MAGIC:
+            raise ValueError(f'{path} is not a price grid file.')
+        axes = json.loads(self._mmap[HEADER.size:HEADER.size + axes_length])
+        self._positions = [
+            {key: i for i, key in enumerate(axes[name])} for name in AXES
+        ]
+        self._cells_offset = HEADER.size + axes_length
+        self._row_length = self.max_pages - self.min_pages + 1
+
+    def _row_offset(self, trim_size_id, binding, interior, paper, cover):
+        index = 0
+        for positions, key in zip(self._positions, (trim_size_id, binding, interior, paper, cover)):
+            position = positions.get(key)
+            if position is None:
+                return None
+            index = index * len(positions) + position
+        return self._cells_offset + index * self._row_length * CELL.size
+
+    def unit_price(self, trim_size_id, page_count, binding, interior, paper, cover):
+        """
+        Scaled per-book price of a resolved configuration (option slugs), or
+        None if the grid cannot answer for it.
+        """
+        if not self.min_pages <= page_count <= self.max_pages:
+            return None
+        offset = self._row_offset(trim_size_id, binding, interior, paper, cover)
+        if offset is None:
+            return None
+        price = CELL.unpack_from(self._mmap, offset + (page_count - self.min_pages) * CELL.size)[0]
+        return None if price == INELIGIBLE else price
+
+    def curve(self, trim_size_id, binding, interior, paper, cover):
+        """
+        Scaled per-book prices for every page count from ``min_pages`` to
+        ``max_pages`` (INELIGIBLE where the binding does not apply), or None
+        if an option is not on the grid.
+        """
+        offset = self._row_offset(trim_size_id, binding, interior, paper, cover)
+        if offset is None:
+            return None
+        return struct.unpack_from(f'<{self._row_length}i', self._mmap, offset)
+
+
+_lock = threading.Lock()
+_grid = None
+_grid_mtime = None
+# (catalog version, monotonic time) of the last lookup that found no grid for it
+_miss = (None, 0.0)
+
+
+def load_price_grid():
+    """(Re)map the grid file if it changed on disk; return the mapped grid or None."""
+    global _grid, _grid_mtime
+    path = grid_path()
+    try:
+        mtime = os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+    with _lock:
+        if mtime != _grid_mtime:
+            try:
+                _grid = PriceGrid(path)
+            except (OSError, ValueError, struct.error):
+                _grid = None
+            _grid_mtime = mtime
+        return _grid
+
+
+def forget_grid_miss():
+    """Look for the grid file on the next lookup; called after writing one in this process."""
+    global _miss
+    _miss = (None, 0.0)
+
+
+def get_price_grid(version):
+    """Return the mapped grid if it was built from catalog ``version``, else None."""
+    global _miss
+    grid = _grid
+    if grid is not None and grid.version == version:
+        return grid
+    miss_version, miss_time = _miss
+    if miss_version == version and time.monotonic() - miss_time < GRID_RECHECK_SECONDS:
+        return None
+    grid = load_price_grid()
+    if grid is None or grid.version != version:
+        _miss = (version, time.monotonic())
+        return None
+    return grid
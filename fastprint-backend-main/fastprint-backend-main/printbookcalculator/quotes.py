@@ -0,0 +1,173 @@
+"""
+Print book quotes priced against the in-memory catalog snapshot.
+
+Quote payloads are normalized into plain tuples, their options resolved to
+canonical keys (trim IDs and option slugs), and priced from integer price
+components (ten-thousandths of a dollar, see snapshot.PRICE_SCALE), so pricing
+one configuration or a few hundred never touches the database. Quoted amounts
+are integer cents: the per-book price rounded to the cent, times the quantity
+(see pricing.money).
+"""
+import heapq
+
+from pricing.money import units_to_cents
+
+from .price_grid import INELIGIBLE, get_price_grid
+from .snapshot import OptionNotFound, binding_price_for, get_catalog
+
+# Largest number of configurations accepted by one batch request
+MAX_BATCH_QUOTES = 500
+
+# Largest number of points returned by one price curve request
+MAX_CURVE_POINTS = 1000
+
+# Largest number of configurations returned by one cheapest search
+MAX_SEARCH_RESULTS = 100
+
+def parse_configuration(data):
+    """
+    Extract the option fields of a payload as a
+    ``(trim_size, binding, interior, paper, cover)`` tuple of strings. Each
+    option may be given by ID, slug, name or alias; see resolve_configuration.
+    """
+    return (
+        str(data['trim_size_id']),
+        str(data['binding_id']),
+        str(data['interior_color_id']),
+        str(data['paper_type_id']),
+        str(data['cover_finish_id']),
+    )
+
+
+# Fields of a calculate_cost payload, in the order of a parsed quote
+QUOTE_FIELDS = ('page_count', 'quantity', 'trim_size_id', 'binding_id', 'interior_color_id', 'paper_type_id', 'cover_finish_id')
+
+
+def parse_quote(data):
+    """
+    Normalize a calculate_cost payload into a
+    ``(page_count, quantity, trim_size, binding, interior, paper, cover)``
+    tuple. Raises KeyError or ValueError for missing or malformed fields.
+    """
+    page_count = int(data['page_count'])
+    quantity = int(data['quantity'])
+    return (page_count, quantity) + parse_configuration(data)
+
+
+def canonical_quote_query(data):
+    """
+    ``(field, value)`` pairs of the canonical GET query of a calculate_cost
+    payload, with its options resolved to canonical keys (see
+    pricing.quote_urls). Raises like parse_quote and resolve_quote.
+    """
+    quote = resolve_quote(get_catalog(), parse_quote(data))
+    return list(zip(QUOTE_FIELDS, quote))
+
+
+def resolve_quote(catalog, quote):
+    """Resolve the options of a parsed quote to canonical keys; raises OptionNotFound."""
+    page_count, quantity = quote[:2]
+    return (page_count, quantity) + catalog.resolve_configuration(*quote[2:])
+
+
+def quote_many(catalog, quotes):
+    """
+    Price resolved quotes one after another against the same catalog snapshot
+    (and price grid, while it matches the catalog version). Returns, per
+    quote, either a ``(cost_per_book, total_cost)`` pair of cents or the
+    OptionNotFound raised when its binding is not offered for that trim size
+    and page count.
+    """
+    grid = get_price_grid(catalog.version)
+    results = []
+    for page_count, quantity, trim_size_id, binding, interior, paper, cover in quotes:
+        unit = None
+        if grid is not None:
+            unit = grid.unit_price(trim_size_id, page_count, binding, interior, paper, cover)
+        if unit is None:
+            try:
+                binding_price, interior_price, paper_price, cover_price = catalog.price_components(
+                    trim_size_id, page_count, binding, interior, paper, cover
+                )
+            except OptionNotFound as e:
+                results.append(e)
+                continue
+            unit = binding_price + cover_price + (interior_price + paper_price) * page_count
+        unit = units_to_cents(unit)
+        results.append((unit, unit * quantity))
+    return results
+
+
+def quote_one(catalog, quote):
+    """Price a single resolved quote; raises OptionNotFound."""
+    result = quote_many(catalog, [quote])[0]
+    if isinstance(result, OptionNotFound):
+        raise result
+    return result
+
+
+def price_curve(catalog, configuration, page_counts):
+    """
+    Per-book cost in cents of a resolved configuration at each of
+    ``page_counts`` (a range), None where the binding does not cover the page count. Raises
+    OptionNotFound if the binding is not offered for the trim size.
+    """
+    binding_ranges, interior_price, paper_price, cover_price = catalog.option_prices(*configuration)
+
+    grid = get_price_grid(catalog.version)
+    curve = grid.curve(*configuration) if grid is not None else None
+    if curve is not None and grid.min_pages <= page_counts.start and page_counts[-1] <= grid.max_pages:
+        prices = [curve[n - grid.min_pages] for n in page_counts]
+        return [None if p == INELIGIBLE else units_to_cents(p) for p in prices]
+
+    costs = []
+    for n in page_counts:
+        binding_price = binding_price_for(binding_ranges, n)
+        if binding_price is None:
+            costs.append(None)
+        else:
+            costs.append(units_to_cents(binding_price + cover_price + (interior_price + paper_price) * n))
+    return costs
+
+
+def cheapest_configurations(catalog, page_count, limit, options=None, max_cost_per_book=None):
+    """
+    The ``limit`` cheapest resolved configurations for ``page_count`` pages,
+    as ``(unit_price, trim_size_id, binding, interior, paper, cover)`` tuples
+    in scaled prices. ``options`` maps a configuration field ("trim_size",
+    "binding_type", ...) to the set of canonical keys allowed for it;
+    ``max_cost_per_book`` is a scaled price cap.
+
+    The per-book price is a sum of independent terms (binding + cover +
+    per-page prices x pages), so the search prices the eligible bindings of
+    every trim once, the per-page and cover terms once, and combines those
+    columns; the whole option space is a few thousand additions.
+    """
+    options = options or {}
+
+    def allowed(kind, key):
+        return kind not in options or key in options[kind]
+
+    fixed = []
+    for (binding, trim_size_id), ranges in catalog.binding_prices.items():
+        if allowed('trim_size', trim_size_id) and allowed('binding_type', binding):
+            price = binding_price_for(ranges, page_count)
+            if price is not None:
+                fixed.append((price, trim_size_id, binding))
+
+    per_page = [
+        ((catalog.interior_prices[interior] + catalog.paper_prices[paper]) * page_count, interior, paper)
+        for interior in catalog.interior_prices if allowed('interior_color', interior)
+        for paper in catalog.paper_prices if allowed('paper_type', paper)
+    ]
+    covers = [(price, cover) for cover, price in catalog.cover_prices.items() if allowed('cover_finish', cover)]
+
+    candidates = (
+        (binding_price + pages_price + cover_price, trim_size_id, binding, interior, paper, cover)
+        for binding_price, trim_size_id, binding in fixed
+        for pages_price, interior, paper in per_page
+        for cover_price, cover in covers
+    )
+    if max_cost_per_book is not None:
+        candidates = (c for c in candidates if c[0] <= max_cost_per_book)
+    return heapq.nsmallest(limit, candidates)
@@ -0,0 +1,238 @@
+"""
+Immutable, process-local snapshot of the print book catalog.
+
+The calculator page is the most visited page on the site and its option lists
+only change when an admin edits a price, so every worker keeps the serialized
+catalog in memory and rebuilds it when the "printbook" catalog version moves.
+"""
+from dataclasses import dataclass
+from types import MappingProxyType
+
+from pricing.catalog import VersionedSnapshot
+from pricing.eligibility import BindingEligibilityIndex
+from pricing.money import UNITS_PER_DOLLAR, to_units
+
+from .models import TrimSize, BindingType, InteriorColor, PaperType, CoverFinish, OptionAlias, normalize_option_name
+from .serializers import (
+    TrimSizeSerializer,
+    BindingTypeSerializer,
+    InteriorColorSerializer,
+    PaperTypeSerializer,
+    CoverFinishSerializer,
+)
+
+CATALOG = 'printbook'
+
+# Prices are held as integer money units (ten-thousandths of a dollar, see
+# pricing.money); per-page prices have four decimal places.
+PRICE_SCALE = UNITS_PER_DOLLAR
+
+
+class OptionNotFound(LookupError):
+    """A quoted option name does not exist in the catalog (or not for that trim/page count)."""
+
+
+class OptionResolver:
+    """
+    Hashed lookup from an option ID, slug, name or alias to the option's
+    canonical key (the slug, or the ID for trim sizes). Names and aliases are
+    compared case- and whitespace-insensitively.
+    """
+
+    def __init__(self, rows, aliases=(), by_id=False):
+        canonical = {}
+        self._ids = {}
+        self._names = {}
+        for row in rows:
+            key = row['id'] if by_id else row['slug']
+            canonical.setdefault(row['slug'], key)
+            self._ids[row['id']] = key
+        for row in rows:
+            key = canonical[row['slug']]
+            self._names.setdefault(row['slug'], key)
+            self._names.setdefault(normalize_option_name(row['name']), key)
+        for alias, slug in aliases:
+            if slug in canonical:
+                self._names.setdefault(alias, canonical[slug])
+
+    def resolve(self, value):
+        """Canonical key for ``value``, or None if nothing matches."""
+        if isinstance(value, int) or (isinstance(value, str) and value.isdigit()):
+            key = self._ids.get(int(value))
+            if key is not None:
+                return key
+        return self._names.get(normalize_option_name(value))
+
+
+def binding_price_for(ranges, page_count):
+    """Price of the first ``(min_pages, max_pages, price)`` range covering ``page_count``, or None."""
+    for min_pages, max_pages, price in ranges:
+        if min_pages <= page_count <= max_pages:
+            return price
+    return None
+
+
+@dataclass(frozen=True)
+class PrintBookCatalog:
+    version: int
+    trim_sizes: tuple
+    interior_colors: tuple
+    paper_types: tuple
+    cover_finishes: tuple
+    # All binding rows, and the first row seen for each binding name (dropdown)
+    binding_types: tuple
+    unique_binding_types: tuple
+    # Serialized binding rows by (trim_size_id, page_count)
+    eligibility: BindingEligibilityIndex
+    # OptionResolver per option kind ("trim_size", "binding_type", ...), and
+    # the display name of each canonical key
+    resolvers: MappingProxyType
+    option_names: MappingProxyType
+    # Price columns keyed by option slug.
+    # (binding slug, trim_size_id) -> ((min_pages, max_pages, price), ...)
+    binding_prices: MappingProxyType
+    interior_prices: MappingProxyType
+    paper_prices: MappingProxyType
+    cover_prices: MappingProxyType
+
+    def bindings_for(self, trim_size_id, page_count):
+        """Serialized bindings of a trim size whose page range covers ``page_count``."""
+        return list(self.eligibility.lookup(trim_size_id, page_count))
+
+    def resolve(self, kind, value, label):
+        """Canonical key of an option given by ID, slug, name or alias; raises OptionNotFound(label)."""
+        key = self.resolvers[kind].resolve(value)
+        if key is None:
+            raise OptionNotFound(label)
+        return key
+
+    def resolve_configuration(self, trim_size, binding, interior, paper, cover):
+        """
+        Resolve options given by ID, slug, name or alias to
+        ``(trim_size_id, binding, interior, paper, cover slugs)``.
+        """
+        return (
+            self.resolve('trim_size', trim_size, 'Trim size'),
+            self.resolve('binding_type', binding, 'Binding type'),
+            self.resolve('interior_color', interior, 'Interior color'),
+            self.resolve('paper_type', paper, 'Paper type'),
+            self.resolve('cover_finish', cover, 'Cover finish'),
+        )
+
+    def price_components(self, trim_size_id, page_count, binding, interior, paper, cover):
+        """
+        Scaled ``(binding, interior per page, paper per page, cover)`` prices
+        for a resolved configuration. Raises OptionNotFound if the binding is
+        not offered for that trim size and page count.
+        """
+        binding_price = binding_price_for(self.binding_prices.get((binding, trim_size_id), ()), page_count)
+        if binding_price is None:
+            raise OptionNotFound('Binding type')
+        return binding_price, self.interior_prices[interior], self.paper_prices[paper], self.cover_prices[cover]
+
+    def option_prices(self, trim_size_id, binding, interior, paper, cover):
+        """
+        Scaled ``(binding ranges, interior per page, paper per page, cover)``
+        prices for a resolved configuration at any page count. Raises
+        OptionNotFound if the binding is not offered for that trim size.
+        """
+        try:
+            binding_ranges = self.binding_prices[(binding, trim_size_id)]
+        except KeyError:
+            raise OptionNotFound('Binding type')
+        return binding_ranges, self.interior_prices[interior], self.paper_prices[paper], self.cover_prices[cover]
+
+    def dropdowns(self):
+        return {
+            'trim_sizes': self.trim_sizes,
+            'interior_colors': self.interior_colors,
+            'paper_types': self.paper_types,
+            'cover_finishes': self.cover_finishes,
+            'binding_types': self.unique_binding_types,
+        }
+
+
+def _serialize(serializer_class, queryset):
+    return tuple(dict(row) for row in serializer_class(queryset.order_by('id'), many=True).data)
+
+
+def _scaled(price):
+    return to_units(price)
+
+
+def _price_column(rows, field):
+    column = {}
+    for row in rows:
+        column.setdefault(row['slug'], _scaled(row[field]))
+    return MappingProxyType(column)
+
+
+def _names(rows, key):
+    names = {}
+    for row in rows:
+        names.setdefault(row[key], row['name'])
+    return MappingProxyType(names)
+
+
+def build_catalog(version):
+    binding_types = _serialize(BindingTypeSerializer, BindingType.objects.all())
+    interior_colors = _serialize(InteriorColorSerializer, InteriorColor.objects.all())
+    paper_types = _serialize(PaperTypeSerializer, PaperType.objects.all())
+    cover_finishes = _serialize(CoverFinishSerializer, CoverFinish.objects.all())
+
+    seen = set()
+    unique_bindings = []
+    for b in binding_types:
+        if b['name'] not in seen:
+            seen.add(b['name'])
+            unique_bindings.append(b)
+
+    binding_prices = {}
+    for b in binding_types:
+        binding_prices.setdefault((b['slug'], b['trim_size']), []).append(
+            (b['min_pages'], b['max_pages'], _scaled(b['price']))
+        )
+
+    trim_sizes = _serialize(TrimSizeSerializer, TrimSize.objects.all())
+    aliases = {}
+    for kind, alias, slug in OptionAlias.objects.order_by('id').values_list('kind', 'alias', 'slug'):
+        aliases.setdefault(kind, []).append((alias, slug))
+
+    return PrintBookCatalog(
+        version=version,
+        trim_sizes=trim_sizes,
+        interior_colors=interior_colors,
+        paper_types=paper_types,
+        cover_finishes=cover_finishes,
+        binding_types=binding_types,
+        unique_binding_types=tuple(unique_bindings),
+        eligibility=BindingEligibilityIndex(
+            (b['trim_size'], b['min_pages'], b['max_pages'], b) for b in binding_types
+        ),
+        option_names=MappingProxyType({
+            'trim_size': _names(trim_sizes, 'id'),
+            'binding_type': _names(binding_types, 'slug'),
+            'interior_color': _names(interior_colors, 'slug'),
+            'paper_type': _names(paper_types, 'slug'),
+            'cover_finish': _names(cover_finishes, 'slug'),
+        }),
+        resolvers=MappingProxyType({
+            'trim_size': OptionResolver(trim_sizes, aliases.get('trim_size', ()), by_id=True),
+            'binding_type': OptionResolver(binding_types, aliases.get('binding_type', ())),
+            'interior_color': OptionResolver(interior_colors, aliases.get('interior_color', ())),
+            'paper_type': OptionResolver(paper_types, aliases.get('paper_type', ())),
+            'cover_finish': OptionResolver(cover_finishes, aliases.get('cover_finish', ())),
+        }),
+        binding_prices=MappingProxyType({k: tuple(v) for k, v in binding_prices.items()}),
+        interior_prices=_price_column(interior_colors, 'price_per_page'),
+        paper_prices=_price_column(paper_types, 'price_per_page'),
+        cover_prices=_price_column(cover_finishes, 'price'),
+    )
+
+
+_snapshot = VersionedSnapshot(CATALOG, build_catalog)
+
+
+def get_catalog():
+    """Return the current PrintBookCatalog, rebuilding it if the version moved."""
+    return _snapshot.get()
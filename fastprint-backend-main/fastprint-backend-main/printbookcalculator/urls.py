@@ -8,6 +8,9 @@ urlpatterns = [
     path('available-options/', views.get_available_options,
          name='get_available_options'),  # NEW
     path('calculate/', views.calculate_cost, name='calculate_cost'),
+    path('calculate-batch/', views.calculate_cost_batch, name='calculate_cost_batch'),
+    path('price-curve/', views.get_price_curve, name='get_price_curve'),
+    path('cheapest/', views.get_cheapest_configurations, name='get_cheapest_configurations'),
     path('interior-color/<int:pk>/update/', views.update_interior_color),
     path('paper-type/<int:pk>/update/', views.update_paper_type),
     path('cover-finish/<int:pk>/update/', views.update_cover_finish),
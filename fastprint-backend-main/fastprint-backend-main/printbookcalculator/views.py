@@ -5,33 +5,39 @@ from rest_framework.response import Response
 from rest_framework import status
 from .models import *
 from .serializers import *
-from .utils import get_available_bindings
-from decimal import Decimal
-
+from .snapshot import CATALOG, OptionNotFound, get_catalog
+from .quotes import (
+    MAX_BATCH_QUOTES,
+    MAX_CURVE_POINTS,
+    MAX_SEARCH_RESULTS,
+    canonical_quote_query,
+    cheapest_configurations,
+    parse_configuration,
+    parse_quote,
+    price_curve,
+    quote_many,
+    quote_one,
+    resolve_quote,
+)
+from .price_grid import MIN_PAGES, MAX_PAGES
+from pricing.catalog import bump_catalog_version, catalog_condition
+from pricing.money import to_decimal, to_units, units_to_cents
+from pricing.quote_cache import get_quote_cache
+from pricing.quote_urls import cacheable_quote, quote_payload
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def dropdown_data():
+    return get_catalog().dropdowns()
+
+
+@catalog_condition(CATALOG)
 @api_view(['GET'])
 @permission_classes([AllowAny])
 def get_dropdowns(request):
-    trim_sizes = TrimSizeSerializer(TrimSize.objects.all(), many=True).data
-    interior_colors = InteriorColorSerializer(InteriorColor.objects.all(), many=True).data
-    paper_types = PaperTypeSerializer(PaperType.objects.all(), many=True).data
-    cover_finishes = CoverFinishSerializer(CoverFinish.objects.all(), many=True).data
-
-    # Deduplicate binding types by name
-    seen = set()
-    unique_bindings = []
-    for b in BindingType.objects.all():
-        if b.name not in seen:
-            seen.add(b.name)
-            unique_bindings.append(b)
-    binding_types = BindingTypeSerializer(unique_bindings, many=True).data
-
-    return Response({
-        'trim_sizes': trim_sizes,
-        'interior_colors': interior_colors,
-        'paper_types': paper_types,
-        'cover_finishes': cover_finishes,
-        'binding_types': binding_types
-    })
+    return Response(dropdown_data())
 
 
 
@@ -45,17 +51,7 @@ def get_bindings_by_trim_and_page_count(request):
     except (TypeError, ValueError):
         return Response({'error': 'Invalid or missing parameters.'}, status=status.HTTP_400_BAD_REQUEST)
 
-    allowed_names = get_available_bindings(page_count)
-
-    bindings = BindingType.objects.filter(
-        trim_size_id=trim_size_id,
-        min_pages__lte=page_count,
-        max_pages__gte=page_count,
-        name__in=allowed_names
-    )
-
-    serialized = BindingTypeSerializer(bindings, many=True)
-    return Response(serialized.data)
+    return Response(get_catalog().bindings_for(trim_size_id, page_count))
 
 
 # GET available options based on trim and page count — public access
@@ -68,85 +64,177 @@ def get_available_options(request):
     except (TypeError, ValueError):
         return Response({'error': 'Invalid or missing parameters.'}, status=status.HTTP_400_BAD_REQUEST)
 
-    allowed_names = get_available_bindings(page_count)
-
-    bindings = BindingType.objects.filter(
-        trim_size_id=trim_size_id,
-        min_pages__lte=page_count,
-        max_pages__gte=page_count,
-        name__in=allowed_names
-    )
+    catalog = get_catalog()
 
     return Response({
-        'bindings': BindingTypeSerializer(bindings, many=True).data,
-        'interior_colors': InteriorColorSerializer(InteriorColor.objects.all(), many=True).data,
-        'paper_types': PaperTypeSerializer(PaperType.objects.all(), many=True).data,
-        'cover_finishes': CoverFinishSerializer(CoverFinish.objects.all(), many=True).data,
+        'bindings': catalog.bindings_for(trim_size_id, page_count),
+        'interior_colors': catalog.interior_colors,
+        'paper_types': catalog.paper_types,
+        'cover_finishes': catalog.cover_finishes,
     })
 
 
-# POST cost calculation — public access
-@api_view(['POST'])
+quote_cache = get_quote_cache(CATALOG)
+
+
+def _cost_response(catalog, quote):
+    per_book_cost, total_cost = quote_one(catalog, quote)
+    return {
+        'cost_per_book': to_decimal(per_book_cost),
+        'total_cost': to_decimal(total_cost)
+    }
+
+
+# GET/POST cost calculation — public access. Options may be given by ID, slug, name or alias.
+@cacheable_quote(CATALOG, canonical_quote_query)
+@api_view(['GET', 'POST'])
 @permission_classes([AllowAny])
 def calculate_cost(request):
     try:
-        data = request.data
-        page_count = int(data['page_count'])
-        quantity = int(data['quantity'])
-        trim_size_id = int(data['trim_size_id'])
-
-        binding_name = data['binding_id']
-        interior_name = data['interior_color_id']
-        paper_name = data['paper_type_id']
-        cover_name = data['cover_finish_id']
-
-        # Optional name mappings for flexibility
-        interior_name_mapping = {
-            "Standard Black and White": "Standard Black & White",
-            "Premium Black and White": "Premium Black & White"
-        }
-        paper_name_mapping = {
-            "60# Cream Uncoated": "60# Cream-Uncoated",
-            "60# White Uncoated": "60# White-Uncoated",
-            "80# White Coated": "80# White-Coated",
-            "100# White Coated": "100# White-Coated"
-        }
-        cover_name_mapping = {
-            "Glossy": "Gloss",
-            "Matte": "Matte"
-        }
-
-        # Apply name corrections
-        interior_db_name = interior_name_mapping.get(interior_name, interior_name)
-        paper_db_name = paper_name_mapping.get(paper_name, paper_name)
-        cover_db_name = cover_name_mapping.get(cover_name, cover_name)
-
-        # Fetch from DB
-        binding = get_object_or_404(BindingType, name=binding_name, trim_size_id=trim_size_id, min_pages__lte=page_count, max_pages__gte=page_count)
-        interior = get_object_or_404(InteriorColor, name=interior_db_name)
-        paper = get_object_or_404(PaperType, name=paper_db_name)
-        cover = get_object_or_404(CoverFinish, name=cover_db_name)
-
-        # Calculate cost
-        per_book_cost = (
-            Decimal(str(binding.price)) +
-            Decimal(str(interior.price_per_page)) * page_count +
-            Decimal(str(paper.price_per_page)) * page_count +
-            Decimal(str(cover.price))
-        )
+        catalog = get_catalog()
+        quote = resolve_quote(catalog, parse_quote(quote_payload(request)))
+        return Response(quote_cache.get_or_compute(catalog.version, quote, lambda: _cost_response(catalog, quote)))
 
-        total_cost = per_book_cost * quantity
+    except (KeyError, ValueError) as e:
+        return Response({'error': f'Invalid or missing data: {str(e)}'}, status=status.HTTP_400_BAD_REQUEST)
+    except OptionNotFound as e:
+        return Response({'error': f'{e} not found.'}, status=status.HTTP_404_NOT_FOUND)
+    except Exception:
+        logger.exception("Unexpected error calculating a print book quote")
+        return Response({'error': 'Internal server error occurred.'}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
-        return Response({
-            'cost_per_book': float(per_book_cost),
-            'total_cost': float(total_cost)
-        })
 
+# POST cost calculation for many configurations at once — public access
+@api_view(['POST'])
+@permission_classes([AllowAny])
+def calculate_cost_batch(request):
+    items = request.data.get('items') if isinstance(request.data, dict) else None
+    if not isinstance(items, list) or not items:
+        return Response({'error': 'items must be a non-empty list.'}, status=status.HTTP_400_BAD_REQUEST)
+    if len(items) > MAX_BATCH_QUOTES:
+        return Response({'error': f'At most {MAX_BATCH_QUOTES} items per request.'}, status=status.HTTP_400_BAD_REQUEST)
+
+    catalog = get_catalog()
+    results = [None] * len(items)
+    positions, quotes = [], []
+    for i, item in enumerate(items):
+        try:
+            quotes.append(resolve_quote(catalog, parse_quote(item)))
+            positions.append(i)
+        except (KeyError, ValueError, TypeError) as e:
+            results[i] = {'error': f'Invalid or missing data: {str(e)}'}
+        except OptionNotFound as e:
+            results[i] = {'error': f'{e} not found.'}
+
+    for i, result in zip(positions, quote_many(catalog, quotes)):
+        if isinstance(result, OptionNotFound):
+            results[i] = {'error': f'{result} not found.'}
+        else:
+            results[i] = {'cost_per_book': to_decimal(result[0]), 'total_cost': to_decimal(result[1])}
+
+    return Response({'results': results})
+
+
+# GET per-book cost across a page count range, for the page count slider — public access
+@catalog_condition(CATALOG)
+@api_view(['GET'])
+@permission_classes([AllowAny])
+def get_price_curve(request):
+    try:
+        configuration = parse_configuration(request.GET)
+        min_pages = int(request.GET.get('min_pages', MIN_PAGES))
+        max_pages = int(request.GET.get('max_pages', MAX_PAGES))
+        step = int(request.GET.get('step', 1))
     except (KeyError, ValueError) as e:
         return Response({'error': f'Invalid or missing data: {str(e)}'}, status=status.HTTP_400_BAD_REQUEST)
-    except Exception as e:
-        print(f"Unexpected error: {str(e)}")
-        return Response({'error': 'Internal server error occurred.'}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+    page_counts = range(min_pages, max_pages + 1, step) if step > 0 else range(0)
+    if not page_counts:
+        return Response({'error': 'Invalid page count range.'}, status=status.HTTP_400_BAD_REQUEST)
+    if len(page_counts) > MAX_CURVE_POINTS:
+        return Response({'error': f'At most {MAX_CURVE_POINTS} points per curve.'}, status=status.HTTP_400_BAD_REQUEST)
+
+    try:
+        catalog = get_catalog()
+        costs = price_curve(catalog, catalog.resolve_configuration(*configuration), page_counts)
+    except OptionNotFound as e:
+        return Response({'error': f'{e} not found.'}, status=status.HTTP_404_NOT_FOUND)
+
+    return Response({
+        'points': [
+            {'page_count': n, 'cost_per_book': None if cost is None else to_decimal(cost)}
+            for n, cost in zip(page_counts, costs)
+        ]
+    })
+
+
+# Query parameters that restrict the cheapest search, by option kind
+SEARCH_FILTERS = {
+    'trim_size': ('trim_size_id', 'Trim size'),
+    'binding_type': ('binding_id', 'Binding type'),
+    'interior_color': ('interior_color_id', 'Interior color'),
+    'paper_type': ('paper_type_id', 'Paper type'),
+    'cover_finish': ('cover_finish_id', 'Cover finish'),
+}
+
+
+# GET the cheapest configurations for a page count and quantity — public access.
+# Each option filter may be repeated and given by ID, slug, name or alias.
+@catalog_condition(CATALOG)
+@api_view(['GET'])
+@permission_classes([AllowAny])
+def get_cheapest_configurations(request):
+    try:
+        page_count = int(request.GET['page_count'])
+        quantity = int(request.GET.get('quantity', 1))
+        limit = int(request.GET.get('limit', 10))
+        max_cost_per_book = request.GET.get('max_cost_per_book')
+        if max_cost_per_book is not None:
+            max_cost_per_book = to_units(max_cost_per_book)
+        max_total_cost = request.GET.get('max_total_cost')
+        if max_total_cost is not None:
+            total_cap = to_units(max_total_cost) // max(quantity, 1)
+            max_cost_per_book = total_cap if max_cost_per_book is None else min(max_cost_per_book, total_cap)
+    except (KeyError, ValueError) as e:
+        return Response({'error': f'Invalid or missing data: {str(e)}'}, status=status.HTTP_400_BAD_REQUEST)
+    if quantity < 1 or not 1 <= limit <= MAX_SEARCH_RESULTS:
+        return Response(
+            {'error': f'quantity must be positive and limit between 1 and {MAX_SEARCH_RESULTS}.'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+
+    catalog = get_catalog()
+    options = {}
+    try:
+        for kind, (param, label) in SEARCH_FILTERS.items():
+            values = request.GET.getlist(param)
+            if values:
+                options[kind] = {catalog.resolve(kind, value, label) for value in values}
+    except OptionNotFound as e:
+        return Response({'error': f'{e} not found.'}, status=status.HTTP_404_NOT_FOUND)
+
+    names = catalog.option_names
+    results = []
+    for unit, trim_size_id, binding, interior, paper, cover in cheapest_configurations(
+        catalog, page_count, limit, options, max_cost_per_book
+    ):
+        cost_per_book = units_to_cents(unit)
+        results.append({
+            'trim_size_id': trim_size_id,
+            'trim_size': names['trim_size'][trim_size_id],
+            'binding': binding,
+            'binding_name': names['binding_type'][binding],
+            'interior_color': interior,
+            'interior_color_name': names['interior_color'][interior],
+            'paper_type': paper,
+            'paper_type_name': names['paper_type'][paper],
+            'cover_finish': cover,
+            'cover_finish_name': names['cover_finish'][cover],
+            'cost_per_book': to_decimal(cost_per_book),
+            'total_cost': to_decimal(cost_per_book * quantity),
+        })
+
+    return Response({'page_count': page_count, 'quantity': quantity, 'results': results})
 
 
 # UPDATE: Interior Color
@@ -157,6 +245,7 @@ def update_interior_color(request, pk):
     if price is not None:
         color.price_per_page = price
         color.save()
+        bump_catalog_version(CATALOG)
         return Response({'status': 'updated'})
     return Response({'error': 'Invalid input'}, status=400)
 
@@ -169,6 +258,7 @@ def update_paper_type(request, pk):
     if price is not None:
         paper.price_per_page = price
         paper.save()
+        bump_catalog_version(CATALOG)
         return Response({'status': 'updated'})
     return Response({'error': 'Invalid input'}, status=400)
 
@@ -181,6 +271,7 @@ def update_cover_finish(request, pk):
     if price is not None:
         cover.price = price
         cover.save()
+        bump_catalog_version(CATALOG)
         return Response({'status': 'updated'})
     return Response({'error': 'Invalid input'}, status=400)
 
@@ -193,5 +284,6 @@ def update_binding_type(request, pk):
     if price is not None:
         binding.price = price
         binding.save()
+        bump_catalog_version(CATALOG)
         return Response({'status': 'updated'})
     return Response({'error': 'Invalid input'}, status=400)
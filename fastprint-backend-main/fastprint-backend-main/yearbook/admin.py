@@ -1,9 +1,5 @@
-from django.contrib import admin
 from .models import *
+from .views import CATALOG
+from pricing.admin import register_catalog_options
 
-admin.site.register(TrimSize)
-admin.site.register(BindingType)
-admin.site.register(InteriorColor)
-admin.site.register(PaperType)
-admin.site.register(CoverFinish)
-
+register_catalog_options(CATALOG, TrimSize, BindingType, InteriorColor, PaperType, CoverFinish)
@@ -1,5 +1,6 @@
 from django.core.management.base import BaseCommand
 from yearbook.models import TrimSize, BindingType, InteriorColor, PaperType, CoverFinish
+from pricing.catalog import bump_catalog_version
 
 class Command(BaseCommand):
     help = 'Seed data for YearBookCalculator'
@@ -22,16 +23,16 @@ class Command(BaseCommand):
         for name in trim_sizes:
             TrimSize.objects.create(name=name)
 
-        # Binding Types
+        # Binding Types (name, price, min_pages)
         bindings = [
-            ("Perfect bond", 2.50),
-            ("Saddle Stitch", 5.00),
-            ("Case Wrap", 9.75),
-            ("Linen Wrap", 13.80),
-            ("coil bond", 6.18),
+            ("Perfect bond", 2.50, 32),
+            ("Saddle Stitch", 5.00, 4),
+            ("Case Wrap", 9.75, 24),
+            ("Linen Wrap", 13.80, 32),
+            ("coil bond", 6.18, 3),
         ]
-        for name, price in bindings:
-            BindingType.objects.create(name=name, price=price)
+        for name, price, min_pages in bindings:
+            BindingType.objects.create(name=name, price=price, min_pages=min_pages)
 
         # Interior Colors
         interior_colors = [
@@ -59,4 +60,6 @@ class Command(BaseCommand):
         for name, price in cover_finishes:
             CoverFinish.objects.create(name=name, price=price)
 
+        bump_catalog_version('yearbook', reset=True)
+
         self.stdout.write(self.style.SUCCESS('✅ YearBookCalculator data seeded successfully.'))
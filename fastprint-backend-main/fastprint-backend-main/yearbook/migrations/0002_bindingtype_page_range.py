@@ -0,0 +1,46 @@
+# Generated by Django 4.1 on 2026-10-18 11:09
+
+from django.db import migrations, models
+
+
+# Minimum page counts previously hard-coded in views.get_valid_bindings, keyed by a
+# word of the binding name. None of the rules had an upper limit.
+MIN_PAGES_BY_KEYWORD = [
+    ('coil', 3),
+    ('saddle', 4),
+    ('case', 24),
+    ('perfect', 32),
+    ('linen', 32),
+]
+
+
+def set_page_ranges(apps, schema_editor):
+    BindingType = apps.get_model('yearbook', 'BindingType')
+    for binding in BindingType.objects.all():
+        name = binding.name.lower()
+        for keyword, min_pages in MIN_PAGES_BY_KEYWORD:
+            if keyword in name:
+                binding.min_pages = min_pages
+                binding.save(update_fields=['min_pages'])
+                break
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('yearbook', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='bindingtype',
+            name='max_pages',
+            field=models.IntegerField(default=10000),
+        ),
+        migrations.AddField(
+            model_name='bindingtype',
+            name='min_pages',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.RunPython(set_page_ranges, migrations.RunPython.noop),
+    ]
@@ -12,6 +12,8 @@ class TrimSize(models.Model):
 class BindingType(models.Model):
     name = models.CharField(max_length=100)
     price = models.DecimalField(max_digits=10, decimal_places=2)
+    min_pages = models.IntegerField(default=0)
+    max_pages = models.IntegerField(default=10000)
 
     def __str__(self):
         return self.name
@@ -1,7 +1,6 @@
 "use client";
 
 import React, { useEffect, useState } from "react";
-import axios from "axios";
 import { useRouter } from "next/navigation"; // Replaces useNavigate
 import {
   Search,
@@ -18,6 +17,7 @@ import {
 } from "lucide-react";
 // import { BASE_URL } from '@/services/baseURL';
 import { BASE_URL } from "@/services/baseUrl";
+import { getAllPages } from "@/services/bookService";
 
 const ManageOrders = () => {
   const [orders, setOrders] = useState([]);
@@ -30,10 +30,10 @@ const ManageOrders = () => {
   const fetchOrders = async () => {
     const token = localStorage.getItem("accessToken");
     try {
-      const res = await axios.get(`${BASE_URL}api/book/all-orders/`, {
+      const rows = await getAllPages(`${BASE_URL}api/book/all-orders/`, {
         headers: { Authorization: `Bearer ${token}` },
       });
-      setOrders(res.data.data || []);
+      setOrders(rows);
     } catch (err) {
       console.error("Failed to fetch orders", err);
       alert("Failed to load orders");
@@ -3,7 +3,7 @@ import React, { useEffect, useState } from "react";
 import { useRouter } from "next/navigation";
 import { ArrowLeft, Package } from "lucide-react";
 import { BASE_URL } from "@/services/baseUrl";
-import axios from "axios";
+import { getAllPages } from "@/services/bookService";
 
 const ShippingPage = () => {
   const router = useRouter();
@@ -14,10 +14,10 @@ const ShippingPage = () => {
     const fetchShipmentOrders = async () => {
       const token = localStorage.getItem("accessToken");
       try {
-        const res = await axios.get(`${BASE_URL}api/book/admin/shipment-orders/`, {
+        const rows = await getAllPages(`${BASE_URL}api/book/admin/shipment-orders/`, {
           headers: { Authorization: `Bearer ${token}` },
         });
-        setOrders(res.data.data || []);
+        setOrders(rows);
       } catch (err) {
         console.error("Failed to load shipment orders", err);
         alert("Failed to load shipment orders.");
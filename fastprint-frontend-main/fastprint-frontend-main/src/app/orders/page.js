@@ -14,8 +14,8 @@ import {
   FaArrowLeft,
 } from "react-icons/fa";
 import useAuth from "@/hooks/useAuth";
-import axios from "axios";
 import { BASE_URL } from "@/services/baseUrl";
+import { getAllPages } from "@/services/bookService";
 
 const Orders = () => {
   const router = useRouter();
@@ -46,13 +46,12 @@ const Orders = () => {
   useEffect(() => {
     if (user) {
       const token = localStorage.getItem("accessToken");
-      axios
-        .get(`${BASE_URL}api/book/user-paid-orders/`, {
-          headers: { Authorization: `Bearer ${token}` },
-        })
-        .then((response) => {
-          setProjects(response.data.data);
-          setFilteredProjects(response.data.data);
+      getAllPages(`${BASE_URL}api/book/user-paid-orders/`, {
+        headers: { Authorization: `Bearer ${token}` },
+      })
+        .then((rows) => {
+          setProjects(rows);
+          setFilteredProjects(rows);
           setLoading(false);
         })
         .catch(() => {
@@ -18,6 +18,7 @@ import {
 import Image from "next/image";
 import { useRouter } from "next/navigation";
 import { BASE_URL } from "@/services/baseUrl";
+import { getAllPages } from "@/services/bookService";
 
 // Simple in-memory cache for generated thumbnails (pdfUrl -> dataUrl)
 const _thumbnailCache = new Map();
@@ -213,16 +214,12 @@ const UserDashboard = () => {
 
       try {
         // ✅ ONLY call the unpaid endpoint — backend already filters for order_status='draft'
-        const response = await axios.get(`${BASE_URL}api/book/user-unpaid-projects/`, {
+        // Follows `next` through every page of the list
+        const unpaidBooks = await getAllPages(`${BASE_URL}api/book/user-unpaid-projects/`, {
           headers: { Authorization: `Bearer ${token}` },
         });
 
-        if (!Array.isArray(response.data?.data)) {
-          throw new Error("Invalid response format: expected data.data array");
-        }
-
         // ✅ TRUST THE BACKEND — DO NOT FILTER AGAIN
-        const unpaidBooks = response.data.data || [];
         setBooks(unpaidBooks);
         setFilteredBooks(unpaidBooks);
       } catch (error) {
@@ -0,0 +1,18 @@
+import axios from 'axios';
+
+/**
+ * Get every row of a paginated book list (all-orders, shipment-orders,
+ * user-paid-orders, ...). The backend returns one page per request, newest
+ * first, with the URL of the following page in `next`; this follows `next`
+ * until it is null and returns the rows of all pages.
+ */
+export const getAllPages = async (url, config = {}) => {
+  const rows = [];
+  let nextUrl = url;
+  while (nextUrl) {
+    const response = await axios.get(nextUrl, config);
+    rows.push(...(response.data?.data || []));
+    nextUrl = response.data?.next || null;
+  }
+  return rows;
+};